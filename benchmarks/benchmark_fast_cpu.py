@@ -0,0 +1,83 @@
+"""
+Compare NLPChatbot latency and output similarity in fp32 and fast CPU mode.
+
+Run from the repository root:
+    python -m benchmarks.benchmark_fast_cpu --repeats 5 --threads 4
+"""
+import argparse
+import difflib
+import statistics
+import time
+
+from src_ai.nlp_chatbot import NLPChatbot
+
+PROMPTS = [
+    "What is recursion?",
+    "Explain binary search.",
+    "How does a hash table work?",
+    "What is dynamic programming?",
+    "Explain the difference between a stack and a queue.",
+    "What is a binary tree?",
+    "How do operating systems manage virtual memory?",
+    "What is object-oriented programming?"
+]
+
+
+def run(chatbot, repeats):
+    """Generate every prompt `repeats` times and collect latencies and outputs"""
+    latencies = []
+    outputs = {}
+    for _ in range(repeats):
+        for prompt in PROMPTS:
+            start = time.perf_counter()
+            outputs[prompt] = chatbot.generate_response(prompt)
+            latencies.append(time.perf_counter() - start)
+    return latencies, outputs
+
+
+def summarize(name, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{name:>14}: mean {statistics.mean(latencies) * 1000:8.1f} ms, "
+          f"p50 {statistics.median(latencies) * 1000:8.1f} ms, p95 {p95 * 1000:8.1f} ms")
+    return statistics.mean(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NLPChatbot fast CPU mode against fp32")
+    parser.add_argument("--model", default="t5-small")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None, help="Intra-op threads for both runs")
+    parser.add_argument("--interop-threads", type=int, default=None)
+    args = parser.parse_args()
+
+    # Caching is disabled so every call measures real inference
+    baseline = NLPChatbot(args.model, cache_path=None, num_threads=args.threads,
+                          num_interop_threads=args.interop_threads)
+    fast = NLPChatbot(args.model, cache_path=None, fast_cpu=True, num_threads=args.threads)
+    if not baseline.is_model_loaded or not fast.is_model_loaded:
+        print("Model could not be loaded, nothing to benchmark.")
+        return
+
+    # One untimed pass for the baseline; fast mode already warmed up at load
+    run(baseline, 1)
+    baseline_latencies, baseline_outputs = run(baseline, args.repeats)
+    fast_latencies, fast_outputs = run(fast, args.repeats)
+
+    print(f"{len(PROMPTS)} prompts x {args.repeats} repeats, model {args.model}")
+    baseline_mean = summarize("fp32", baseline_latencies)
+    fast_mean = summarize(fast.model_variant, fast_latencies)
+    print(f"Speedup: {baseline_mean / fast_mean:.2f}x")
+
+    similarities = []
+    for prompt in PROMPTS:
+        ratio = difflib.SequenceMatcher(None, baseline_outputs[prompt], fast_outputs[prompt]).ratio()
+        similarities.append(ratio)
+        print(f"  {ratio:5.2f}  {prompt}")
+    exact = sum(baseline_outputs[p] == fast_outputs[p] for p in PROMPTS)
+    print(f"Output similarity: mean {statistics.mean(similarities):.2f}, "
+          f"identical outputs {exact}/{len(PROMPTS)}")
+
+
+if __name__ == "__main__":
+    main()
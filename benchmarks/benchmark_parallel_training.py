@@ -0,0 +1,51 @@
+"""
+Measure LearningPathRL.train_parallel wall-clock time against worker count.
+
+Run from the repository root:
+    python -m benchmarks.benchmark_parallel_training --concepts 500 --episodes 20000 --workers 1,2,4,8
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src_ai.reinforcement_learning import LearningEnvironment, LearningPathRL
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel RL training across worker counts")
+    parser.add_argument("--concepts", type=int, default=500, help="Size of the synthetic environment")
+    parser.add_argument("--episodes", type=int, default=20000)
+    parser.add_argument("--workers", default=None,
+                        help="Comma-separated worker counts (default: 1, 2, 4, ... up to the CPU count)")
+    parser.add_argument("--sync-every", type=int, default=500, help="Episodes per worker between merges")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.workers:
+        worker_counts = [int(count) for count in args.workers.split(",")]
+    else:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= (os.cpu_count() or 1):
+            worker_counts.append(worker_counts[-1] * 2)
+
+    # Every run trains on the same environment from an empty Q-table
+    np.random.seed(args.seed)
+    env = LearningEnvironment(concepts=[f"concept {i}" for i in range(args.concepts)])
+
+    print(f"{args.episodes} episodes, {args.concepts} concepts, {os.cpu_count()} CPUs")
+    baseline = None
+    for num_workers in worker_counts:
+        agent = LearningPathRL(env, load_model=False)
+        start = time.perf_counter()
+        rewards = agent.train_parallel(episodes=args.episodes, num_workers=num_workers,
+                                       sync_every=args.sync_every, seed=args.seed, save_model=False)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{num_workers:>3} workers: {elapsed:8.2f} s, speedup {baseline / elapsed:5.2f}x, "
+              f"avg reward (last 1000) {np.mean(rewards[-1000:]):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare episodes-to-convergence of train.train with uniform and prioritized replay.
+
+Every --eval-every episodes the greedy policy is rolled out from each starting
+concept; a run has converged once that evaluation reward reaches --target times
+the best evaluation reward any run achieved.
+
+Run from the repository root:
+    python -m benchmarks.benchmark_prioritized_replay --concepts 60 --episodes 600 --seeds 3
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from replay_buffer import PrioritizedReplayBuffer, ReplayBuffer
+from rl_agent import RLAgent
+from src_ai.reinforcement_learning import LearningEnvironment
+from train import train
+
+
+def evaluate(agent, env, starts, max_steps=100):
+    """Total reward of the greedy policy from each start concept"""
+    total = 0.0
+    for start in starts:
+        state = env.reset(start_concept=start)
+        for _ in range(max_steps):
+            state, reward, done = env.step(int(np.argmax(agent.q_table[state])))
+            total += reward
+            if done:
+                break
+    return total
+
+
+def run(env, starts, args, seed, prioritized):
+    """Train one agent and return its evaluation curve"""
+    random.seed(seed)
+    np.random.seed(seed)
+    agent = RLAgent(state_size=env.num_concepts, action_size=env.num_concepts,
+                    alpha=args.alpha, gamma=args.gamma, epsilon=args.epsilon)
+    if prioritized:
+        buffer = PrioritizedReplayBuffer(capacity=10000, alpha=args.priority_alpha, beta=args.beta,
+                                         beta_increment=args.beta_increment, seed=seed)
+    else:
+        buffer = ReplayBuffer(capacity=10000, seed=seed)
+
+    curve = []
+    start_time = time.perf_counter()
+    for _ in range(0, args.episodes, args.eval_every):
+        train(agent, env, episodes=args.eval_every, batch_size=args.batch_size,
+              replay_buffer=buffer, verbose=False)
+        curve.append(evaluate(agent, env, starts))
+    return curve, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prioritized vs. uniform experience replay")
+    parser.add_argument("--concepts", type=int, default=60, help="Size of the synthetic environment")
+    parser.add_argument("--episodes", type=int, default=600)
+    parser.add_argument("--eval-every", type=int, default=20, help="Episodes between greedy evaluations")
+    parser.add_argument("--seeds", type=int, default=3, help="Runs per replay strategy")
+    parser.add_argument("--target", type=float, default=0.9,
+                        help="Fraction of the best evaluation reward that counts as converged")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--alpha", type=float, default=0.1, help="Q-learning rate")
+    parser.add_argument("--gamma", type=float, default=0.9)
+    parser.add_argument("--epsilon", type=float, default=0.3, help="Exploration rate (kept fixed)")
+    parser.add_argument("--priority-alpha", type=float, default=0.6)
+    parser.add_argument("--beta", type=float, default=0.4)
+    parser.add_argument("--beta-increment", type=float, default=0.0005)
+    args = parser.parse_args()
+
+    np.random.seed(0)
+    env = LearningEnvironment(concepts=[f"concept {i}" for i in range(args.concepts)])
+    starts = np.flatnonzero(env.prerequisite_graph.counts == 0)[:5].tolist()
+
+    curves = {}
+    times = {}
+    for name, prioritized in (("uniform", False), ("prioritized", True)):
+        results = [run(env, starts, args, seed, prioritized) for seed in range(args.seeds)]
+        curves[name] = [curve for curve, _ in results]
+        times[name] = sum(elapsed for _, elapsed in results) / args.seeds
+
+    best = max(max(curve) for runs in curves.values() for curve in runs)
+    threshold = best * args.target if best > 0 else best / args.target
+    print(f"{args.concepts} concepts, {args.episodes} episodes, {args.seeds} seeds, "
+          f"target evaluation reward {threshold:.2f}")
+    for name, runs in curves.items():
+        converged = []
+        for curve in runs:
+            hits = [i for i, value in enumerate(curve) if value >= threshold]
+            converged.append((hits[0] + 1) * args.eval_every if hits else None)
+        reached = [episodes for episodes in converged if episodes is not None]
+        median = f"{np.median(reached):.0f}" if reached else "n/a"
+        print(f"{name:>12}: episodes to convergence {converged} (median {median}), "
+              f"final evaluation {np.mean([curve[-1] for curve in runs]):.2f}, "
+              f"{times[name]:.1f} s per run")
+
+
+if __name__ == "__main__":
+    main()
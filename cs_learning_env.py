@@ -3,6 +3,7 @@ import os
 from knowledge_graph import KnowledgeGraph
 from reward_function import RewardFunction
 from llm_knowledge_extractor import LLMKnowledgeExtractor
+from state_representation import iter_bits
 
 class CSLearningEnvironment:
     """RL environment for CS learning path planning"""
@@ -15,48 +16,125 @@ class CSLearningEnvironment:
         self.knowledge_graph = KnowledgeGraph(knowledge_path=knowledge_path)
         
         # Initialize reward function
+        self.learner_profile = {}
         self.reward_function = RewardFunction(self.knowledge_graph, self.learner_profile)
         
         self.reset()
         
+    @property
+    def concepts(self):
+        """Concepts of the curriculum, in the bit order used by State"""
+        return self.knowledge_graph.metrics.nodes
+        
     def reset(self):
         """Reset the environment to initial state"""
-        self.current_state = State()
-        self.learner_profile = {}
+        self.current_state = State(metrics=self.knowledge_graph.metrics)
+        return self.current_state
+        
+    def _state(self):
+        """Current state, rebuilt in the bit order of the current graph version"""
+        # Bits index the GraphMetrics a state was built with, which a
+        # knowledge reload replaces
+        self.current_state = self.current_state.rebind(self.knowledge_graph.metrics)
+        return self.current_state
         
     def step(self, action):
         """Take a step in the environment"""
-        reward = self.reward_function.calculate_reward(self.current_state, action, self.current_state)
-        
-        # Update state
-        new_mastered = self.current_state.mastered_concepts.copy()
-        if action not in new_mastered:
-            new_mastered.append(action)
-            
-        next_state = State(mastered_concepts=new_mastered)
+        # Copy-on-write: the previous state is left untouched
+        next_state = self._state().with_mastered(action)
         
+        reward = self.reward_function.calculate_reward(self.current_state, action, next_state)
         done = self._is_curriculum_complete(next_state)
+        self.current_state = next_state
         
         return next_state, reward, done, {}
         
     def get_available_actions(self):
         """Get all available actions from current state"""
-        return [concept for concept in self.knowledge_graph.concepts if concept not in self.current_state.mastered_concepts]
+        state = self._state()
+        return [self.concepts[i] for i in iter_bits(~state.mask & state.full_mask)]
         
     def _is_curriculum_complete(self, state):
         """Check if the curriculum is complete"""
-        return len(state.mastered_concepts) == len(self.knowledge_graph.concepts)
+        return state.mask == state.full_mask
         
     def set_learner_profile(self, profile):
         """Update the learner profile"""
         self.learner_profile = profile
+        self.reward_function.learner_profile = profile
 
 class State:
-    """State representation for the CS learning environment"""
+    """
+    State representation for the CS learning environment.
+    
+    Mastered concepts are bits of a Python int indexed by the node IDs of one
+    GraphMetrics version, so states hash and compare in a single operation and
+    can key tabular Q-values.
+    """
+    __slots__ = ('metrics', 'mask', '_hash')
     
-    def __init__(self, mastered_concepts=None):
-        self.mastered_concepts = mastered_concepts if mastered_concepts is not None else []
+    def __init__(self, mastered_concepts=None, metrics=None):
+        """
+        Args:
+            mastered_concepts: Names of the mastered concepts
+            metrics: GraphMetrics of the knowledge graph, giving the concept bit order
+        """
+        self.metrics = metrics
+        self.mask = 0
+        for concept in mastered_concepts or []:
+            self.mask |= 1 << metrics.node_ids[concept]
+        self._hash = None
+        
+    @property
+    def mastered_concepts(self):
+        """Names of the mastered concepts"""
+        return [self.metrics.nodes[i] for i in iter_bits(self.mask)]
+        
+    @property
+    def full_mask(self):
+        """Mask with every concept mastered"""
+        return (1 << len(self.metrics.nodes)) - 1 if self.metrics is not None else 0
+        
+    def is_mastered(self, concept):
+        """Check whether a concept has been mastered"""
+        node_id = self.metrics.node_ids.get(concept) if self.metrics is not None else None
+        return node_id is not None and (self.mask >> node_id) & 1 == 1
+        
+    def with_mastered(self, concept):
+        """
+        New state with one more concept mastered; this state is left unchanged.
+        Uses this state's metrics, so rebind first after a knowledge reload.
+        """
+        state = State.__new__(State)
+        state.metrics = self.metrics
+        state.mask = self.mask | 1 << self.metrics.node_ids[concept]
+        state._hash = None
+        return state
+        
+    def rebind(self, metrics):
+        """
+        Same mastered concepts in the bit order of another GraphMetrics
+        version; concepts missing from it are dropped
+        
+        Returns:
+            This state if it already uses metrics, otherwise a new State
+        """
+        if metrics is self.metrics:
+            return self
+        if self.metrics is None:
+            return State(metrics=metrics)
+        return State([concept for concept in self.mastered_concepts if concept in metrics.node_ids], metrics)
         
     def is_terminal(self):
         """Placeholder for terminal state check"""
-        return False
\ No newline at end of file
+        return False
+        
+    def __eq__(self, other):
+        if not isinstance(other, State):
+            return NotImplemented
+        return self.mask == other.mask and self.metrics is other.metrics
+        
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self.mask)
+        return self._hash
\ No newline at end of file
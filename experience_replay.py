@@ -1,21 +1,4 @@
-import numpy as np
+# The ring buffer lives in replay_buffer; kept importable from here
+from replay_buffer import ReplayBuffer
 
-class ReplayBuffer:
-    def __init__(self, capacity=10000):
-        self.buffer = []
-        self.capacity = capacity
-        self.position = 0
-    
-    def push(self, state, action, reward, next_state, done):
-        """Add a new experience to memory"""
-        if len(self.buffer) < self.capacity:
-            self.buffer.append(None)
-        self.buffer[self.position] = (state, action, reward, next_state, done)
-        self.position = (self.position + 1) % self.capacity
-    
-    def sample(self, batch_size):
-        """Sample a batch of experiences"""
-        return np.random.choice(self.buffer, batch_size, replace=False)
-    
-    def __len__(self):
-        return len(self.buffer)
+__all__ = ['ReplayBuffer']
@@ -1,42 +1,246 @@
 import networkx as nx
-import json
+import numpy as np
+from src.knowledge_registry import get_knowledge_manager
+from src.prerequisite_graph import PrerequisiteGraph
+
+class GraphMetrics:
+    """
+    Per-node metrics of one version of the knowledge graph, stored in NumPy
+    arrays indexed by node ID (see node_ids).
+    """
+    def __init__(self, graph, version):
+        self.version = version
+        self.nodes = list(graph.nodes)
+        self.node_ids = {node: i for i, node in enumerate(self.nodes)}
+        num_nodes = len(self.nodes)
+        
+        self.in_degree = np.array([graph.in_degree(node) for node in self.nodes], dtype=np.int32)
+        self.out_degree = np.array([graph.out_degree(node) for node in self.nodes], dtype=np.int32)
+        # Prerequisite edges by node ID, indexed in both directions
+        edges = [(self.node_ids[node], self.node_ids[prereq])
+                 for node in self.nodes for prereq in graph.predecessors(node)]
+        self.prerequisites = PrerequisiteGraph.from_edges(
+            num_nodes, [node for node, _ in edges], [prereq for _, prereq in edges])
+        # Same values as nx.degree_centrality
+        if num_nodes > 1:
+            self.centrality = (self.in_degree + self.out_degree) / (num_nodes - 1)
+        else:
+            self.centrality = np.ones(num_nodes)
+        
+        # Depth is the longest prerequisite chain leading to a node, and dependents
+        # counts every concept that builds on it directly or indirectly. Both are
+        # computed on the condensation so prerequisite cycles share one value.
+        condensation = nx.condensation(graph)
+        members = condensation.graph['mapping']
+        order = list(nx.topological_sort(condensation))
+        component_depth = {}
+        for component in order:
+            component_depth[component] = max(
+                (component_depth[pred] + 1 for pred in condensation.predecessors(component)), default=0)
+        # Descendant sets as integer bitsets over node IDs, built leaves first
+        component_nodes = {component: 0 for component in order}
+        for node, component in members.items():
+            component_nodes[component] |= 1 << self.node_ids[node]
+        descendants = {}
+        for component in reversed(order):
+            bits = component_nodes[component]
+            for succ in condensation.successors(component):
+                bits |= descendants[succ]
+            descendants[component] = bits
+        
+        self.depth = np.zeros(num_nodes, dtype=np.int32)
+        self.dependent_count = np.zeros(num_nodes, dtype=np.int32)
+        for node, component in members.items():
+            i = self.node_ids[node]
+            self.depth[i] = component_depth[component]
+            # The node itself is not one of its own dependents
+            self.dependent_count[i] = bin(descendants[component]).count('1') - 1
+
+class KnowledgeFrontier:
+    """
+    Knowledge frontier of one learner, kept up to date as concepts are mastered.
+    
+    A concept is on the frontier when it has prerequisites and all of them are
+    mastered (see KnowledgeGraph.get_knowledge_frontier). Every concept keeps a
+    counter of its prerequisites that are not mastered yet, so mastering or
+    forgetting a concept costs O(out-degree) and membership tests are O(1).
+    """
+    def __init__(self, knowledge_graph, mastered_concepts=()):
+        """
+        Args:
+            knowledge_graph: KnowledgeGraph to track the frontier on
+            mastered_concepts: Concepts the learner has already mastered
+        """
+        self.knowledge_graph = knowledge_graph
+        self._rebuild(set(mastered_concepts))
+        
+    def _rebuild(self, mastered_concepts):
+        """Recompute the counters from scratch for the current graph version"""
+        self._metrics = self.knowledge_graph.metrics
+        self._remaining = self._metrics.in_degree.copy()
+        self.mastered_concepts = set()
+        for concept in mastered_concepts:
+            self.master(concept)
+    
+    def _sync(self):
+        # The graph changed (e.g. a knowledge reload); counters are per version
+        if self._metrics.version != self.knowledge_graph.version:
+            self._rebuild(self.mastered_concepts)
+    
+    def master(self, concept):
+        """Record that a concept has been mastered"""
+        self._sync()
+        if concept in self.mastered_concepts:
+            return
+        self.mastered_concepts.add(concept)
+        node_id = self._metrics.node_ids.get(concept)
+        if node_id is not None:
+            self._remaining[self._metrics.prerequisites.dependents_of(node_id)] -= 1
+    
+    def forget(self, concept):
+        """Record that a concept is no longer mastered"""
+        self._sync()
+        if concept not in self.mastered_concepts:
+            return
+        self.mastered_concepts.discard(concept)
+        node_id = self._metrics.node_ids.get(concept)
+        if node_id is not None:
+            self._remaining[self._metrics.prerequisites.dependents_of(node_id)] += 1
+    
+    def update(self, mastered_concepts):
+        """
+        Bring the tracker in line with a full set of mastered concepts
+        
+        Only the difference to the concepts tracked so far is applied, so
+        following a learner one step at a time stays cheap.
+        """
+        self._sync()
+        mastered_concepts = set(mastered_concepts)
+        for concept in self.mastered_concepts - mastered_concepts:
+            self.forget(concept)
+        for concept in mastered_concepts - self.mastered_concepts:
+            self.master(concept)
+    
+    def unmet_prerequisites(self, concept):
+        """Number of direct prerequisites of a concept that are not mastered"""
+        self._sync()
+        node_id = self._metrics.node_ids.get(concept)
+        if node_id is None:
+            return 0
+        return self._remaining[node_id].item()
+    
+    def __contains__(self, concept):
+        self._sync()
+        node_id = self._metrics.node_ids.get(concept)
+        if node_id is None:
+            return False
+        return bool(self._metrics.in_degree[node_id] > 0 and self._remaining[node_id] == 0)
+    
+    def concepts(self):
+        """List of the concepts currently on the frontier"""
+        self._sync()
+        on_frontier = (self._metrics.in_degree > 0) & (self._remaining == 0)
+        return [self._metrics.nodes[i] for i in np.flatnonzero(on_frontier)]
 
 class KnowledgeGraph:
     def __init__(self, knowledge_path='data/cs_knowledge.json'):
-        # Load CS knowledge
-        with open(knowledge_path, 'r') as f:
-            self.cs_knowledge = json.load(f)
+        # Share the process-wide CS knowledge instead of loading another copy
+        self.knowledge_manager = get_knowledge_manager(knowledge_path)
+        self.cs_knowledge = self.knowledge_manager.knowledge_base
             
         # Create knowledge graph
         self.graph = nx.DiGraph()
         
+        # Bumped on every mutation; metrics are recomputed for a new version
+        self.version = 0
+        self._metrics = None
+        
         # Build graph from knowledge
         self._build_graph()
         
+        # Keep the graph in step with edits to the knowledge file
+        self.knowledge_manager.add_reload_listener(self._on_knowledge_reload)
+        
     def _build_graph(self):
         """Constructs a dynamic knowledge graph from CS concepts"""
+        # Node details stay in the shared knowledge base (see get_concept_details)
         for concept, details in self.cs_knowledge.items():
-            self.graph.add_node(concept, **details)
+            self.graph.add_node(concept)
             for prereq in details.get('prerequisites', []):
                 self.graph.add_edge(prereq, concept)
+        self.invalidate_metrics()
+    
+    def invalidate_metrics(self):
+        """Mark the graph as changed; call after mutating self.graph directly"""
+        self.version += 1
+    
+    @property
+    def metrics(self):
+        """GraphMetrics for the current graph version, computed on first use"""
+        metrics = self._metrics
+        if metrics is None or metrics.version != self.version:
+            metrics = GraphMetrics(self.graph, self.version)
+            self._metrics = metrics
+        return metrics
+    
+    def _node_metric(self, name, concept, default=0):
+        metrics = self.metrics
+        node_id = metrics.node_ids.get(concept)
+        if node_id is None:
+            return default
+        return getattr(metrics, name)[node_id].item()
+    
+    def _on_knowledge_reload(self, changed_concepts):
+        """Rebuild the prerequisite edges of concepts that changed on reload"""
+        self.cs_knowledge = self.knowledge_manager.knowledge_base
+        for concept in changed_concepts:
+            if concept in self.graph:
+                self.graph.remove_edges_from(list(self.graph.in_edges(concept)))
+            if concept not in self.cs_knowledge:
+                # Keep removed concepts that others still list as prerequisites
+                if concept in self.graph and self.graph.out_degree(concept) == 0:
+                    self.graph.remove_node(concept)
+                continue
+            self.graph.add_node(concept)
+            for prereq in self.cs_knowledge[concept].get('prerequisites', []):
+                self.graph.add_edge(prereq, concept)
+        self.invalidate_metrics()
+    
+    def get_concept_details(self, concept):
+        """Get the knowledge base entry for a concept (empty if it has none)"""
+        return self.cs_knowledge.get(concept, {})
             
     def get_concept_centrality(self, concept):
         """Returns how central a concept is in the knowledge graph"""
-        centrality = nx.degree_centrality(self.graph)
-        return centrality.get(concept, 0)
+        return self._node_metric('centrality', concept)
+    
+    def get_in_degree(self, concept):
+        """Number of direct prerequisites of a concept"""
+        return self._node_metric('in_degree', concept)
+    
+    def get_out_degree(self, concept):
+        """Number of concepts that list this concept as a direct prerequisite"""
+        return self._node_metric('out_degree', concept)
+    
+    def get_concept_depth(self, concept):
+        """Length of the longest prerequisite chain leading to a concept"""
+        return self._node_metric('depth', concept)
+    
+    def get_dependent_count(self, concept):
+        """Number of concepts that build on this concept, directly or indirectly"""
+        return self._node_metric('dependent_count', concept)
         
     def get_knowledge_frontier(self, mastered_concepts):
-        """Identifies concepts that are just beyond the learner's current knowledge"""
-        frontier = set()
-        for concept in mastered_concepts:
-            for neighbor in self.graph.successors(concept):
-                if all(prereq in mastered_concepts for prereq in self.graph.predecessors(neighbor)):
-                    frontier.add(neighbor)
-        return list(frontier)
+        """
+        Identifies concepts that are just beyond the learner's current knowledge
+        
+        Use a KnowledgeFrontier instead when following one learner over time.
+        """
+        return KnowledgeFrontier(self, mastered_concepts).concepts()
         
     def get_concept_difficulty(self, concept, learner_level='beginner'):
         """Get dynamic difficulty assessment for a concept"""
-        base_difficulty = self.graph.nodes[concept].get('difficulty', 1)
+        base_difficulty = self.get_concept_details(concept).get('difficulty', 1)
         if learner_level == 'beginner':
             return base_difficulty
         elif learner_level == 'intermediate':
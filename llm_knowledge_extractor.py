@@ -1,6 +1,8 @@
 import requests
 import json
 import os
+import copy
+from src.knowledge_registry import get_knowledge_manager
 
 class LLMKnowledgeExtractor:
     """Uses LLM to dynamically extract and organize CS knowledge"""
@@ -12,14 +14,26 @@ class LLMKnowledgeExtractor:
         # Ensure the directory exists
         os.makedirs(os.path.dirname(knowledge_base_path), exist_ok=True)
         
-        # Load existing knowledge if it exists
+        # Use the shared knowledge base if it exists; a private, editable copy
+        # is only made the first time knowledge_base is accessed
+        self._knowledge_base = None
         if os.path.exists(knowledge_base_path):
-            with open(knowledge_base_path, 'r') as f:
-                self.knowledge_base = json.load(f)
+            # Keep the manager rather than its store, which is closed after a reload
+            self._knowledge_manager = get_knowledge_manager(knowledge_base_path)
         else:
             # Initialize with empty knowledge base
-            self.knowledge_base = {}
+            self._knowledge_manager = None
+            self._knowledge_base = {}
             self._save_knowledge_base()
+    
+    @property
+    def knowledge_base(self):
+        """Editable copy of the knowledge base"""
+        if self._knowledge_base is None:
+            self._knowledge_base = {
+                name: copy.deepcopy(dict(details)) for name, details in self._knowledge_manager.knowledge_base.items()
+            }
+        return self._knowledge_base
             
     def enrich_concept(self, concept_name):
         """Dynamically enriches a concept with LLM-generated knowledge"""
@@ -104,5 +118,9 @@ class LLMKnowledgeExtractor:
         
     def _save_knowledge_base(self):
         """Saves the updated knowledge base to disk"""
-        with open(self.knowledge_base_path, 'w') as f:
-            json.dump(self.knowledge_base, f, indent=4)
\ No newline at end of file
+        # Write to a temporary file and rename it, so a running KnowledgeManager
+        # watching the file never reloads a half-written knowledge base
+        temp_path = f"{self.knowledge_base_path}.tmp{os.getpid()}"
+        with open(temp_path, 'w') as f:
+            json.dump(self.knowledge_base, f, indent=4)
+        os.replace(temp_path, self.knowledge_base_path)
\ No newline at end of file
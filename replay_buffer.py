@@ -1,23 +1,45 @@
-import random
 import numpy as np
-from collections import deque
 
 class ReplayBuffer:
-    """Experience replay buffer for reinforcement learning"""
-    
-    def __init__(self, capacity=10000):
+    """
+    Experience replay buffer for reinforcement learning
+
+    Experiences live in preallocated NumPy arrays (one per field) used as a
+    ring buffer, so pushing is O(1) and sampling gathers contiguous batch
+    arrays by index in O(batch_size).
+    """
+
+    def __init__(self, capacity=10000, state_shape=None, state_dtype=None, seed=None):
         """
         Initialize replay buffer with fixed capacity
-        
+
         Args:
             capacity: Maximum number of experiences to store
+            state_shape: Shape of one state (taken from the first push if omitted)
+            state_dtype: dtype of the states (taken from the first push if omitted)
+            seed: Seed for the sampling random generator
         """
-        self.buffer = deque(maxlen=capacity)
-    
+        self.capacity = capacity
+        self.position = 0
+        self.size = 0
+        self.rng = np.random.default_rng(seed)
+
+        self.states = None
+        self.next_states = None
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=float)
+        self.dones = np.zeros(capacity, dtype=bool)
+        if state_shape is not None:
+            self._allocate_states(state_shape, state_dtype or float)
+
+    def _allocate_states(self, state_shape, state_dtype):
+        self.states = np.zeros((self.capacity,) + tuple(state_shape), dtype=state_dtype)
+        self.next_states = np.zeros_like(self.states)
+
     def push(self, state, action, reward, next_state, done):
         """
-        Add experience to the buffer
-        
+        Add experience to the buffer, overwriting the oldest one when full
+
         Args:
             state: Current state
             action: Action taken
@@ -25,24 +47,218 @@ class ReplayBuffer:
             next_state: Next state
             done: Whether the episode is done
         """
-        experience = (state, action, reward, next_state, done)
-        self.buffer.append(experience)
-    
+        if self.states is None:
+            state_array = np.asarray(state)
+            self._allocate_states(state_array.shape, state_array.dtype)
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return i
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        """
+        Add several experiences at once
+
+        Returns:
+            Array with the buffer index of each experience
+        """
+        states = np.asarray(states)
+        if self.states is None:
+            self._allocate_states(states.shape[1:], states.dtype)
+        count = len(states)
+        # Only the newest `capacity` experiences survive a batch that wraps around
+        keep = slice(max(count - self.capacity, 0), count)
+        indices = (self.position + np.arange(count)[keep]) % self.capacity
+        self.states[indices] = states[keep]
+        self.actions[indices] = np.asarray(actions)[keep]
+        self.rewards[indices] = np.asarray(rewards)[keep]
+        self.next_states[indices] = np.asarray(next_states)[keep]
+        self.dones[indices] = np.asarray(dones)[keep]
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+        return indices
+
+    def get(self, indices):
+        """
+        Gather the experiences at some buffer indices
+
+        Returns:
+            Tuple of (states, actions, rewards, next_states, dones) arrays
+        """
+        return (self.states[indices], self.actions[indices], self.rewards[indices],
+                self.next_states[indices], self.dones[indices])
+
+    def sample_indices(self, batch_size):
+        """Buffer indices of a uniform random batch, without replacement"""
+        batch_size = min(batch_size, self.size)
+        return self.rng.choice(self.size, size=batch_size, replace=False)
+
     def sample(self, batch_size):
         """
         Sample a batch of experiences randomly
-        
+
         Args:
             batch_size: Number of experiences to sample
-            
+
         Returns:
-            List of sampled experiences
+            Tuple of (states, actions, rewards, next_states, dones) arrays
         """
-        if batch_size > len(self.buffer):
-            batch_size = len(self.buffer)
-        
-        return random.sample(self.buffer, batch_size)
-    
+        return self.get(self.sample_indices(batch_size))
+
     def __len__(self):
         """Return the current size of the buffer"""
-        return len(self.buffer)
+        return self.size
+
+class SumTree:
+    """
+    Binary tree over a fixed number of leaf priorities where every inner node
+    holds the sum of its children. Updating a leaf and finding the leaf at a
+    cumulative priority both take O(log n); both accept index arrays.
+    """
+
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity: Number of leaves
+        """
+        self.capacity = capacity
+        # Leaves start at `offset` so the tree is complete; node i has children 2i and 2i + 1
+        self.offset = 1 << max(capacity - 1, 0).bit_length()
+        self.tree = np.zeros(2 * self.offset)
+
+    @property
+    def total(self):
+        """Sum of all priorities"""
+        return self.tree[1]
+
+    def get(self, indices):
+        """Priorities of some leaves"""
+        return self.tree[self.offset + np.asarray(indices)]
+
+    def update(self, indices, priorities):
+        """Set the priorities of one or more leaves and refresh the sums above them"""
+        tree = self.tree
+        if np.ndim(indices) == 0:
+            node = self.offset + int(indices)
+            tree[node] = priorities
+            while node > 1:
+                node //= 2
+                tree[node] = tree[2 * node] + tree[2 * node + 1]
+            return
+        # With repeated indices the last priority wins, as with sequential updates
+        nodes = self.offset + np.asarray(indices, dtype=np.int64)
+        tree[nodes] = priorities
+        while len(nodes) and nodes[0] > 1:
+            # Siblings share a parent; writing the same sum twice is harmless
+            nodes = nodes // 2
+            tree[nodes] = tree[2 * nodes] + tree[2 * nodes + 1]
+
+    def find(self, values):
+        """
+        Leaves at some cumulative priorities
+
+        Args:
+            values: Array of cumulative priorities in [0, total)
+
+        Returns:
+            Array of leaf indices
+        """
+        values = np.array(values, dtype=float)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while len(nodes) and nodes[0] < self.offset:
+            left = self.tree[2 * nodes]
+            go_right = values >= left
+            values -= left * go_right
+            nodes = 2 * nodes + go_right
+        return nodes - self.offset
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Replay buffer that samples experiences in proportion to their TD error
+    (prioritized experience replay) using a SumTree.
+
+    Experience i is sampled with probability p_i^alpha / sum_k p_k^alpha, where
+    p_i = |TD error| + epsilon. Sampled batches come with importance-sampling
+    weights (N * P(i))^-beta, normalised by their maximum, where beta is
+    annealed towards 1 by beta_increment per sampled batch.
+    """
+
+    def __init__(self, capacity=10000, alpha=0.6, beta=0.4, beta_increment=0.001, epsilon=1e-6,
+                 state_shape=None, state_dtype=None, seed=None):
+        """
+        Initialize the buffer
+
+        Args:
+            capacity: Maximum number of experiences to store
+            alpha: How strongly priorities skew sampling (0 = uniform)
+            beta: Initial importance-sampling exponent
+            beta_increment: Amount beta grows per sampled batch, up to 1
+            epsilon: Added to TD errors so no experience gets zero priority
+            state_shape: Shape of one state (taken from the first push if omitted)
+            state_dtype: dtype of the states (taken from the first push if omitted)
+            seed: Seed for the sampling random generator
+        """
+        super().__init__(capacity, state_shape=state_shape, state_dtype=state_dtype, seed=seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        # New experiences get the highest priority seen so they are replayed at least once
+        self.max_priority = 1.0
+
+    def push(self, state, action, reward, next_state, done):
+        """Add experience to the buffer with the current maximum priority"""
+        index = super().push(state, action, reward, next_state, done)
+        self.tree.update(index, self.max_priority ** self.alpha)
+        return index
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        """Add several experiences at once with the current maximum priority"""
+        indices = super().push_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(indices, self.max_priority ** self.alpha)
+        return indices
+
+    def sample_indices(self, batch_size):
+        """Buffer indices of a batch drawn in proportion to priority, one per equal slice of the total"""
+        batch_size = min(batch_size, self.size)
+        total = self.tree.total
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+        # Keep rounding from stepping past the last non-empty leaf
+        indices = self.tree.find(np.minimum(values, np.nextafter(total, 0)))
+        return np.minimum(indices, self.size - 1)
+
+    def sample(self, batch_size):
+        """
+        Sample a batch of experiences in proportion to their priority
+
+        Args:
+            batch_size: Number of experiences to sample
+
+        Returns:
+            Tuple of (states, actions, rewards, next_states, dones, indices, weights);
+            pass indices to update_priorities once the TD errors are known
+        """
+        indices = self.sample_indices(batch_size)
+        probabilities = self.tree.get(indices) / self.tree.total
+        weights = (self.size * probabilities) ** -self.beta
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return self.get(indices) + (indices, weights)
+
+    def update_priorities(self, indices, td_errors):
+        """
+        Set the priorities of sampled experiences from their new TD errors
+
+        Args:
+            indices: Buffer indices returned by sample
+            td_errors: TD error of each experience
+        """
+        priorities = np.abs(td_errors) + self.epsilon
+        self.max_priority = max(self.max_priority, priorities.max())
+        self.tree.update(indices, priorities ** self.alpha)
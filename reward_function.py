@@ -1,4 +1,34 @@
 import numpy as np
+from knowledge_graph import KnowledgeFrontier
+
+class RewardTable:
+    """
+    State-independent parts of the reward for every concept, compiled for one
+    graph version, learner level and learning style. Arrays are indexed by node
+    ID (see KnowledgeGraph.metrics.node_ids).
+    """
+    def __init__(self, reward_function, metrics, learner_level, learning_style):
+        knowledge_graph = reward_function.knowledge_graph
+        self.metrics = metrics
+        self.learner_level = learner_level
+        self.learning_style = learning_style
+        
+        # Base reward - using dynamic difficulty assessment
+        difficulty = np.array([knowledge_graph.get_concept_difficulty(concept, learner_level)
+                               for concept in metrics.nodes], dtype=float)
+        base_reward = 1.0 / (difficulty + 0.1)  # Avoid division by zero
+        # Importance factor - rewards concepts that are more central in knowledge graph
+        importance_factor = 3.0 * metrics.centrality
+        # Efficiency factor - reward for choosing concepts that unlock many others
+        efficiency_factor = 0.2 * metrics.out_degree
+        self.static_reward = base_reward + importance_factor + efficiency_factor
+        
+        # Whether any example of the concept matches the learning style
+        self.style_match = np.array([
+            any(reward_function._matches_learning_style(example, learning_style)
+                for example in knowledge_graph.get_concept_details(concept).get('examples', []))
+            for concept in metrics.nodes
+        ], dtype=bool)
 
 class RewardFunction:
     """Reward function for the CS learning path reinforcement learning environment"""
@@ -14,11 +44,32 @@ class RewardFunction:
         self.knowledge_graph = knowledge_graph
         self.learner_profile = learner_profile
         
+        # Frontier of the last state seen, moved along incrementally
+        self.frontier = KnowledgeFrontier(knowledge_graph)
+        # RewardTables by (learner level, learning style) for the current graph version
+        self._tables = {}
+        
         # Reward factors
         self.completion_reward = 10.0
         self.prerequisite_penalty = -5.0
         self.difficulty_factor = 0.5
         self.learning_style_match_bonus = 2.0
+        self.frontier_bonus = 2.0
+        
+    def get_reward_table(self):
+        """RewardTable for the learner profile and graph version, compiled on first use"""
+        metrics = self.knowledge_graph.metrics
+        key = (self.learner_profile.get('level', 'beginner'), self.learner_profile.get('learning_style', 'visual'))
+        table = self._tables.get(key)
+        if table is None or table.metrics is not metrics:
+            if table is not None:
+                self._tables.clear()
+            table = RewardTable(self, metrics, *key)
+            self._tables[key] = table
+        return table
+    
+    def _penalty(self):
+        return self.prerequisite_penalty * (1.0 - self.learner_profile.get('risk_tolerance', 0.5))
         
     def calculate_reward(self, current_state, action, next_state):
         """
@@ -32,50 +83,68 @@ class RewardFunction:
         Returns:
             Calculated reward value
         """
-        # Base reward - using dynamic difficulty assessment
-        learner_level = self.learner_profile.get('level', 'beginner')
-        difficulty = self.knowledge_graph.get_concept_difficulty(action, learner_level)
-        base_reward = 1.0 / (difficulty + 0.1)  # Avoid division by zero
-            
+        table = self.get_reward_table()
+        node_id = table.metrics.node_ids[action]
+        
         # Check prerequisites - using knowledge graph relationships
-        prerequisites = self.knowledge_graph.get_prerequisites(action)
-        for prereq in prerequisites:
-            if prereq not in current_state.mastered_concepts:
-                return self.prerequisite_penalty * (1.0 - self.learner_profile.get('risk_tolerance', 0.5))
-                
-        # Importance factor - rewards concepts that are more central in knowledge graph
-        centrality = self.knowledge_graph.get_concept_centrality(action)
-        importance_factor = 3.0 * centrality
+        self.frontier.update(current_state.mastered_concepts)
+        if self.frontier.unmet_prerequisites(action) > 0:
+            return self._penalty()
         
-        # Learning style match using topic characteristics
-        learning_style_bonus = 0
-        learner_style = self.learner_profile.get('learning_style', 'visual')
+        reward = table.static_reward[node_id].item()
         
-        # Check examples for matching content types
-        if action in self.knowledge_graph.graph.nodes:
-            examples = self.knowledge_graph.graph.nodes[action].get('examples', [])
-            for example in examples:
-                if self._matches_learning_style(example, learner_style):
-                    learning_style_bonus += self.learning_style_match_bonus
-                    break
+        # Learning style match using topic characteristics
+        if table.style_match[node_id]:
+            reward += self.learning_style_match_bonus
         
         # Knowledge frontier bonus - encourage exploration at the right difficulty
-        frontier_bonus = 0
-        if action in self.knowledge_graph.get_knowledge_frontier(current_state.mastered_concepts):
-            frontier_bonus = 2.0
-            
-        # Efficiency factor - reward for choosing concepts that unlock many others
-        dependent_concepts = len(self.knowledge_graph.get_dependent_concepts(action))
-        efficiency_factor = 0.2 * dependent_concepts
-        
-        # Calculate final reward
-        reward = base_reward + learning_style_bonus + importance_factor + frontier_bonus + efficiency_factor
+        if action in self.frontier:
+            reward += self.frontier_bonus
         
         # Terminal state bonus
         if next_state.is_terminal():
             reward += self.completion_reward
             
         return reward
+    
+    def calculate_rewards(self, states, actions, terminal=None):
+        """
+        Calculate the rewards of a batch of transitions at once
+        
+        Args:
+            states: Boolean mastery matrix of shape (batch, concepts) indexed by node
+                ID, or a list of states with mastered_concepts
+            actions: Node IDs or concept names, one per state
+            terminal: Optional boolean array marking transitions that complete the curriculum
+            
+        Returns:
+            Array of rewards, one per transition
+        """
+        table = self.get_reward_table()
+        metrics = table.metrics
+        mastered = self._mastery_matrix(states, metrics)
+        actions = np.array([metrics.node_ids[action] if isinstance(action, str) else action for action in actions],
+                           dtype=np.int64)
+        
+        # Unmet prerequisites of every action in its own state
+        owners, prereqs = metrics.prerequisites.gather_prerequisites(actions)
+        unmet = np.bincount(owners[~mastered[owners, prereqs]], minlength=len(actions))
+        
+        rewards = table.static_reward[actions] + self.learning_style_match_bonus * table.style_match[actions]
+        # With every prerequisite met, a concept is on the frontier iff it has any
+        rewards += np.where(metrics.in_degree[actions] > 0, self.frontier_bonus, 0.0)
+        if terminal is not None:
+            rewards += self.completion_reward * np.asarray(terminal, dtype=bool)
+        return np.where(unmet > 0, self._penalty(), rewards)
+    
+    def _mastery_matrix(self, states, metrics):
+        if isinstance(states, np.ndarray):
+            return states.astype(bool, copy=False)
+        mastered = np.zeros((len(states), len(metrics.nodes)), dtype=bool)
+        for row, state in enumerate(states):
+            node_ids = [metrics.node_ids[concept] for concept in state.mastered_concepts if concept in metrics.node_ids]
+            mastered[row, node_ids] = True
+        return mastered
         
     def _matches_learning_style(self, example, learning_style):
         """Determine if an example matches the learner's preferred style"""
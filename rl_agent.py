@@ -1,6 +1,7 @@
 import numpy as np
 import random
 import json
+from src.prerequisite_graph import PrerequisiteGraph
 
 class RLAgent:
     def __init__(self, state_size, action_size, alpha=0.1, gamma=0.99, epsilon=1.0, epsilon_decay=0.995, epsilon_min=0.01):
@@ -31,25 +32,20 @@ class RLAgent:
         self.prerequisites = self._load_knowledge_relationships()
 
     def _load_knowledge_relationships(self):
-        """Load prerequisite relationships from a JSON file"""
+        """Load prerequisite relationships from a JSON file into a sparse PrerequisiteGraph"""
         try:
             with open('knowledge_graph.json', 'r') as file:
                 data = json.load(file)
                 
-                # Create a prerequisite matrix
-                prereq_matrix = np.zeros((self.state_size, self.state_size))
-                
-                # Fill the prerequisite matrix
-                for concept, prereqs in data.items():
-                    concept_id = int(concept)
-                    for prereq in prereqs:
-                        prereq_id = int(prereq)
-                        prereq_matrix[concept_id][prereq_id] = 1
-                        
-                return prereq_matrix
+                # Map each concept ID to its prerequisite IDs
+                prereq_lists = {
+                    int(concept): [int(prereq) for prereq in prereqs]
+                    for concept, prereqs in data.items()
+                }
+                return PrerequisiteGraph.from_lists(self.state_size, prereq_lists)
         except FileNotFoundError:
-            print("Knowledge graph file not found. Initializing empty prerequisite matrix.")
-            return np.zeros((self.state_size, self.state_size))
+            print("Knowledge graph file not found. Initializing empty prerequisite graph.")
+            return PrerequisiteGraph.from_lists(self.state_size, {})
 
     def select_action(self, state):
         """
@@ -89,3 +85,33 @@ class RLAgent:
         # Decay epsilon
         if self.epsilon > self.epsilon_min:
             self.epsilon *= self.epsilon_decay
+    
+    def update_batch(self, states, actions, rewards, next_states, dones, weights=None):
+        """
+        Apply the Q-learning update for a batch of experiences at once
+        
+        Experiences that hit the same state-action pair contribute the mean of
+        their TD errors. Epsilon is not decayed here.
+        
+        Args:
+            states: Array of states
+            actions: Array of actions taken
+            rewards: Array of rewards received
+            next_states: Array of next states
+            dones: Boolean array marking finished episodes
+            weights: Optional importance-sampling weight per experience
+            
+        Returns:
+            Array of TD errors, one per experience (unweighted)
+        """
+        states = np.asarray(states, dtype=np.int64)
+        actions = np.asarray(actions, dtype=np.int64)
+        future = self.gamma * self.q_table[np.asarray(next_states, dtype=np.int64)].max(axis=1)
+        targets = np.asarray(rewards, dtype=float) + np.where(dones, 0.0, future)
+        td_errors = targets - self.q_table[states, actions]
+        
+        pairs, pair_index = np.unique(states * self.action_size + actions, return_inverse=True)
+        td_sum = np.zeros(len(pairs))
+        np.add.at(td_sum, pair_index, td_errors if weights is None else weights * td_errors)
+        self.q_table.reshape(-1)[pairs] += self.alpha * td_sum / np.bincount(pair_index)
+        return td_errors
@@ -0,0 +1,100 @@
+import re
+
+# Words that carry no information about which concept is being asked about
+STOP_WORDS = frozenset([
+    "what", "is", "a", "an", "the", "how", "does", "do", "explain", "tell", "me", "about",
+    "are", "of", "in", "and", "or", "to", "for", "with", "work", "works", "can", "you"
+])
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_token(token):
+    """Reduce a lowercase word to the form stored in the index (naive plural stripping)"""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    """Split text into normalized index tokens"""
+    return [normalize_token(token) for token in _TOKEN_PATTERN.findall(text.lower())]
+
+
+class ConceptIndex:
+    """
+    Inverted index from normalized tokens and word bigrams to concept IDs.
+
+    Concept IDs are positions in the concept list the index was built from,
+    so they line up with KnowledgeManager.get_all_concepts().
+    """
+    def __init__(self, concept_names):
+        self.concepts = list(concept_names)
+        self.postings = {}
+        self.name_lengths = []
+
+        for concept_id, name in enumerate(self.concepts):
+            tokens = tokenize(name)
+            self.name_lengths.append(len(tokens))
+            for term in set(tokens + self._bigrams(tokens)):
+                self.postings.setdefault(term, []).append(concept_id)
+
+    def _bigrams(self, tokens):
+        """Adjacent word pairs, used to favour concepts whose name appears as a phrase"""
+        return [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+    def __len__(self):
+        return len(self.concepts)
+
+    def get_postings(self, term):
+        """Get the sorted concept IDs containing a token or bigram"""
+        return self.postings.get(term, [])
+
+    def search(self, text, limit=None):
+        """
+        Find concepts whose names share terms with the text
+
+        Args:
+            text: Free-form query text
+            limit: Maximum number of results (None for all)
+
+        Returns:
+            List of concept names, best match first
+        """
+        tokens = [token for token in tokenize(text) if token not in STOP_WORDS]
+        terms = [term for term in dict.fromkeys(tokens) if term in self.postings]
+        if not terms:
+            return []
+
+        # Intersect the postings lists, rarest first; fall back to the union if
+        # no concept contains every query term
+        postings = sorted((self.postings[term] for term in terms), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        if not candidates:
+            candidates = set().union(*postings)
+
+        # Score candidates by matched tokens, then matched phrases
+        bigrams = set(self._bigrams(tokens))
+        token_hits = dict.fromkeys(candidates, 0)
+        bigram_hits = dict.fromkeys(candidates, 0)
+        for term in terms:
+            for concept_id in self.postings[term]:
+                if concept_id in token_hits:
+                    token_hits[concept_id] += 1
+        for bigram in bigrams:
+            for concept_id in self.postings.get(bigram, []):
+                if concept_id in bigram_hits:
+                    bigram_hits[concept_id] += 1
+
+        # Deterministic ranking: most matches, then shortest name, then KB order
+        ranked = sorted(
+            candidates,
+            key=lambda cid: (-token_hits[cid], -bigram_hits[cid], self.name_lengths[cid], cid)
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self.concepts[cid] for cid in ranked]
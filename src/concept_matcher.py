@@ -0,0 +1,117 @@
+from collections import deque
+
+
+class ConceptMatcher:
+    """
+    Aho-Corasick automaton over concept names and their synonyms.
+
+    Finds every concept mention in a single pass over the query, instead of
+    running a substring test per concept.
+    """
+    def __init__(self, concept_names, synonyms=None):
+        """
+        Build the automaton
+
+        Args:
+            concept_names: Iterable of concept names from the knowledge base
+            synonyms: Optional dict mapping an alternative name to its concept name
+        """
+        # Trie stored as parallel lists: goto transitions, failure links, outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for name in concept_names:
+            self._add_pattern(name.lower(), name)
+        for alias, name in (synonyms or {}).items():
+            self._add_pattern(alias.lower(), name)
+
+        self._build_failure_links()
+
+    def _add_pattern(self, pattern, concept):
+        """Insert a pattern into the trie"""
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(pattern), concept))
+
+    def _build_failure_links(self):
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _is_boundary(self, text, start, end):
+        """Check that a match is a whole word, allowing a plural 's'/'es' suffix"""
+        if start > 0 and text[start - 1].isalnum():
+            return False
+        for suffix in ("", "s", "es"):
+            tail = end + len(suffix)
+            if text.startswith(suffix, end) and (tail >= len(text) or not text[tail].isalnum()):
+                return True
+        return False
+
+    def find_all(self, text):
+        """
+        Find the longest non-overlapping concept mentions in the text
+
+        Args:
+            text: Query text
+
+        Returns:
+            List of (start, end, concept) tuples in order of appearance
+        """
+        text = text.lower()
+        matches = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, concept in self._output[state]:
+                start = position - length + 1
+                if self._is_boundary(text, start, position + 1):
+                    matches.append((start, position + 1, concept))
+
+        # Prefer longer matches, then earlier ones, and drop anything overlapping them
+        selected = []
+        taken = [False] * len(text)
+        for start, end, concept in sorted(matches, key=lambda m: (m[0] - m[1], m[0])):
+            if not any(taken[start:end]):
+                selected.append((start, end, concept))
+                for i in range(start, end):
+                    taken[i] = True
+        return sorted(selected)
+
+    def find_best(self, text):
+        """
+        Find the most specific concept mentioned in the text
+
+        Args:
+            text: Query text
+
+        Returns:
+            Concept name of the longest mention (earliest on ties), or None
+        """
+        matches = self.find_all(text)
+        if not matches:
+            return None
+        start, end, concept = min(matches, key=lambda m: (m[0] - m[1], m[0]))
+        return concept
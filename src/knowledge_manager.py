@@ -1,38 +1,273 @@
+import hashlib
 import json
 import os
+import threading
+import weakref
+from types import MappingProxyType, MethodType
+from src.concept_index import ConceptIndex
+from src.concept_matcher import ConceptMatcher
+from src.knowledge_store import open_knowledge_store
+
+
+class KnowledgeSnapshot:
+    """
+    Immutable view of one version of the knowledge base and its indexes.
+
+    KnowledgeManager swaps whole snapshots on reload, so a caller holding a
+    snapshot keeps a consistent view until it is done with it.
+    """
+    def __init__(self, knowledge_base, synonyms, file_state, previous=None):
+        self.knowledge_base = knowledge_base
+        self.synonyms = synonyms
+        self.file_state = file_state
+        self._fingerprints = None
+        
+        # Some concept keys are not lowercase (e.g. "API"), so keep a case-insensitive alias
+        self.lowercase_names = {name.lower(): name for name in knowledge_base}
+        
+        # The indexes only depend on concept names and synonyms, so reuse them when those are unchanged
+        names = list(knowledge_base.keys())
+        if previous is not None and previous.concept_index.concepts == names:
+            self.concept_index = previous.concept_index
+        else:
+            self.concept_index = ConceptIndex(names)
+        if previous is not None and previous.concept_index.concepts == names and previous.synonyms == synonyms:
+            self.concept_matcher = previous.concept_matcher
+        else:
+            self.concept_matcher = ConceptMatcher(names, synonyms)
+    
+    @property
+    def fingerprints(self):
+        """
+        Hash of every concept, keyed by name
+
+        Hashing reads every field of every concept, so it is only done when a
+        reload compares snapshots (see changed_concepts), not at startup.
+        """
+        if self._fingerprints is None:
+            self._fingerprints = {name: self._fingerprint(name) for name in self.knowledge_base}
+        return self._fingerprints
+    
+    def _fingerprint(self, name):
+        if hasattr(self.knowledge_base, "fingerprint"):
+            return self.knowledge_base.fingerprint(name)
+        encoded = json.dumps(self.knowledge_base[name], sort_keys=True).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).digest()
+    
+    def changed_concepts(self, previous):
+        """Get the names of concepts added, removed or edited since another snapshot"""
+        changed = {name for name, fp in self.fingerprints.items() if previous.fingerprints.get(name) != fp}
+        changed.update(name for name in previous.fingerprints if name not in self.fingerprints)
+        # Concepts whose synonyms were added or removed match different queries now
+        for alias in set(self.synonyms) ^ set(previous.synonyms):
+            changed.add(self.synonyms.get(alias) or previous.synonyms.get(alias))
+        for alias in set(self.synonyms) & set(previous.synonyms):
+            if self.synonyms[alias] != previous.synonyms[alias]:
+                changed.update([self.synonyms[alias], previous.synonyms[alias]])
+        return changed
+
 
 class KnowledgeManager:
-    def __init__(self, knowledge_file='data/cs_knowledge.json'):
+    def __init__(self, knowledge_file='data/cs_knowledge.json', synonyms_file='data/synonyms.json'):
         self.knowledge_file = knowledge_file
-        self.knowledge_base = self._load_knowledge_base()
+        self.synonyms_file = synonyms_file
+        self._reload_lock = threading.Lock()
+        self._listeners = []
+        self._watcher = None
+        self._stop_watching = threading.Event()
         
-    def _load_knowledge_base(self):
-        """Load the knowledge base from a JSON file"""
+        file_state = self._get_file_state()
+        knowledge_base = self._load_knowledge_base()
+        self._snapshot = KnowledgeSnapshot(knowledge_base, self._load_synonyms(knowledge_base), file_state)
+    
+    @property
+    def snapshot(self):
+        """Current KnowledgeSnapshot; hold on to it to get a consistent view across calls"""
+        return self._snapshot
+    
+    @property
+    def knowledge_base(self):
+        return self._snapshot.knowledge_base
+    
+    @property
+    def synonyms(self):
+        return self._snapshot.synonyms
+    
+    @property
+    def concept_index(self):
+        return self._snapshot.concept_index
+    
+    @property
+    def concept_matcher(self):
+        return self._snapshot.concept_matcher
+        
+    def _load_knowledge_base(self, raise_errors=False):
+        """
+        Load the knowledge base from a JSON file
+        
+        The JSON is compiled into a memory-mapped store next to it, so concept
+        fields are only decoded when they are read. If the store can't be
+        written, the JSON is loaded directly instead.
+        """
         try:
             if os.path.exists(self.knowledge_file):
+                try:
+                    return open_knowledge_store(self.knowledge_file)
+                except OSError as e:
+                    print(f"Compiled knowledge store unavailable ({e}), loading JSON")
                 with open(self.knowledge_file, 'r') as file:
-                    return json.load(file)
+                    # Managers are shared between components, keep them read-only
+                    return MappingProxyType(json.load(file))
             else:
                 print(f"Knowledge file not found: {self.knowledge_file}")
                 return {}
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error loading knowledge base: {e}")
             return {}
     
+    def _load_synonyms(self, knowledge_base):
+        """
+        Load alternative concept names from a JSON file
+        
+        The "synonyms" section may map an alias to a concept name, or a concept
+        name to a list of aliases. Returns a dict of alias -> concept name.
+        """
+        try:
+            if not self.synonyms_file or not os.path.exists(self.synonyms_file):
+                return {}
+            with open(self.synonyms_file, 'r') as file:
+                entries = json.load(file).get("synonyms", {})
+        except Exception as e:
+            print(f"Error loading synonyms: {e}")
+            return {}
+        
+        concept_names = {name.lower(): name for name in knowledge_base}
+        synonyms = {}
+        for key, value in entries.items():
+            if isinstance(value, str):
+                pairs = [(key, value)]
+            else:
+                pairs = [(alias, key) for alias in value]
+            for alias, concept in pairs:
+                if concept.lower() in concept_names:
+                    synonyms[alias.lower()] = concept_names[concept.lower()]
+        return synonyms
+    
+    def _get_file_state(self):
+        """Modification times of the knowledge and synonyms files"""
+        state = []
+        for path in (self.knowledge_file, self.synonyms_file):
+            try:
+                state.append(os.path.getmtime(path) if path else None)
+            except OSError:
+                state.append(None)
+        return tuple(state)
+    
+    def is_stale(self):
+        """Check whether the files changed since the current snapshot was loaded"""
+        return self._get_file_state() != self._snapshot.file_state
+    
+    def reload(self):
+        """
+        Reload the knowledge base and swap in the new snapshot
+        
+        The new snapshot is fully built before it replaces the old one, and a
+        file that fails to parse (e.g. half-written) leaves the old one in place.
+        The old snapshot's store is closed once the last reference to that
+        snapshot is dropped, so hold the snapshot (not just its records) to
+        keep reading it.
+        
+        Returns:
+            Set of changed concept names (empty if nothing changed)
+        """
+        with self._reload_lock:
+            previous = self._snapshot
+            file_state = self._get_file_state()
+            if file_state == previous.file_state:
+                return set()
+            try:
+                knowledge_base = self._load_knowledge_base(raise_errors=True)
+            except Exception as e:
+                print(f"Error reloading knowledge base, keeping previous version: {e}")
+                return set()
+            snapshot = KnowledgeSnapshot(knowledge_base, self._load_synonyms(knowledge_base), file_state, previous)
+            changed = snapshot.changed_concepts(previous)
+            self._snapshot = snapshot
+            if hasattr(previous.knowledge_base, "close") and previous.knowledge_base is not knowledge_base:
+                # Unmap the superseded store as soon as no snapshot references it
+                weakref.finalize(previous, previous.knowledge_base.close)
+        
+        if changed:
+            print(f"Knowledge base reloaded, {len(changed)} concept(s) changed")
+            self._notify_listeners(changed)
+        return changed
+    
+    def add_reload_listener(self, callback):
+        """
+        Register a callback(changed_concepts) to run after a reload
+        
+        Bound methods are held weakly, so registering doesn't keep the owner alive.
+        """
+        if isinstance(callback, MethodType):
+            self._listeners.append(weakref.WeakMethod(callback))
+        else:
+            self._listeners.append(lambda: callback)
+    
+    def _notify_listeners(self, changed):
+        alive = []
+        for reference in list(self._listeners):
+            callback = reference()
+            if callback is None:
+                continue
+            alive.append(reference)
+            try:
+                callback(changed)
+            except Exception as e:
+                print(f"Error in knowledge reload listener: {e}")
+        self._listeners = alive
+    
+    def start_watching(self, interval=2.0):
+        """Poll the knowledge files in a background thread and reload them when they change"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
+        
+        def watch():
+            while not self._stop_watching.wait(interval):
+                if self.is_stale():
+                    self.reload()
+        
+        self._watcher = threading.Thread(target=watch, name="knowledge-watcher", daemon=True)
+        self._watcher.start()
+    
+    def stop_watching(self):
+        """Stop the background watcher thread"""
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+    
     def get_concept(self, concept_name):
         """Get information about a specific concept"""
         if not concept_name:
             return None
         
-        concept_name = concept_name.lower()
-        if concept_name in self.knowledge_base:
-            return self.knowledge_base[concept_name]
+        snapshot = self._snapshot
+        concept_name = snapshot.lowercase_names.get(concept_name.lower())
+        if concept_name in snapshot.knowledge_base:
+            return snapshot.knowledge_base[concept_name]
         return None
     
     def get_all_concepts(self):
         """Get a list of all concept names"""
         return list(self.knowledge_base.keys())
     
+    def find_concepts(self, text, limit=None):
+        """Get concept names matching free-form text, best match first"""
+        return self.concept_index.search(text, limit=limit)
+    
     def get_related_concepts(self, concept_name):
         """Get related concepts for a given concept"""
         concept = self.get_concept(concept_name)
@@ -0,0 +1,43 @@
+import os
+import threading
+from src.knowledge_manager import KnowledgeManager
+
+# Process-wide cache of knowledge managers, keyed by file paths
+_managers = {}
+_lock = threading.Lock()
+
+
+def get_knowledge_manager(knowledge_file='data/cs_knowledge.json', synonyms_file='data/synonyms.json'):
+    """
+    Get the shared KnowledgeManager for a knowledge file
+    
+    Every component asking for the same files gets the same instance, so the
+    corpus is loaded and indexed once per process. If either file has been
+    modified since it was loaded, the manager swaps in a fresh snapshot
+    (see KnowledgeManager.reload) rather than a second copy being loaded.
+    
+    Args:
+        knowledge_file: Path to the JSON knowledge base
+        synonyms_file: Path to the synonyms JSON file
+        
+    Returns:
+        Shared KnowledgeManager instance
+    """
+    key = (os.path.abspath(knowledge_file), os.path.abspath(synonyms_file) if synonyms_file else None)
+    with _lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = KnowledgeManager(knowledge_file, synonyms_file)
+            _managers[key] = manager
+            return manager
+    if manager.is_stale():
+        manager.reload()
+    return manager
+
+
+def clear_registry():
+    """Forget all cached managers (mainly for tests)"""
+    with _lock:
+        for manager in _managers.values():
+            manager.stop_watching()
+        _managers.clear()
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping
+
+# Compiled store layout (all integers little-endian):
+#   magic (4 bytes) | version (uint32) | header length (uint32) | header JSON
+#   then, per field: offsets table of (num_concepts + 1) uint32 values, followed
+#   by the field's string pool. Field values are UTF-8 JSON; the "name" field is
+#   raw UTF-8. A zero-length slice means the concept does not have that field.
+MAGIC = b"CSKB"
+FORMAT_VERSION = 1
+STORE_EXTENSION = ".kb"
+_PREFIX = struct.Struct("<4sII")
+_OFFSET = struct.Struct("<I")
+_OFFSET_PAIR = struct.Struct("<II")
+_MISSING = object()
+
+
+def get_store_path(knowledge_file):
+    """Get the path of the compiled store for a JSON knowledge file"""
+    return os.path.splitext(knowledge_file)[0] + STORE_EXTENSION
+
+
+def compile_knowledge_base(knowledge_file, store_file=None):
+    """
+    Compile a JSON knowledge base into the binary store format
+
+    Args:
+        knowledge_file: Path to the JSON knowledge base
+        store_file: Output path (defaults to the JSON path with a .kb extension)
+
+    Returns:
+        Path of the written store
+    """
+    store_file = store_file or get_store_path(knowledge_file)
+    with open(knowledge_file, 'r') as file:
+        knowledge = json.load(file)
+
+    names = list(knowledge.keys())
+    fields = []
+    for details in knowledge.values():
+        for field in details:
+            if field not in fields:
+                fields.append(field)
+
+    # Encode each field into its own pool with an offsets table
+    sections = []
+    for field in ["name"] + fields:
+        pool = bytearray()
+        offsets = [0]
+        for name in names:
+            if field == "name":
+                pool += name.encode("utf-8")
+            elif field in knowledge[name]:
+                pool += json.dumps(knowledge[name][field], separators=(",", ":")).encode("utf-8")
+            offsets.append(len(pool))
+        sections.append((field, struct.pack(f"<{len(offsets)}I", *offsets), bytes(pool)))
+
+    # The header records where each field's table and pool start
+    header = {"count": len(names), "fields": {}}
+    header_size = 0
+    while True:
+        position = _PREFIX.size + header_size
+        for field, offsets, pool in sections:
+            header["fields"][field] = [position, position + len(offsets)]
+            position += len(offsets) + len(pool)
+        header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        if len(header_bytes) == header_size:
+            break
+        header_size = len(header_bytes)
+
+    # Write atomically so readers never see a partial store
+    temp_file = f"{store_file}.tmp{os.getpid()}"
+    with open(temp_file, 'wb') as file:
+        file.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        for _, offsets, pool in sections:
+            file.write(offsets)
+            file.write(pool)
+    os.replace(temp_file, store_file)
+    return store_file
+
+
+class ConceptRecord(Mapping):
+    """Read-only view of one concept; fields are decoded from the store on access"""
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, field):
+        value = self._store._read_field(field, self._index)
+        if value is _MISSING:
+            raise KeyError(field)
+        return value
+
+    def __iter__(self):
+        for field in self._store.fields:
+            if self._store._has_field(field, self._index):
+                yield field
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"ConceptRecord({self._store.names[self._index]!r})"
+
+
+class KnowledgeStore(Mapping):
+    """
+    Memory-mapped, read-only knowledge base compiled by compile_knowledge_base.
+
+    Only concept names are decoded when the store is opened; everything else
+    stays in the mapped file until a field is read.
+    """
+    def __init__(self, store_file):
+        self.store_file = store_file
+        with open(store_file, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = _PREFIX.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._buffer.close()
+            raise ValueError(f"Unsupported knowledge store: {store_file}")
+        header = json.loads(self._buffer[_PREFIX.size:_PREFIX.size + header_length])
+
+        self.count = header["count"]
+        self._sections = {field: tuple(bounds) for field, bounds in header["fields"].items()}
+        self.fields = [field for field in self._sections if field != "name"]
+        self.names = [self._read_raw("name", i).decode("utf-8") for i in range(self.count)]
+        self._positions = {name: i for i, name in enumerate(self.names)}
+
+    def _slice_bounds(self, field, index):
+        """Get the byte range of a field value in the mapped file"""
+        table_start, pool_start = self._sections[field]
+        start, end = _OFFSET_PAIR.unpack_from(self._buffer, table_start + index * _OFFSET.size)
+        return pool_start + start, pool_start + end
+
+    def _read_raw(self, field, index):
+        start, end = self._slice_bounds(field, index)
+        return self._buffer[start:end]
+
+    def _has_field(self, field, index):
+        start, end = self._slice_bounds(field, index)
+        return end > start
+
+    def _read_field(self, field, index):
+        """Decode one field of one concept"""
+        if field not in self._sections or field == "name":
+            return _MISSING
+        raw = self._read_raw(field, index)
+        return json.loads(raw) if raw else _MISSING
+
+    def __getitem__(self, name):
+        return ConceptRecord(self, self._positions[name])
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return self.count
+
+    def keys(self):
+        """Concept names in knowledge base order"""
+        return list(self.names)
+
+    def fingerprint(self, name):
+        """Hash of a concept's encoded fields, used to detect changed concepts"""
+        index = self._positions[name]
+        digest = hashlib.blake2b(digest_size=16)
+        for field in self.fields:
+            digest.update(field.encode("utf-8"))
+            digest.update(_OFFSET.pack(len(self._read_raw(field, index))))
+            digest.update(self._read_raw(field, index))
+        return digest.digest()
+
+    def to_dict(self):
+        """Decode the whole store into plain dicts (for code that needs to mutate it)"""
+        return {name: dict(self[name]) for name in self.names}
+
+    @property
+    def closed(self):
+        return self._buffer.closed
+
+    def close(self):
+        """Unmap the store file; reading records from it afterwards raises ValueError"""
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def open_knowledge_store(knowledge_file):
+    """
+    Open the compiled store for a JSON knowledge base, compiling it if it is
+    missing or older than the JSON file
+
+    Args:
+        knowledge_file: Path to the JSON knowledge base
+
+    Returns:
+        KnowledgeStore instance
+    """
+    store_file = get_store_path(knowledge_file)
+    if (not os.path.exists(store_file)
+            or os.path.getmtime(store_file) < os.path.getmtime(knowledge_file)):
+        compile_knowledge_base(knowledge_file, store_file)
+    try:
+        return KnowledgeStore(store_file)
+    except ValueError:
+        # Written by an older format version, rebuild it
+        compile_knowledge_base(knowledge_file, store_file)
+        return KnowledgeStore(store_file)
+
+# Compile from the command line: python -m src.knowledge_store data/cs_knowledge.json
+if __name__ == "__main__":
+    for path in sys.argv[1:] or ['data/cs_knowledge.json']:
+        print(f"Compiled {path} -> {compile_knowledge_base(path)}")
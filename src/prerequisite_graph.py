@@ -0,0 +1,140 @@
+import numpy as np
+
+
+def _gather(indptr, indices, nodes):
+    """
+    Concatenate the CSR rows of several nodes
+
+    Returns:
+        Tuple of (position of the owning node in `nodes`, neighbour) arrays
+    """
+    nodes = np.asarray(nodes, dtype=np.int64)
+    starts = indptr[nodes]
+    lengths = indptr[nodes + 1] - starts
+    owners = np.repeat(np.arange(len(nodes)), lengths)
+    # Offset of every gathered entry within its own row
+    offsets = np.arange(len(owners)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owners, indices[np.repeat(starts, lengths) + offsets]
+
+
+class PrerequisiteGraph:
+    """
+    Sparse prerequisite graph in compressed sparse row (CSR) form.
+
+    Row i of the forward index lists the prerequisites of concept i; the
+    reverse index lists the concepts that depend on it. Both use int32
+    indices, so memory grows with the number of edges rather than the square
+    of the number of concepts.
+    """
+    def __init__(self, num_concepts, indptr, indices):
+        """
+        Build the graph from a CSR prerequisite index
+
+        Args:
+            num_concepts: Number of concepts
+            indptr: Row offsets, length num_concepts + 1
+            indices: Prerequisite concept IDs, grouped by dependent concept
+        """
+        self.num_concepts = num_concepts
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.counts = np.diff(self.indptr).astype(np.int32)
+
+        # Dependent concept of every edge, and the reverse (dependents) index
+        self.edge_concepts = np.repeat(np.arange(num_concepts, dtype=np.int32), self.counts)
+        order = np.argsort(self.indices, kind='stable')
+        self.dependent_indices = self.edge_concepts[order]
+        self.dependent_indptr = np.zeros(num_concepts + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=num_concepts), out=self.dependent_indptr[1:])
+
+    @classmethod
+    def from_edges(cls, num_concepts, concepts, prerequisites):
+        """
+        Build the graph from parallel edge arrays
+
+        Args:
+            num_concepts: Number of concepts
+            concepts: Dependent concept of each edge
+            prerequisites: Prerequisite concept of each edge
+        """
+        concepts = np.asarray(concepts, dtype=np.int64)
+        prerequisites = np.asarray(prerequisites, dtype=np.int64)
+        # Sort by concept, then prerequisite, and drop duplicate edges
+        order = np.lexsort((prerequisites, concepts))
+        concepts, prerequisites = concepts[order], prerequisites[order]
+        if len(concepts):
+            keep = np.ones(len(concepts), dtype=bool)
+            keep[1:] = (concepts[1:] != concepts[:-1]) | (prerequisites[1:] != prerequisites[:-1])
+            concepts, prerequisites = concepts[keep], prerequisites[keep]
+        indptr = np.zeros(num_concepts + 1, dtype=np.int64)
+        np.cumsum(np.bincount(concepts, minlength=num_concepts), out=indptr[1:])
+        return cls(num_concepts, indptr, prerequisites)
+
+    @classmethod
+    def from_lists(cls, num_concepts, prerequisite_lists):
+        """Build the graph from a dict mapping concept IDs to lists of prerequisite IDs"""
+        concepts = []
+        prerequisites = []
+        for concept, prereqs in prerequisite_lists.items():
+            concepts.extend([concept] * len(prereqs))
+            prerequisites.extend(prereqs)
+        return cls.from_edges(num_concepts, concepts, prerequisites)
+
+    @classmethod
+    def from_dense(cls, matrix):
+        """Build the graph from a matrix where matrix[B][A] > 0 means A is a prerequisite of B"""
+        matrix = np.asarray(matrix)
+        concepts, prerequisites = np.nonzero(matrix > 0)
+        return cls.from_edges(matrix.shape[0], concepts, prerequisites)
+
+    @property
+    def num_edges(self):
+        return len(self.indices)
+
+    def prerequisites_of(self, concept):
+        """Prerequisite IDs of a concept"""
+        return self.indices[self.indptr[concept]:self.indptr[concept + 1]]
+
+    def dependents_of(self, concept):
+        """IDs of the concepts that have this concept as a prerequisite"""
+        return self.dependent_indices[self.dependent_indptr[concept]:self.dependent_indptr[concept + 1]]
+
+    def gather_prerequisites(self, concepts):
+        """
+        Prerequisites of several concepts at once
+
+        Returns:
+            Tuple of (position in `concepts`, prerequisite ID) arrays
+        """
+        return _gather(self.indptr, self.indices, concepts)
+
+    def gather_dependents(self, concepts):
+        """
+        Dependents of several concepts at once
+
+        Returns:
+            Tuple of (position in `concepts`, dependent ID) arrays
+        """
+        return _gather(self.dependent_indptr, self.dependent_indices, concepts)
+
+    def count_met(self, satisfied):
+        """
+        Count each concept's prerequisites that are satisfied
+
+        Args:
+            satisfied: Boolean array over concepts
+
+        Returns:
+            Array with the number of satisfied prerequisites per concept
+        """
+        return np.bincount(self.edge_concepts[satisfied[self.indices]], minlength=self.num_concepts)
+
+    def edges(self):
+        """Tuple of (dependent concept, prerequisite concept) arrays"""
+        return self.edge_concepts, self.indices
+
+    def to_dense(self):
+        """Dense num_concepts x num_concepts matrix (prerequisites[B][A] = 1 if A is required for B)"""
+        matrix = np.zeros((self.num_concepts, self.num_concepts))
+        matrix[self.edge_concepts, self.indices] = 1
+        return matrix
@@ -1,9 +1,8 @@
-import re
-from src.knowledge_manager import KnowledgeManager
+from src.knowledge_registry import get_knowledge_manager
 
 class QueryProcessor:
     def __init__(self, knowledge_manager=None):
-        self.knowledge_manager = knowledge_manager or KnowledgeManager()
+        self.knowledge_manager = knowledge_manager or get_knowledge_manager()
         
     def process_query(self, query):
         """
@@ -21,26 +20,17 @@ class QueryProcessor:
         # Clean query
         query = query.lower().strip()
         
-        # Look for exact matches among concept names
-        for concept in self.knowledge_manager.get_all_concepts():
-            if concept in query:
-                return concept
+        # Use a single snapshot so a concurrent reload can't mix two versions
+        snapshot = self.knowledge_manager.snapshot
         
-        # If no exact match, look for keyword matches
-        # This is a simple approach and could be improved
-        keywords = self._extract_keywords(query)
+        # Look for exact mentions of concept names or synonyms, longest first
+        concept = snapshot.concept_matcher.find_best(query)
+        if concept:
+            return concept
         
-        for concept in self.knowledge_manager.get_all_concepts():
-            concept_info = self.knowledge_manager.get_concept(concept)
-            if any(keyword in concept for keyword in keywords):
-                return concept
+        # If no exact match, look for keyword matches in the inverted index
+        matches = snapshot.concept_index.search(query, limit=1)
+        if matches:
+            return matches[0]
                 
         return None
-    
-    def _extract_keywords(self, query):
-        """Extract potential keywords from the query"""
-        # Remove common words
-        common_words = ["what", "is", "a", "the", "how", "does", "do", "explain", "tell", "me", "about"]
-        words = query.split()
-        keywords = [word for word in words if word not in common_words]
-        return keywords
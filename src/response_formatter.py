@@ -1,6 +1,8 @@
+from src.knowledge_registry import get_knowledge_manager
+
 class ResponseFormatter:
-    def __init__(self, knowledge_manager):
-        self.knowledge_manager = knowledge_manager
+    def __init__(self, knowledge_manager=None):
+        self.knowledge_manager = knowledge_manager or get_knowledge_manager()
         
     def format_explanation(self, concept_name, complexity_level="intermediate"):
         """
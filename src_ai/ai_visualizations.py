@@ -1,20 +1,416 @@
-import matplotlib.pyplot as plt
+import matplotlib
+import matplotlib.style
 import numpy as np
 import os
 import io
 import base64
+import hashlib
+import json
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from src_ai.cache import RenderCache
+
+# Charts are drawn with the object-oriented Figure/Agg API rather than pyplot,
+# so rendering keeps no global figure state and can run in worker processes.
+
+def _new_figure(figsize):
+    """Create a standalone figure attached to an Agg canvas"""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+def _to_png(fig, dpi):
+    """Encode a figure as PNG bytes"""
+    img = io.BytesIO()
+    fig.savefig(img, format='png', dpi=dpi, bbox_inches='tight')
+    return img.getvalue()
+
+def _draw_progress_chart(fig, ax, data, title=None, labels=None):
+    ax.plot(data, marker='o', color='#1f77b4', linewidth=2)
+    ax.fill_between(range(len(data)), data, alpha=0.2, color='#1f77b4')
+    ax.set_title(title or "Learning Progress", fontsize=14)
+    ax.set_xlabel("Concepts", fontsize=12)
+    ax.set_ylabel("Understanding Level", fontsize=12)
+    ax.set_ylim(0, max(data) * 1.2)  # Add some headroom
+    ax.grid(True, alpha=0.3)
+
+    # Add labels if provided
+    if labels and len(labels) == len(data):
+        ax.set_xticks(range(len(data)))
+        ax.set_xticklabels(labels, rotation=45, ha='right')
+
+def _draw_comparison_chart(fig, ax, data, title=None, labels=None):
+    # For comparison, we expect data to be a 2D array or a list of lists
+    if data.ndim == 1:
+        # If 1D, split it into two groups for comparison
+        mid = len(data) // 2
+        data = [data[:mid], data[mid:]]
+
+    bar_width = 0.35
+    x = np.arange(len(data[0]))
+
+    ax.bar(x - bar_width/2, data[0], bar_width, label='Current', color='#2ca02c')
+    ax.bar(x + bar_width/2, data[1], bar_width, label='Previous', color='#9467bd')
+
+    ax.set_title(title or "Performance Comparison", fontsize=14)
+    ax.set_xlabel("Metrics", fontsize=12)
+    ax.set_ylabel("Value", fontsize=12)
+    ax.grid(True, alpha=0.3, axis='y')
+    ax.legend()
+
+    if labels and len(labels) == len(data[0]):
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels)
+
+def _draw_concept_map(fig, ax, data, title=None, labels=None):
+    # Create a heatmap/concept map
+    image = ax.imshow(data.reshape((int(np.sqrt(len(data))), -1)),
+                      cmap='viridis', interpolation='nearest')
+    fig.colorbar(image, ax=ax, label="Relationship Strength")
+    ax.set_title(title or "Concept Relationship Map", fontsize=14)
+    ax.grid(False)
+
+    if labels:
+        num = int(np.sqrt(len(data)))
+        if len(labels) >= num:
+            ax.set_xticks(range(num))
+            ax.set_xticklabels(labels[:num], rotation=90)
+            ax.set_yticks(range(num))
+            ax.set_yticklabels(labels[:num])
+
+def _draw_difficulty_chart(fig, ax, data, title=None, labels=None):
+    difficulties = data
+
+    # Create default labels if none provided
+    if not labels or len(labels) != len(difficulties):
+        labels = [f"Concept {i+1}" for i in range(len(difficulties))]
+
+    # Sort by difficulty for better visualization
+    sorted_indices = np.argsort(difficulties)
+    sorted_difficulties = difficulties[sorted_indices]
+    sorted_labels = [labels[i] for i in sorted_indices]
+
+    # Create horizontal bar chart
+    colormap = matplotlib.colormaps['RdYlGn_r']
+    ax.barh(range(len(sorted_difficulties)), sorted_difficulties,
+            color=colormap(sorted_difficulties/max(sorted_difficulties)))
+    ax.set_yticks(range(len(sorted_difficulties)))
+    ax.set_yticklabels(sorted_labels)
+    ax.set_title(title or "Concept Difficulty Levels", fontsize=14)
+    ax.set_xlabel("Difficulty", fontsize=12)
+    ax.grid(True, alpha=0.3, axis='x')
+
+CHART_TYPES = {
+    'progress': _draw_progress_chart,
+    'comparison': _draw_comparison_chart,
+    'concept_map': _draw_concept_map,
+    'difficulty': _draw_difficulty_chart
+}
+
+def draw_chart(fig, data_points, chart_type='progress', title=None, labels=None, style='ggplot'):
+    """
+    Draw a chart onto an existing figure
+
+    Args:
+        fig: Matplotlib Figure to draw on
+        data_points: List or NumPy array of data points
+        chart_type: Type of chart ('progress', 'comparison', 'concept_map', 'difficulty')
+        title: Optional title for the chart
+        labels: Optional list of labels for the data points
+        style: Matplotlib style sheet applied while drawing (None for the defaults)
+    """
+    # Convert to numpy array if needed
+    data = np.asarray(data_points)
+
+    # Default to progress chart if type not recognized
+    draw = CHART_TYPES.get(chart_type, _draw_progress_chart)
+    with matplotlib.style.context(style or 'default'):
+        ax = fig.add_subplot()
+        draw(fig, ax, data, title, labels)
+        fig.tight_layout()
+
+def render_chart(data_points, chart_type='progress', title=None, labels=None, style='ggplot', dpi=100):
+    """
+    Render a chart to PNG bytes
+
+    Args:
+        data_points: List or NumPy array of data points
+        chart_type: Type of chart ('progress', 'comparison', 'concept_map', 'difficulty')
+        title: Optional title for the chart
+        labels: Optional list of labels for the data points
+        style: Matplotlib style sheet to use
+        dpi: Output resolution
+
+    Returns:
+        PNG image as bytes
+    """
+    fig = _new_figure((8, 5))
+    draw_chart(fig, data_points, chart_type, title, labels, style)
+    return _to_png(fig, dpi)
+
+def render_learning_path(concepts, difficulties, knowledge_level=0.5, max_concepts=15,
+                         show_connections=True, highlight_concept=None, dpi=100):
+    """
+    Render a personalized learning path based on concept difficulties
+    and user knowledge level
+
+    Args:
+        concepts: List of concept names
+        difficulties: List of difficulty ratings for each concept
+        knowledge_level: Float between 0-1 representing user knowledge
+        max_concepts: Maximum number of concepts to display
+        show_connections: Whether to draw connections between related concepts
+        highlight_concept: Specific concept to highlight in the visualization
+        dpi: Output resolution
+
+    Returns:
+        PNG image of the suggested learning path as bytes
+    """
+    # Ensure we don't exceed the number of available concepts
+    if len(concepts) > max_concepts:
+        concepts = concepts[:max_concepts]
+        difficulties = difficulties[:max_concepts]
+
+    # Adjust difficulties based on knowledge level
+    adjusted_difficulties = np.array(difficulties) * (1 - knowledge_level)
+
+    # Sort concepts by adjusted difficulty
+    sorted_indices = np.argsort(adjusted_difficulties)
+    sorted_concepts = [concepts[i] for i in sorted_indices]
+    sorted_difficulties = adjusted_difficulties[sorted_indices]
+
+    # Create figure with sufficient height for all concepts
+    height = max(6, len(sorted_concepts) * 0.4)
+    fig = _new_figure((10, height))
+    ax = fig.add_subplot()
+
+    # Create color map - use different colors for different difficulty ranges
+    colors = matplotlib.colormaps['viridis'](np.linspace(0, 1, len(sorted_difficulties)))
+
+    # Highlight specific concept if requested
+    if highlight_concept:
+        for i, concept in enumerate(sorted_concepts):
+            if highlight_concept.lower() in concept.lower():
+                colors[i] = [0.8, 0.2, 0.2, 1.0]  # Bright red
+                break
+
+    # Create horizontal bars
+    bars = ax.barh(range(len(sorted_difficulties)), sorted_difficulties,
+                   color=colors, height=0.6)
+
+    # Add value labels to the right of each bar
+    for i, bar in enumerate(bars):
+        width = bar.get_width()
+        difficulty_level = ""
+        if sorted_difficulties[i] < 0.3:
+            difficulty_level = "Easy"
+        elif sorted_difficulties[i] < 0.6:
+            difficulty_level = "Moderate"
+        else:
+            difficulty_level = "Advanced"
+
+        ax.text(width + 0.01, bar.get_y() + bar.get_height()/2,
+                difficulty_level,
+                va='center', size=9)
+
+    # Add step numbers to the left of concept names
+    for i in range(len(sorted_concepts)):
+        ax.text(-0.15, i, f"{i+1}.",
+                ha='right', va='center',
+                fontweight='bold', fontsize=10)
+
+    # Draw connections between concepts if requested
+    if show_connections and len(sorted_concepts) > 1:
+        for i in range(len(sorted_concepts)-1):
+            # Draw a subtle arrow from one concept to the next
+            ax.annotate("",
+                        xy=(sorted_difficulties[i+1]*0.5, i+1),
+                        xytext=(sorted_difficulties[i]*0.5, i),
+                        arrowprops=dict(arrowstyle="->", color="gray",
+                                        alpha=0.6, connectionstyle="arc3,rad=0.2"))
+
+    # Set y-axis ticks with concept names
+    ax.set_yticks(range(len(sorted_difficulties)))
+    ax.set_yticklabels(sorted_concepts)
+
+    # Set chart title and labels
+    level_text = "Beginner"
+    if knowledge_level < 0.3:
+        level_text = "Beginner"
+    elif knowledge_level < 0.7:
+        level_text = "Intermediate"
+    else:
+        level_text = "Advanced"
+
+    ax.set_title(f"Personalized Learning Path ({level_text} Level)", fontsize=14)
+    ax.set_xlabel("Adjusted Difficulty", fontsize=12)
+    ax.grid(True, alpha=0.3, axis='x')
+
+    # Add a legend explaining the color scheme
+    ax.text(1.02, 0.02, "Color indicates concept complexity",
+            transform=ax.transAxes, rotation=90,
+            va='bottom', fontsize=9, alpha=0.7)
+
+    # Add a note about what the chart shows
+    fig.text(0.5, 0.01,
+             f"This path is optimized for your knowledge level ({knowledge_level:.1f}/1.0). Start from the top and work your way down.",
+             ha='center', fontsize=9, style='italic')
+
+    fig.tight_layout()
+    return _to_png(fig, dpi)
+
+def render_key(chart_type, data, labels=None, title=None, style=None, dpi=100, **options):
+    """
+    Content address of a rendered chart
+
+    Charts are pure functions of their inputs, so a hash of the chart type,
+    the data array (bytes, dtype and shape), labels, title, style, dpi and any
+    other rendering options identifies the image.
+
+    Returns:
+        Hex digest string
+    """
+    data = np.ascontiguousarray(data)
+    labels = [str(label) for label in labels] if labels is not None else None
+    header = json.dumps([chart_type, str(data.dtype), list(data.shape), labels, title, style, dpi,
+                         sorted(options.items())], default=str)
+    digest = hashlib.sha256(header.encode('utf-8'))
+    digest.update(data.tobytes())
+    return digest.hexdigest()
+
 
 class AIDrivenVisualizer:
-    def __init__(self):
-        self.visualization_types = {
-            'progress': self._create_progress_chart,
-            'comparison': self._create_comparison_chart,
-            'concept_map': self._create_concept_map,
-            'difficulty': self._create_difficulty_chart
-        }
-
-    def generate_plot(self, data_points, chart_type='progress', title=None, 
+    def __init__(self, max_workers=None, cache_bytes=32 * 1024 * 1024, cache_dir=None,
+                 cache_disk_bytes=256 * 1024 * 1024):
+        """
+        Initialize the visualizer
+
+        Args:
+            max_workers: Number of worker processes used by submit_plot and
+                submit_learning_path (defaults to the CPU count, capped at 4;
+                0 renders in the calling thread instead)
+            cache_bytes: Memory budget for rendered images (0 disables caching)
+            cache_dir: Optional directory that keeps rendered images across restarts
+            cache_disk_bytes: Size budget for the images kept in cache_dir
+        """
+        self.visualization_types = CHART_TYPES
+        if max_workers is None:
+            max_workers = min(4, os.cpu_count() or 1)
+        self.max_workers = max_workers
+        self._executor = None
+        self.render_cache = RenderCache(cache_bytes, cache_dir, cache_disk_bytes) if cache_bytes else None
+        # Renders in progress by key, so identical concurrent requests share one
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+
+    def _get_executor(self):
+        """Start the worker pool on first use"""
+        if self._executor is None and self.max_workers > 0:
+            try:
+                # Spawned workers don't inherit the parent's threads or locks
+                context = multiprocessing.get_context('spawn')
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            except Exception as e:
+                print(f"Render pool unavailable, rendering in-process: {e}")
+                self.max_workers = 0
+        return self._executor
+
+    def _submit(self, key, render, *args, inline=False):
+        """
+        Get a rendered image from the cache, or run a render function in the
+        pool (inline when there is no pool) and cache its result
+
+        Returns:
+            Future resolving to the PNG image as bytes
+        """
+        if self.render_cache is not None:
+            cached = self.render_cache.get(key)
+            if cached is not None:
+                future = Future()
+                future.set_result(cached)
+                return future
+
+        with self._pending_lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                return pending
+
+            executor = None if inline else self._get_executor()
+            if executor is not None:
+                future = executor.submit(render, *args)
+                self._pending[key] = future
+        if executor is not None:
+            # Registered outside the lock: it runs immediately if the render already finished
+            future.add_done_callback(lambda done: self._finish_render(key, done))
+            return future
+
+        future = Future()
+        try:
+            future.set_result(render(*args))
+        except Exception as e:
+            future.set_exception(e)
+        self._finish_render(key, future)
+        return future
+
+    def _finish_render(self, key, future):
+        """Cache a completed render and stop tracking it as pending"""
+        with self._pending_lock:
+            self._pending.pop(key, None)
+        if self.render_cache is not None and not future.cancelled() and future.exception() is None:
+            self.render_cache.set(key, future.result())
+
+    def submit_plot(self, data_points, chart_type='progress', title=None, labels=None, style='ggplot', dpi=100):
+        """
+        Render a chart in a worker process
+
+        Args:
+            data_points: List or NumPy array of data points
+            chart_type: Type of chart ('progress', 'comparison', 'concept_map', 'difficulty')
+            title: Optional title for the chart
+            labels: Optional list of labels for the data points
+            style: Matplotlib style sheet to use
+            dpi: Output resolution
+
+        Returns:
+            Future resolving to the PNG image as bytes
+        """
+        data = np.asarray(data_points)
+        labels = list(labels) if labels is not None else None
+        key = render_key(chart_type, data, labels, title, style, dpi)
+        return self._submit(key, render_chart, data, chart_type, title, labels, style, dpi)
+
+    def submit_learning_path(self, concepts, difficulties, knowledge_level=0.5, max_concepts=15,
+                             show_connections=True, highlight_concept=None, dpi=100):
+        """
+        Render a learning path in a worker process (see render_learning_path)
+
+        Returns:
+            Future resolving to the PNG image as bytes
+        """
+        return self._submit_learning_path(concepts, difficulties, knowledge_level, max_concepts,
+                                          show_connections, highlight_concept, dpi)
+
+    def _submit_learning_path(self, concepts, difficulties, knowledge_level, max_concepts,
+                              show_connections, highlight_concept, dpi, inline=False):
+        concepts = list(concepts)
+        difficulties = np.asarray(difficulties, dtype=float)
+        key = render_key('learning_path', difficulties, concepts, dpi=dpi, knowledge_level=float(knowledge_level),
+                         max_concepts=max_concepts, show_connections=show_connections,
+                         highlight_concept=highlight_concept)
+        return self._submit(key, render_learning_path, concepts, difficulties, knowledge_level, max_concepts,
+                            show_connections, highlight_concept, dpi, inline=inline)
+
+    def close(self):
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def generate_plot(self, data_points, chart_type='progress', title=None,
                      labels=None, save_path=None, show_plot=False, return_base64=False):
         """
         Generate visualization based on the specified chart type
@@ -27,126 +423,46 @@ class AIDrivenVisualizer:
             save_path: If provided, save the chart to this path
             show_plot: If True, display the plot using plt.show()
             return_base64: If True, return a base64-encoded image for web display
-            
+
         Returns:
             Base64-encoded image if return_base64 is True, otherwise None
         """
-        # Convert to numpy array if needed
-        data = np.asarray(data_points)
-        
-        plt.figure(figsize=(8, 5))
-        plt.style.use('ggplot')  # Use a nicer style
-        
-        # Generate the plot based on chart type
-        if chart_type in self.visualization_types:
-            self.visualization_types[chart_type](data, title, labels)
+        if show_plot:
+            # Interactive display needs a pyplot-managed figure
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize=(8, 5))
         else:
-            # Default to progress chart if type not recognized
-            self._create_progress_chart(data, title, labels)
-        
-        plt.tight_layout()
-        
+            fig = _new_figure((8, 5))
+        draw_chart(fig, data_points, chart_type, title, labels)
+
         # Save to file if path provided
         if save_path:
             try:
                 # Create the directory if it doesn't exist
                 os.makedirs(os.path.dirname(save_path), exist_ok=True)
-                plt.savefig(save_path, dpi=300, bbox_inches='tight')
+                fig.savefig(save_path, dpi=300, bbox_inches='tight')
                 print(f"Chart saved to {save_path}")
             except Exception as e:
                 print(f"Error saving chart: {e}")
-        
+
         # Return base64-encoded image for web display
+        result = None
         if return_base64:
-            img = io.BytesIO()
-            plt.savefig(img, format='png', bbox_inches='tight')
-            img.seek(0)
-            plt.close()
-            return base64.b64encode(img.getvalue()).decode()
-        
+            result = base64.b64encode(_to_png(fig, 100)).decode()
+
         # Show the plot if requested
         if show_plot:
             plt.show()
-        else:
-            plt.close()
-        
-        return None
-
-    def _create_progress_chart(self, data, title=None, labels=None):
-        plt.plot(data, marker='o', color='#1f77b4', linewidth=2)
-        plt.fill_between(range(len(data)), data, alpha=0.2, color='#1f77b4')
-        plt.title(title or "Learning Progress", fontsize=14)
-        plt.xlabel("Concepts", fontsize=12)
-        plt.ylabel("Understanding Level", fontsize=12)
-        plt.ylim(0, max(data) * 1.2)  # Add some headroom
-        plt.grid(True, alpha=0.3)
-        
-        # Add labels if provided
-        if labels and len(labels) == len(data):
-            plt.xticks(range(len(data)), labels, rotation=45, ha='right')
-    
-    def _create_comparison_chart(self, data, title=None, labels=None):
-        # For comparison, we expect data to be a 2D array or a list of lists
-        if data.ndim == 1:
-            # If 1D, split it into two groups for comparison
-            mid = len(data) // 2
-            data = [data[:mid], data[mid:]]
-        
-        bar_width = 0.35
-        x = np.arange(len(data[0]))
-        
-        plt.bar(x - bar_width/2, data[0], bar_width, label='Current', color='#2ca02c')
-        plt.bar(x + bar_width/2, data[1], bar_width, label='Previous', color='#9467bd')
-        
-        plt.title(title or "Performance Comparison", fontsize=14)
-        plt.xlabel("Metrics", fontsize=12)
-        plt.ylabel("Value", fontsize=12)
-        plt.grid(True, alpha=0.3, axis='y')
-        plt.legend()
-        
-        if labels and len(labels) == len(data[0]):
-            plt.xticks(x, labels)
-
-    def _create_concept_map(self, data, title=None, labels=None):
-        # Create a heatmap/concept map
-        plt.imshow(data.reshape((int(np.sqrt(len(data))), -1)), 
-                 cmap='viridis', interpolation='nearest')
-        plt.colorbar(label="Relationship Strength")
-        plt.title(title or "Concept Relationship Map", fontsize=14)
-        plt.grid(False)
-        
-        if labels:
-            num = int(np.sqrt(len(data)))
-            if len(labels) >= num:
-                plt.xticks(range(num), labels[:num], rotation=90)
-                plt.yticks(range(num), labels[:num])
-
-    def _create_difficulty_chart(self, data, title=None, labels=None):
-        difficulties = data
-        
-        # Create default labels if none provided
-        if not labels or len(labels) != len(difficulties):
-            labels = [f"Concept {i+1}" for i in range(len(difficulties))]
-            
-        # Sort by difficulty for better visualization
-        sorted_indices = np.argsort(difficulties)
-        sorted_difficulties = difficulties[sorted_indices]
-        sorted_labels = [labels[i] for i in sorted_indices]
-        
-        # Create horizontal bar chart
-        plt.barh(range(len(sorted_difficulties)), sorted_difficulties, 
-               color=plt.cm.RdYlGn_r(sorted_difficulties/max(sorted_difficulties)))
-        plt.yticks(range(len(sorted_difficulties)), sorted_labels)
-        plt.title(title or "Concept Difficulty Levels", fontsize=14)
-        plt.xlabel("Difficulty", fontsize=12)
-        plt.grid(True, alpha=0.3, axis='x')
-
-    def generate_learning_path(self, concepts, difficulties, knowledge_level=0.5, max_concepts=15, 
+            plt.close(fig)
+
+        return result
+
+    def generate_learning_path(self, concepts, difficulties, knowledge_level=0.5, max_concepts=15,
                              show_connections=True, highlight_concept=None):
         """
         Generate a personalized learning path based on concept difficulties
         and user knowledge level
-        
+
         Args:
             concepts: List of concept names
             difficulties: List of difficulty ratings for each concept
@@ -154,125 +470,37 @@ class AIDrivenVisualizer:
             max_concepts: Maximum number of concepts to display
             show_connections: Whether to draw connections between related concepts
             highlight_concept: Specific concept to highlight in the visualization
-            
+
         Returns:
             Base64-encoded visualization of the suggested learning path
         """
-        # Ensure we don't exceed the number of available concepts
-        if len(concepts) > max_concepts:
-            concepts = concepts[:max_concepts]
-            difficulties = difficulties[:max_concepts]
-            
-        # Adjust difficulties based on knowledge level
-        adjusted_difficulties = np.array(difficulties) * (1 - knowledge_level)
-        
-        # Sort concepts by adjusted difficulty
-        sorted_indices = np.argsort(adjusted_difficulties)
-        sorted_concepts = [concepts[i] for i in sorted_indices]
-        sorted_difficulties = adjusted_difficulties[sorted_indices]
-        
-        # Create figure with sufficient height for all concepts
-        height = max(6, len(sorted_concepts) * 0.4)
-        plt.figure(figsize=(10, height))
-        
-        # Create color map - use different colors for different difficulty ranges
-        colors = plt.cm.viridis(np.linspace(0, 1, len(sorted_difficulties)))
-        
-        # Highlight specific concept if requested
-        if highlight_concept:
-            for i, concept in enumerate(sorted_concepts):
-                if highlight_concept.lower() in concept.lower():
-                    colors[i] = [0.8, 0.2, 0.2, 1.0]  # Bright red
-                    break
-        
-        # Create horizontal bars
-        bars = plt.barh(range(len(sorted_difficulties)), sorted_difficulties, 
-                color=colors, height=0.6)
-        
-        # Add value labels to the right of each bar
-        for i, bar in enumerate(bars):
-            width = bar.get_width()
-            difficulty_level = ""
-            if sorted_difficulties[i] < 0.3:
-                difficulty_level = "Easy"
-            elif sorted_difficulties[i] < 0.6:
-                difficulty_level = "Moderate"
-            else:
-                difficulty_level = "Advanced"
-                
-            plt.text(width + 0.01, bar.get_y() + bar.get_height()/2, 
-                    difficulty_level,
-                    va='center', size=9)
-        
-        # Add step numbers to the left of concept names
-        for i in range(len(sorted_concepts)):
-            plt.text(-0.15, i, f"{i+1}.", 
-                    ha='right', va='center', 
-                    fontweight='bold', fontsize=10)
-        
-        # Draw connections between concepts if requested
-        if show_connections and len(sorted_concepts) > 1:
-            for i in range(len(sorted_concepts)-1):
-                # Draw a subtle arrow from one concept to the next
-                plt.annotate("", 
-                            xy=(sorted_difficulties[i+1]*0.5, i+1), 
-                            xytext=(sorted_difficulties[i]*0.5, i),
-                            arrowprops=dict(arrowstyle="->", color="gray", 
-                                            alpha=0.6, connectionstyle="arc3,rad=0.2"))
-        
-        # Set y-axis ticks with concept names
-        plt.yticks(range(len(sorted_difficulties)), sorted_concepts)
-        
-        # Set chart title and labels
-        level_text = "Beginner"
-        if knowledge_level < 0.3:
-            level_text = "Beginner"
-        elif knowledge_level < 0.7:
-            level_text = "Intermediate"
-        else:
-            level_text = "Advanced"
-            
-        plt.title(f"Personalized Learning Path ({level_text} Level)", fontsize=14)
-        plt.xlabel("Adjusted Difficulty", fontsize=12)
-        plt.grid(True, alpha=0.3, axis='x')
-        
-        # Add a legend explaining the color scheme
-        plt.text(1.02, 0.02, "Color indicates concept complexity", 
-                transform=plt.gca().transAxes, rotation=90, 
-                va='bottom', fontsize=9, alpha=0.7)
-                
-        # Add a note about what the chart shows
-        plt.figtext(0.5, 0.01, 
-                   f"This path is optimized for your knowledge level ({knowledge_level:.1f}/1.0). Start from the top and work your way down.",
-                   ha='center', fontsize=9, style='italic')
-                   
-        plt.tight_layout()
-        
-        # Convert to base64 for web display
-        img = io.BytesIO()
-        plt.savefig(img, format='png', bbox_inches='tight')
-        img.seek(0)
-        plt.close()
-        return base64.b64encode(img.getvalue()).decode()
+        png = self._submit_learning_path(concepts, difficulties, knowledge_level, max_concepts,
+                                         show_connections, highlight_concept, 100, inline=True).result()
+        return base64.b64encode(png).decode()
 
 # Example usage:
 if __name__ == "__main__":
     visualizer = AIDrivenVisualizer()
-    
+
     # Example 1: Progress chart
     data_points = np.random.rand(10) * 10
     visualizer.generate_plot(data_points, chart_type='progress', show_plot=True)
-    
+
     # Example 2: Difficulty chart with labels
     concepts = ["Algorithms", "Data Structures", "Recursion", "OOP", "Design Patterns"]
     difficulties = np.array([0.7, 0.5, 0.8, 0.4, 0.9])
-    visualizer.generate_plot(difficulties, chart_type='difficulty', 
+    visualizer.generate_plot(difficulties, chart_type='difficulty',
                             labels=concepts, show_plot=True)
-    
+
     # Example 3: Save a chart to file
     today = datetime.now().strftime("%Y%m%d")
     visualizer.generate_plot(data_points, save_path=f"data/charts/progress_{today}.png")
-    
+
     # Example 4: Learning path
     learning_path = visualizer.generate_learning_path(concepts, difficulties, 0.6)
     print("Learning path visualization generated as base64 string")
+
+    # Example 5: Render several charts in parallel worker processes
+    futures = [visualizer.submit_plot(np.random.rand(10) * 10, title=f"Chart {i+1}") for i in range(4)]
+    print(f"Rendered {sum(len(f.result()) for f in futures)} bytes of PNG in the worker pool")
+    visualizer.close()
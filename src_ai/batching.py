@@ -0,0 +1,108 @@
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class BatchInferenceQueue:
+    """
+    Collects concurrent inference requests into micro-batches.
+
+    Callers submit a prompt and get a Future back. A single worker thread
+    waits for the first request, keeps collecting for up to max_wait_ms (or
+    until max_batch_size requests are queued), then runs one batched call per
+    group of requests that share the same generation parameters.
+    """
+    def __init__(self, run_batch, max_batch_size=8, max_wait_ms=10):
+        """
+        Start the worker thread
+
+        Args:
+            run_batch: Function(prompts, params) returning one output per prompt
+            max_batch_size: Maximum number of prompts per batch
+            max_wait_ms: How long to wait for more requests after the first one
+        """
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._requests = queue.Queue()
+        self._closed = False
+        self.batches_run = 0
+        self.requests_served = 0
+
+        self._worker = threading.Thread(target=self._run, name="batch-inference", daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt, params=None):
+        """
+        Queue a prompt for the next batch
+
+        Args:
+            prompt: Model input text
+            params: Dict of generation parameters (requests are only batched
+                with others using the same parameters)
+
+        Returns:
+            Future resolving to the model output for this prompt
+        """
+        if self._closed:
+            raise RuntimeError("Batch inference queue is closed")
+        future = Future()
+        self._requests.put((prompt, params or {}, future))
+        return future
+
+    def _collect(self):
+        """Block for one request, then gather more until the batch is full or the wait is over"""
+        batch = [self._requests.get()]
+        if batch[0] is None:
+            return None
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                # Finish this batch, then stop
+                self._requests.put(None)
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+
+            # Requests with different parameters can't share a generate call
+            groups = {}
+            for prompt, params, future in batch:
+                key = json.dumps(params, sort_keys=True)
+                groups.setdefault(key, (params, []))[1].append((prompt, future))
+
+            for params, requests in groups.values():
+                # Skip requests whose callers cancelled while waiting
+                active = [(prompt, future) for prompt, future in requests if future.set_running_or_notify_cancel()]
+                if not active:
+                    continue
+                try:
+                    outputs = self.run_batch([prompt for prompt, _ in active], params)
+                    for (_, future), output in zip(active, outputs):
+                        future.set_result(output)
+                except Exception as e:
+                    for _, future in active:
+                        future.set_exception(e)
+                self.batches_run += 1
+                self.requests_served += len(active)
+
+    def close(self):
+        """Stop the worker after the requests already queued have been served"""
+        if not self._closed:
+            self._closed = True
+            self._requests.put(None)
+            self._worker.join()
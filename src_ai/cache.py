@@ -0,0 +1,392 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class SQLiteStore:
+    """
+    Small key-value store in a local SQLite file.
+
+    Values are stored as JSON text alongside the time they were written and
+    last read, so the store can expire old entries and evict the least
+    recently used ones when it grows past max_entries. With max_age set,
+    expired entries are purged when the store opens and on every write.
+    """
+    def __init__(self, path, max_entries=None, max_age=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One connection per store, shared across threads behind the lock
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_created ON entries (created)")
+            self._purge_expired(time.time())
+            self._conn.commit()
+
+    def _purge_expired(self, now):
+        """Delete entries older than max_age; the caller holds the lock and commits"""
+        if self.max_age is not None:
+            self._conn.execute("DELETE FROM entries WHERE created < ?", (now - self.max_age,))
+
+    def get(self, key, max_age=None):
+        """
+        Get a stored value
+
+        Args:
+            key: String key
+            max_age: Ignore (and delete) entries older than this many seconds
+
+        Returns:
+            The stored value, or None if missing or expired
+        """
+        entry = self.get_entry(key, max_age)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key, max_age=None):
+        """Like get, but returns a (value, created timestamp) tuple"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if max_age is not None and now - row[1] > max_age:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, value):
+        """Store a JSON-serializable value, evicting least recently used entries if full"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            self._purge_expired(now)
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    "SELECT key FROM entries ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            self._conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def keys(self):
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT key FROM entries")]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory cache bounded by entry count and age.
+
+    Entries are evicted least-recently-used first once max_size is reached,
+    and expire ttl seconds after they were stored. An optional SQLiteStore
+    acts as a second tier that survives restarts.
+    """
+    def __init__(self, max_size=512, ttl=3600, store=None):
+        """
+        Initialize the cache
+
+        Args:
+            max_size: Maximum number of entries kept in memory
+            ttl: Seconds before an entry expires (None to never expire)
+            store: Optional SQLiteStore used as a persistent second tier
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.store = store
+        self._entries = OrderedDict()  # key -> (value, timestamp)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _store_key(self, key):
+        return json.dumps(key)
+
+    def get(self, key):
+        """Get a cached value, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, timestamp = entry
+                if self.ttl is None or now - timestamp < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+
+        # Fall back to the persistent tier and promote the entry into memory
+        if self.store is not None:
+            entry = self.store.get_entry(self._store_key(key), max_age=self.ttl)
+            if entry is not None:
+                value, created = entry
+                with self._lock:
+                    self.hits += 1
+                    self._insert(key, value, created)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        """Store a value under a key"""
+        with self._lock:
+            self._insert(key, value, time.time())
+        if self.store is not None:
+            self.store.set(self._store_key(key), value)
+
+    def _insert(self, key, value, timestamp):
+        self._entries[key] = (value, timestamp)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, predicate):
+        """
+        Remove every entry whose key matches a predicate
+
+        Args:
+            predicate: Function taking a key and returning True to remove it
+
+        Returns:
+            Number of entries removed from memory
+        """
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                del self._entries[key]
+        if self.store is not None:
+            for stored_key in self.store.keys():
+                key = json.loads(stored_key)
+                if predicate(tuple(key) if isinstance(key, list) else key):
+                    self.store.delete(stored_key)
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Get hit, miss and eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+class RenderCache:
+    """
+    Thread-safe cache for rendered images, bounded by total size in bytes.
+
+    Entries are evicted least-recently-used first once the images held in
+    memory exceed max_bytes. If a directory is given, every image is also
+    written there as <key>.png, and memory misses fall back to those files.
+    The files are bounded by max_disk_bytes the same way, least recently
+    used (by modification time across restarts) deleted first.
+    """
+    def __init__(self, max_bytes=32 * 1024 * 1024, directory=None, max_disk_bytes=256 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Maximum total size of the images kept in memory
+            directory: Optional directory used as a persistent second tier
+            max_disk_bytes: Maximum total size of the images kept in directory
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()  # key -> image bytes
+        self._size = 0
+        self._files = OrderedDict()  # key -> file size, oldest first
+        self._disk_size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._scan_directory()
+
+    def _scan_directory(self):
+        """Index the files left by earlier runs, oldest first, and enforce the budget"""
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.png'):
+                continue
+            try:
+                info = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            files.append((info.st_mtime, name[:-len('.png')], info.st_size))
+        for _, key, size in sorted(files):
+            self._files[key] = size
+            self._disk_size += size
+        self._evict_files()
+
+    def _evict_files(self):
+        """Delete the least recently used files until the disk tier fits its budget"""
+        doomed = []
+        with self._lock:
+            while self._disk_size > self.max_disk_bytes and len(self._files) > 1:
+                key, size = self._files.popitem(last=False)
+                self._disk_size -= size
+                doomed.append(key)
+        for key in doomed:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
+
+    def get(self, key):
+        """Get cached image bytes, or None on a miss"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        if self.directory:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self.hits += 1
+                    self._insert(key, data)
+                    if key in self._files:
+                        self._files.move_to_end(key)
+                try:
+                    # Keep the recency order for the next restart
+                    os.utime(self._path(key))
+                except OSError:
+                    pass
+                return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, data):
+        """Store image bytes under a key (a hex digest, so it is safe as a file name)"""
+        with self._lock:
+            self._insert(key, data)
+        if self.directory:
+            # Write to a temporary file and rename so readers never see a partial image
+            path = self._path(key)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            except OSError as e:
+                print(f"Error writing render cache entry: {e}")
+                return
+            with self._lock:
+                self._disk_size += len(data) - self._files.pop(key, 0)
+                self._files[key] = len(data)
+            self._evict_files()
+
+    def _insert(self, key, data):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = data
+        self._size += len(data)
+        # Keep at least the newest entry, even if it alone exceeds the budget
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._files.clear()
+            self._disk_size = 0
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith('.png'):
+                    os.remove(os.path.join(self.directory, name))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Get hit, miss and eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'files': len(self._files),
+                'disk_bytes': self._disk_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -1,27 +1,40 @@
 import re
 import random
-import time
-from src.knowledge_manager import KnowledgeManager
+from src.knowledge_registry import get_knowledge_manager
 from src.query_processor import QueryProcessor
 from src.response_formatter import ResponseFormatter
 from src_ai.nlp_chatbot import NLPChatbot
+from src_ai.cache import LRUCache, SQLiteStore
 
 class HybridResponseFormatter:
     """
     Combines rule-based knowledge with AI-enhanced content
     for more comprehensive explanations
     """
-    def __init__(self, knowledge_manager=None):
-        """Initialize with knowledge manager or create a new one"""
-        self.knowledge_manager = knowledge_manager or KnowledgeManager()
+    def __init__(self, knowledge_manager=None, cache_size=512, cache_ttl=3600, cache_path=None, nlp_model=None):
+        """
+        Initialize with knowledge manager or use the shared one
+        
+        Args:
+            knowledge_manager: KnowledgeManager to use (defaults to the shared one)
+            cache_size: Maximum number of AI responses kept in memory
+            cache_ttl: Seconds before a cached AI response expires
+            cache_path: Optional SQLite file so cached AI responses survive restarts
+            nlp_model: Existing NLPChatbot to share (loaded lazily if None)
+        """
+        self.knowledge_manager = knowledge_manager or get_knowledge_manager()
         self.query_processor = QueryProcessor(self.knowledge_manager)
         self.response_formatter = ResponseFormatter(self.knowledge_manager)
         
         # Optional: Initialize NLP model (lazy loading)
-        self._nlp_model = None
+        self._nlp_model = nlp_model
         
         # Additional properties
-        self._ai_cache = {}  # Simple cache for AI responses
+        # AI responses keyed by (concept, complexity level)
+        # The disk tier keeps more than memory does, but is bounded and expires too
+        store = SQLiteStore(cache_path, max_entries=cache_size * 8, max_age=cache_ttl) if cache_path else None
+        self._ai_cache = LRUCache(max_size=cache_size, ttl=cache_ttl, store=store)
+        self.knowledge_manager.add_reload_listener(self._on_knowledge_reload)
         self._quality_thresholds = {
             'min_length': 50,  # Minimum acceptable response length
             'max_repetition': 0.7,  # Maximum acceptable repetition ratio
@@ -51,29 +64,26 @@ class HybridResponseFormatter:
         Returns:
             Combined response as formatted text
         """
-        # Get rule-based response
-        rule_based_response = self._get_rule_based_response(query, complexity_level)
+        # Resolve the concept once; it drives both the rule-based answer and the cache key
+        concept = self.query_processor.process_query(query)
         
-        # Normalize query for cache key
-        cache_key = f"{query.lower().strip()}_{complexity_level}"
+        # Get rule-based response
+        rule_based_response = self._get_rule_based_response(query, complexity_level, concept)
         
         # If AI enhancement is disabled or rule-based response not found
         if not ai_enhancement or rule_based_response.startswith("I don't have information"):
             return rule_based_response
             
-        # Try to get response from cache to avoid repeated API calls
-        if cache_key in self._ai_cache and time.time() - self._ai_cache[cache_key]['timestamp'] < 3600:
-            ai_response = self._ai_cache[cache_key]['response']
-        else:
+        # Different phrasings of the same question share a cache entry
+        cache_key = (concept, complexity_level)
+        ai_response = self._ai_cache.get(cache_key)
+        if ai_response is None:
             # Get AI-generated response
-            ai_response = self._get_ai_response(query, complexity_level)
+            ai_response = self._get_ai_response(query, complexity_level, concept)
             
             # Cache the response
             if ai_response:
-                self._ai_cache[cache_key] = {
-                    'response': ai_response,
-                    'timestamp': time.time()
-                }
+                self._ai_cache.set(cache_key, ai_response)
         
         # Evaluate and ensure AI response quality
         if not self._is_quality_response(ai_response, query, rule_based_response):
@@ -90,10 +100,19 @@ class HybridResponseFormatter:
         
         return combined_response
         
-    def _get_rule_based_response(self, query, complexity_level):
+    def _on_knowledge_reload(self, changed_concepts):
+        """Drop cached AI responses for concepts that changed in the knowledge base"""
+        self._ai_cache.invalidate(lambda key: key[0] in changed_concepts)
+    
+    def cache_stats(self):
+        """Get hit, miss and eviction statistics for the AI response cache"""
+        return self._ai_cache.stats()
+        
+    def _get_rule_based_response(self, query, complexity_level, concept=None):
         """Get response from the rule-based system"""
         # Process query to find relevant concept
-        concept = self.query_processor.process_query(query)
+        if concept is None:
+            concept = self.query_processor.process_query(query)
         
         # If no concept found, return default message
         if not concept:
@@ -102,27 +121,14 @@ class HybridResponseFormatter:
         # Format explanation for the identified concept
         return self.response_formatter.format_explanation(concept, complexity_level)
         
-    def _get_ai_response(self, query, complexity_level="intermediate"):
+    def _get_ai_response(self, query, complexity_level="intermediate", concept=None):
         """Get response from the AI model with complexity guidance"""
         # If NLP model is not available, return empty response
         if self.nlp_model is None:
             return None
             
         try:
-            # Build a more specific prompt based on complexity level
-            level_guidance = {
-                "beginner": "using simple analogies and basic concepts",
-                "intermediate": "using technical terms with clear explanations",
-                "advanced": "with detailed technical implementation and theory"
-            }
-            
-            # Extract concept name for better focus
-            concept = self.query_processor.process_query(query)
-            context = ""
-            if concept:
-                context = f" The primary concept is '{concept}'."
-                
-            prompt = f"Explain the following computer science topic {level_guidance.get(complexity_level, '')}.{context} {query}"
+            prompt = self._build_ai_prompt(query, complexity_level, concept)
             
             # Generate response with the NLP model
             response = self.nlp_model.generate_response(prompt)
@@ -130,6 +136,82 @@ class HybridResponseFormatter:
         except Exception as e:
             print(f"Error generating AI response: {e}")
             return None
+    
+    def _build_ai_prompt(self, query, complexity_level, concept=None):
+        """Build the model prompt with complexity guidance"""
+        # Build a more specific prompt based on complexity level
+        level_guidance = {
+            "beginner": "using simple analogies and basic concepts",
+            "intermediate": "using technical terms with clear explanations",
+            "advanced": "with detailed technical implementation and theory"
+        }
+        
+        # Extract concept name for better focus
+        if concept is None:
+            concept = self.query_processor.process_query(query)
+        context = ""
+        if concept:
+            context = f" The primary concept is '{concept}'."
+            
+        return f"Explain the following computer science topic {level_guidance.get(complexity_level, '')}.{context} {query}"
+    
+    def stream_hybrid_response(self, query, complexity_level="intermediate", ai_enhancement=True):
+        """
+        Streaming version of format_hybrid_response
+        
+        The rule-based explanation is yielded first, then the AI text as it is
+        generated, then the final combined response.
+        
+        Args:
+            query: User's question
+            complexity_level: Desired explanation complexity ('beginner', 'intermediate', 'advanced')
+            ai_enhancement: Whether to include AI-generated enhancements
+            
+        Yields:
+            The full response text so far, each time it grows
+        """
+        concept = self.query_processor.process_query(query)
+        rule_based_response = self._get_rule_based_response(query, complexity_level, concept)
+        yield rule_based_response
+        
+        if not ai_enhancement or rule_based_response.startswith("I don't have information"):
+            return
+        
+        cache_key = (concept, complexity_level)
+        ai_response = self._ai_cache.get(cache_key)
+        if ai_response is None and self.nlp_model is not None:
+            # Show the AI text as it arrives, below the rule-based answer
+            partial = ""
+            complete = False
+            try:
+                prompt = self._build_ai_prompt(query, complexity_level, concept)
+                stream = self.nlp_model.generate_stream(prompt)
+                while True:
+                    try:
+                        chunk = next(stream)
+                    except StopIteration as stop:
+                        # generate_stream returns whether this was a finished model answer
+                        complete = bool(stop.value)
+                        break
+                    partial += chunk
+                    yield rule_based_response + "\n\n---\n\n**AI Insights (generating...):**\n" + partial
+            except Exception as e:
+                print(f"Error streaming AI response: {e}")
+                complete = False
+            ai_response = partial or None
+            # Fallbacks and interrupted streams are shown once but never cached
+            if ai_response and complete:
+                self._ai_cache.set(cache_key, ai_response)
+        
+        if not self._is_quality_response(ai_response, query, rule_based_response):
+            # Same second attempt as format_hybrid_response, without streaming
+            enhanced_query = self._enhance_query(query, rule_based_response)
+            ai_response = self._get_ai_response(enhanced_query, complexity_level)
+            if not self._is_quality_response(ai_response, query, rule_based_response):
+                yield rule_based_response + "\n\n*AI enhancement unavailable for this query.*"
+                return
+        
+        yield self._combine_responses(rule_based_response, ai_response, complexity_level)
             
     def _combine_responses(self, rule_based, ai_generated, complexity_level):
         """
@@ -1,11 +1,44 @@
 from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+import contextlib
+import hashlib
+import json
 import os
+import threading
 import time
+from src_ai.cache import SQLiteStore
+from src_ai.batching import BatchInferenceQueue
 
 class NLPChatbot:
-    def __init__(self, model_name="t5-small"):
+    def __init__(self, model_name="t5-small", cache_path='data/cache/generations.sqlite', cache_max_entries=10000,
+                 batch_size=1, batch_wait_ms=10, fast_cpu=False, num_threads=None, num_interop_threads=None,
+                 stream_timeout=60):
+        """
+        Initialize the chatbot
+        
+        Args:
+            model_name: Hugging Face seq2seq model to load
+            cache_path: SQLite file for caching generations across processes and
+                restarts (None to disable)
+            cache_max_entries: Maximum cached generations before LRU eviction
+            batch_size: Maximum prompts per generate call; above 1, concurrent
+                requests are micro-batched (see enable_batching)
+            batch_wait_ms: How long a batch waits for more requests
+            fast_cpu: Quantize linear layers to int8, run under torch.inference_mode
+                and warm the model up at load (see _enable_fast_cpu)
+            num_threads: PyTorch intra-op thread count (None keeps the default)
+            num_interop_threads: PyTorch inter-op thread count (None keeps the default)
+            stream_timeout: Seconds generate_stream waits for the next chunk
+                before giving up
+        """
         self.model_name = model_name
         self.is_model_loaded = False
+        self.generation_cache = None
+        self.batch_queue = None
+        self.stream_timeout = stream_timeout
+        # Streamed generations run outside the batch queue; one generate at a time
+        self._model_lock = threading.Lock()
+        self.fast_cpu = False
+        self.model_variant = "fp32"
         
         # Define fallback responses for when model loading fails
         self.fallback_responses = {
@@ -25,6 +58,103 @@ class NLPChatbot:
         except Exception as e:
             print(f"Error loading model: {e}")
             print("Running in fallback mode with rule-based responses.")
+        
+        if self.is_model_loaded:
+            self._configure_threads(num_threads, num_interop_threads)
+            if fast_cpu:
+                self._enable_fast_cpu()
+        
+        # Generation is deterministic for a fixed model, prompt and parameters,
+        # so identical requests can be served from disk instead of the model
+        if self.is_model_loaded and cache_path:
+            try:
+                self.generation_cache = SQLiteStore(cache_path, max_entries=cache_max_entries)
+            except Exception as e:
+                print(f"Generation cache unavailable: {e}")
+        
+        if self.is_model_loaded and batch_size > 1:
+            self.enable_batching(batch_size, batch_wait_ms)
+    
+    def _configure_threads(self, num_threads, num_interop_threads):
+        """Set PyTorch's intra- and inter-op thread pools"""
+        if not (num_threads or num_interop_threads):
+            return
+        import torch
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        if num_interop_threads:
+            try:
+                torch.set_num_interop_threads(num_interop_threads)
+            except RuntimeError as e:
+                # Only allowed before the first inter-op parallel work in the process
+                print(f"Could not set inter-op threads: {e}")
+    
+    def _enable_fast_cpu(self):
+        """Quantize linear layers to int8 and warm the model up, falling back to fp32 if the warmup fails"""
+        import torch
+        fp32_model = self.model
+        try:
+            quantization = getattr(torch, "ao", torch).quantization
+            self.model = quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+            self.model_variant = "int8-dynamic"
+        except Exception as e:
+            print(f"Dynamic quantization unavailable, keeping fp32 weights: {e}")
+        self.model.eval()
+        self.fast_cpu = True
+        
+        # The first generate call pays for lazy initialization; do it before serving
+        start_time = time.time()
+        try:
+            self._generate_batch(["explain computer science concept: algorithm"], {"max_length": 20})
+        except Exception as e:
+            print(f"Fast CPU warmup failed, restoring fp32 model: {e}")
+            self.model = fp32_model
+            self.model_variant = "fp32"
+            self.fast_cpu = False
+            try:
+                self._generate_batch(["explain computer science concept: algorithm"], {"max_length": 20})
+            except Exception as e:
+                print(f"Model unusable, running in fallback mode: {e}")
+                self.is_model_loaded = False
+            return
+        print(f"Fast CPU mode ({self.model_variant}) warmed up in {time.time() - start_time:.2f} seconds")
+    
+    def _inference_context(self):
+        """torch.inference_mode in fast CPU mode, otherwise generate's own no_grad"""
+        if self.fast_cpu:
+            import torch
+            return torch.inference_mode()
+        return contextlib.nullcontext()
+    
+    def enable_batching(self, max_batch_size=8, max_wait_ms=10):
+        """
+        Serve concurrent generate_response calls through one padded generate
+        call per micro-batch instead of one call per request
+        
+        Args:
+            max_batch_size: Maximum prompts per batch
+            max_wait_ms: How long the first request in a batch waits for others
+        """
+        if self.batch_queue is None:
+            self.batch_queue = BatchInferenceQueue(self._generate_batch, max_batch_size, max_wait_ms)
+    
+    def _generate_batch(self, model_inputs, generation_params):
+        """Run one padded generate call over several prompts"""
+        inputs = self.tokenizer(model_inputs, return_tensors="pt", max_length=512,
+                                truncation=True, padding=True)
+        with self._model_lock, self._inference_context():
+            outputs = self.model.generate(**inputs, **generation_params)
+        return self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+    
+    def _generation_key(self, model_input, generation_params):
+        """Content address of a generation: hash of model, prompt and parameters"""
+        payload = json.dumps({
+            "model": self.model_name,
+            "variant": self.model_variant,
+            "prompt": model_input,
+            "params": generation_params
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
     def generate_response(self, query, max_length=100):
         """
@@ -47,32 +177,126 @@ class NLPChatbot:
         try:
             # Prepare input
             model_input = f"explain computer science concept: {cleaned_query}"
-            inputs = self.tokenizer(model_input, return_tensors="pt", max_length=512, truncation=True)
+            generation_params = {"max_length": max_length, "num_beams": 4, "early_stopping": True}
+            
+            # Serve repeated prompts from the generation cache
+            cache_key = None
+            if self.generation_cache is not None:
+                cache_key = self._generation_key(model_input, generation_params)
+                cached = self.generation_cache.get(cache_key)
+                if cached is not None:
+                    return cached
             
-            # Generate response
+            # Generate response, sharing a batch with concurrent requests if enabled
             start_time = time.time()
-            outputs = self.model.generate(
-                **inputs,
-                max_length=max_length,
-                num_beams=4,
-                early_stopping=True
-            )
+            if self.batch_queue is not None:
+                response = self.batch_queue.submit(model_input, generation_params).result()
+            else:
+                response = self._generate_batch([model_input], generation_params)[0]
             generation_time = time.time() - start_time
             
-            # Decode output
-            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            
             # If response is too short or empty, fall back
             if len(response) < 20:
                 return self._get_fallback_response(cleaned_query)
                 
             print(f"Response generated in {generation_time:.2f} seconds")
+            if cache_key is not None:
+                self.generation_cache.set(cache_key, response)
             return response
             
         except Exception as e:
             print(f"Error generating response: {e}")
             return self._get_fallback_response(cleaned_query)
     
+    def generate_stream(self, query, max_length=100):
+        """
+        Generate a response token by token
+        
+        Streaming decodes greedily (beam search can't emit partial output), so
+        a cached beam-search answer for the same prompt is preferred when one
+        exists. Streamed requests are not micro-batched; they take turns with
+        the batch queue on the model.
+        
+        Args:
+            query: String containing the user's question
+            max_length: Maximum length of the generated response
+            
+        Yields:
+            Successive chunks of the response text
+            
+        Returns:
+            True if the chunks make up a model answer, False if they are the
+            canned fallback or were cut short (the generator's return value,
+            i.e. StopIteration.value). Once a chunk has been yielded the
+            fallback is never appended; a generation error is raised instead.
+        """
+        cleaned_query = self._preprocess_query(query)
+        
+        if not self.is_model_loaded:
+            yield self._get_fallback_response(cleaned_query)
+            return False
+        
+        model_input = f"explain computer science concept: {cleaned_query}"
+        beam_params = {"max_length": max_length, "num_beams": 4, "early_stopping": True}
+        stream_params = {"max_length": max_length, "num_beams": 1}
+        
+        # A cached answer is returned in one piece
+        stream_key = None
+        if self.generation_cache is not None:
+            stream_key = self._generation_key(model_input, stream_params)
+            for params in (beam_params, stream_params):
+                cached = self.generation_cache.get(self._generation_key(model_input, params))
+                if cached is not None:
+                    yield cached
+                    return True
+        
+        chunks = []
+        try:
+            from transformers import TextIteratorStreamer
+            streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, timeout=self.stream_timeout,
+                                            skip_special_tokens=True)
+            inputs = self.tokenizer(model_input, return_tensors="pt", max_length=512, truncation=True)
+            errors = []
+            
+            def generate():
+                try:
+                    # Streaming bypasses the batch queue, so take turns with it on the model
+                    with self._model_lock, self._inference_context():
+                        self.model.generate(**inputs, **stream_params, streamer=streamer)
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    # Unblock the reader even if generate failed before ending the stream
+                    streamer.end()
+            
+            worker = threading.Thread(target=generate, daemon=True)
+            worker.start()
+            for text in streamer:
+                if text:
+                    chunks.append(text)
+                    yield text
+            worker.join()
+            if errors:
+                raise errors[0]
+        except Exception as e:
+            print(f"Error streaming response: {e}")
+            if chunks:
+                # Part of an answer is already out; don't pass it off as complete
+                raise
+            yield self._get_fallback_response(cleaned_query)
+            return False
+        
+        response = "".join(chunks)
+        if not chunks:
+            yield self._get_fallback_response(cleaned_query)
+            return False
+        if len(response) < 20:
+            # Too short to be useful; not cached, and reported as incomplete
+            return False
+        if stream_key is not None:
+            self.generation_cache.set(stream_key, response)
+        return True
+    
     def _preprocess_query(self, query):
         """Clean and preprocess the query"""
         return query.strip().lower()
@@ -0,0 +1,34 @@
+import numpy as np
+
+
+class PathIndex:
+    """
+    Precomputed learning path for every start concept, in CSR form: the path
+    from concept s is indices[indptr[s]:indptr[s + 1]].
+    """
+    def __init__(self, indptr, indices):
+        """
+        Args:
+            indptr: Path offsets, one more than the number of start concepts
+            indices: Concept IDs of all paths, concatenated in start order
+        """
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+
+    @classmethod
+    def from_paths(cls, paths):
+        """Build the index from a list of paths, one per start concept"""
+        indptr = np.zeros(len(paths) + 1, dtype=np.int64)
+        np.cumsum([len(path) for path in paths], out=indptr[1:])
+        indices = np.concatenate([np.asarray(path, dtype=np.int32) for path in paths]) if paths else []
+        return cls(indptr, indices)
+
+    @property
+    def num_paths(self):
+        return len(self.indptr) - 1
+
+    def path(self, start_concept):
+        """Learning path from a start concept as a list of concept IDs"""
+        if not 0 <= start_concept < self.num_paths:
+            raise IndexError(f"No path for start concept {start_concept}")
+        return self.indices[self.indptr[start_concept]:self.indptr[start_concept + 1]].tolist()
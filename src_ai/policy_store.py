@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from src_ai.path_index import PathIndex
+from src.prerequisite_graph import PrerequisiteGraph
+
+# Snapshot layout: one directory per version under the policy directory,
+#   <policy dir>/v000001/{q_table,difficulty,prereq_indptr,prereq_indices}.npy
+#   + manifest.json, optionally path_indptr.npy/path_indices.npy (a PathIndex)
+# plus a CURRENT file naming the published version. Snapshots are written in
+# full before CURRENT is switched to them, so readers always see a complete one.
+# Format 1 stored the prerequisites as a dense prerequisites.npy matrix.
+FORMAT_VERSION = 2
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+
+
+def concepts_hash(concepts):
+    """Hash of an ordered concept list, used to check a snapshot still fits"""
+    payload = json.dumps(list(concepts), separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _version_dirs(directory):
+    """Existing snapshot versions, oldest first"""
+    if not os.path.isdir(directory):
+        return []
+    versions = []
+    for name in os.listdir(directory):
+        if name.startswith("v") and name[1:].isdigit():
+            versions.append(int(name[1:]))
+    return sorted(versions)
+
+
+def save_policy_snapshot(directory, q_table, concepts, difficulty, prerequisites, params=None, keep=3,
+                         paths=None):
+    """
+    Write a new policy snapshot and publish it
+
+    Args:
+        directory: Policy directory holding the versioned snapshots
+        q_table: Q-table array
+        concepts: Ordered list of concept names the arrays are indexed by
+        difficulty: Difficulty per concept
+        prerequisites: PrerequisiteGraph (or dense prerequisite matrix)
+        params: Dict of hyperparameters recorded in the manifest
+        keep: Number of most recent snapshots to keep, besides one more
+            that stays for readers still on the previously published one
+        paths: Optional PathIndex of the greedy learning paths under q_table
+
+    Returns:
+        Version number of the published snapshot
+    """
+    os.makedirs(directory, exist_ok=True)
+    temp_dir = os.path.join(directory, f".tmp{os.getpid()}-{time.time_ns()}")
+    os.makedirs(temp_dir)
+    try:
+        if not isinstance(prerequisites, PrerequisiteGraph):
+            prerequisites = PrerequisiteGraph.from_dense(prerequisites)
+        arrays = {
+            "q_table": np.asarray(q_table, dtype=float),
+            "difficulty": np.asarray(difficulty, dtype=float),
+            "prereq_indptr": prerequisites.indptr,
+            "prereq_indices": prerequisites.indices
+        }
+        if paths is not None:
+            arrays["path_indptr"] = paths.indptr
+            arrays["path_indices"] = paths.indices
+        for name, array in arrays.items():
+            np.save(os.path.join(temp_dir, f"{name}.npy"), array)
+
+        # Claim the next free version; another writer may take one first
+        while True:
+            versions = _version_dirs(directory)
+            version = versions[-1] + 1 if versions else 1
+            manifest = {
+                "format": FORMAT_VERSION,
+                "version": version,
+                "created": time.time(),
+                "num_concepts": len(concepts),
+                "concepts_hash": concepts_hash(concepts),
+                "concepts": list(concepts),
+                "params": params or {}
+            }
+            with open(os.path.join(temp_dir, MANIFEST_FILE), 'w') as file:
+                json.dump(manifest, file)
+            try:
+                os.rename(temp_dir, os.path.join(directory, f"v{version:06d}"))
+                break
+            except OSError:
+                if not os.path.isdir(os.path.join(directory, f"v{version:06d}")):
+                    raise
+    except Exception:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+
+    # Switch CURRENT atomically
+    temp_current = os.path.join(directory, f"{CURRENT_FILE}.tmp{os.getpid()}")
+    with open(temp_current, 'w') as file:
+        file.write(f"v{version:06d}\n")
+    os.replace(temp_current, os.path.join(directory, CURRENT_FILE))
+
+    # Drop old snapshots, never the one just published. Readers that loaded
+    # the previous CURRENT may still be memory-mapping it, so one version
+    # beyond keep survives until the next save
+    for old_version in _version_dirs(directory)[:-(keep + 1)] if keep else []:
+        if old_version != version:
+            shutil.rmtree(os.path.join(directory, f"v{old_version:06d}"), ignore_errors=True)
+    return version
+
+
+def load_policy_snapshot(directory, mmap=True):
+    """
+    Load the published policy snapshot
+
+    Args:
+        directory: Policy directory holding the versioned snapshots
+        mmap: Memory-map the arrays read-only instead of reading them
+
+    Returns:
+        Dict with the manifest, the q_table and difficulty arrays, the
+        prerequisites as a PrerequisiteGraph and the paths as a PathIndex (None
+        if the snapshot has none), or None if nothing has been published
+    """
+    try:
+        with open(os.path.join(directory, CURRENT_FILE), 'r') as file:
+            snapshot_dir = os.path.join(directory, file.read().strip())
+    except FileNotFoundError:
+        return None
+
+    with open(os.path.join(snapshot_dir, MANIFEST_FILE), 'r') as file:
+        manifest = json.load(file)
+    if manifest.get("format") not in (1, FORMAT_VERSION):
+        raise ValueError(f"Unsupported policy snapshot format: {manifest.get('format')}")
+
+    def load(name):
+        return np.load(os.path.join(snapshot_dir, f"{name}.npy"), mmap_mode='r' if mmap else None)
+
+    snapshot = {"manifest": manifest, "q_table": load("q_table"), "difficulty": load("difficulty")}
+    if manifest["format"] == 1:
+        snapshot["prerequisites"] = PrerequisiteGraph.from_dense(load("prerequisites"))
+    else:
+        snapshot["prerequisites"] = PrerequisiteGraph(manifest["num_concepts"], load("prereq_indptr"),
+                                                      load("prereq_indices"))
+    snapshot["paths"] = None
+    if os.path.exists(os.path.join(snapshot_dir, "path_indptr.npy")):
+        snapshot["paths"] = PathIndex(load("path_indptr"), load("path_indices"))
+    return snapshot
+
+
+def migrate_matrix(matrix, old_concepts, new_concepts, base=None):
+    """
+    Re-index a concept x concept matrix to a new concept list by name
+
+    Entries between concepts present in both lists are carried over; rows and
+    columns of new concepts come from `base` (zeros if omitted).
+
+    Returns:
+        New array of shape (len(new_concepts), len(new_concepts))
+    """
+    migrated = np.zeros((len(new_concepts), len(new_concepts))) if base is None else np.array(base, dtype=float)
+    old_index = {concept: i for i, concept in enumerate(old_concepts)}
+    shared = [(i, old_index[concept]) for i, concept in enumerate(new_concepts) if concept in old_index]
+    if shared:
+        new_idx, old_idx = (np.array(indices) for indices in zip(*shared))
+        migrated[np.ix_(new_idx, new_idx)] = np.asarray(matrix)[np.ix_(old_idx, old_idx)]
+    return migrated
+
+
+def migrate_graph(graph, old_concepts, new_concepts, base):
+    """
+    Re-index a PrerequisiteGraph to a new concept list by name
+
+    Edges between concepts present in both lists are carried over; edges that
+    touch a new concept come from `base`, a graph over new_concepts.
+
+    Returns:
+        New PrerequisiteGraph over new_concepts
+    """
+    old_to_new = np.full(len(old_concepts), -1, dtype=np.int64)
+    new_index = {concept: i for i, concept in enumerate(new_concepts)}
+    for i, concept in enumerate(old_concepts):
+        old_to_new[i] = new_index.get(concept, -1)
+    shared = np.zeros(len(new_concepts), dtype=bool)
+    shared[old_to_new[old_to_new >= 0]] = True
+
+    old_dependents, old_prerequisites = (old_to_new[ends] for ends in graph.edges())
+    carried = (old_dependents >= 0) & (old_prerequisites >= 0)
+    base_dependents, base_prerequisites = base.edges()
+    kept = ~(shared[base_dependents] & shared[base_prerequisites])
+    return PrerequisiteGraph.from_edges(
+        len(new_concepts),
+        np.concatenate([old_dependents[carried], base_dependents[kept]]),
+        np.concatenate([old_prerequisites[carried], base_prerequisites[kept]])
+    )
+
+
+def migrate_vector(vector, old_concepts, new_concepts, base):
+    """Re-index a per-concept vector to a new concept list by name (see migrate_matrix)"""
+    migrated = np.array(base, dtype=float)
+    old_index = {concept: i for i, concept in enumerate(old_concepts)}
+    for i, concept in enumerate(new_concepts):
+        if concept in old_index:
+            migrated[i] = vector[old_index[concept]]
+    return migrated
@@ -1,14 +1,44 @@
 import numpy as np
-import json
 import os
 import pickle
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from src.knowledge_registry import get_knowledge_manager
+from src_ai.policy_store import (concepts_hash, load_policy_snapshot, migrate_graph, migrate_matrix,
+                                 migrate_vector, save_policy_snapshot)
+from src_ai.path_index import PathIndex
+from src.prerequisite_graph import PrerequisiteGraph
+
+# Prerequisites must reach these mastery levels before a concept is offered
+# as a valid action, and before studying it is rewarded
+VALID_ACTION_MASTERY = 0.5
+STEP_MASTERY = 0.7
 
 class LearningEnvironment:
     """
     Environment for the reinforcement learning agent.
     Represents the state space of concepts and their relationships.
+    
+    Prerequisites are held in a sparse PrerequisiteGraph. For every concept
+    the environment keeps a count of prerequisites still below each mastery
+    threshold. A step only changes one mastery level, so
+    it only has to update the counts of that concept's dependents, and the
+    valid actions are simply the concepts whose count is zero.
     """
-    def __init__(self, concepts=None, difficulty_levels=None):
+    def __init__(self, concepts=None, difficulty_levels=None, prerequisites=None):
+        """
+        Initialize the environment
+        
+        Args:
+            concepts: List of concept names (defaults to the knowledge base)
+            difficulty_levels: Difficulty per concept (random 0.3-0.8 if omitted)
+            prerequisites: PrerequisiteGraph or n x n prerequisite matrix
+                (randomly generated if omitted); pass the same concepts,
+                difficulty and prerequisites to rebuild an identical
+                environment elsewhere
+        """
         # If concepts are provided, use them, otherwise load default
         if concepts:
             self.concepts = concepts
@@ -19,39 +49,106 @@ class LearningEnvironment:
         self.num_concepts = len(self.concepts)
         
         # Concept difficulty (0-1 scale)
-        if difficulty_levels:
+        if difficulty_levels is not None:
             self.difficulty = difficulty_levels
         else:
             self.difficulty = np.random.rand(self.num_concepts) * 0.5 + 0.3  # 0.3-0.8 range
         
         # Concept relationships (prerequisite graph)
-        # If concept A is a prerequisite for B, then prerequisites[B][A] = 1
-        self.prerequisites = np.zeros((self.num_concepts, self.num_concepts))
-        self._generate_prerequisite_relationships()
+        if prerequisites is not None:
+            self.prerequisite_graph = prerequisites
+        else:
+            self.prerequisite_graph = self._generate_prerequisite_relationships()
         
         # Current state (concept index and mastery level)
         self.current_concept = 0
         self.mastery_levels = np.zeros(self.num_concepts)
+    
+    @property
+    def prerequisite_graph(self):
+        """Sparse prerequisite graph (see PrerequisiteGraph)"""
+        return self._prerequisite_graph
+    
+    @prerequisite_graph.setter
+    def prerequisite_graph(self, graph):
+        if not isinstance(graph, PrerequisiteGraph):
+            graph = PrerequisiteGraph.from_dense(graph)
+        self._prerequisite_graph = graph
+        self._prereq_counts = graph.counts
+        if hasattr(self, '_mastery_levels'):
+            self.mastery_levels = self._mastery_levels
+    
+    @property
+    def prerequisites(self):
+        """
+        Dense prerequisite matrix: if concept A is a prerequisite for B, then
+        prerequisites[B][A] = 1. Built on every access, so use
+        prerequisite_graph for anything but small environments.
+        """
+        return self._prerequisite_graph.to_dense()
+    
+    @prerequisites.setter
+    def prerequisites(self, matrix):
+        self.prerequisite_graph = matrix
+    
+    @property
+    def mastery_levels(self):
+        """
+        Mastery level per concept, as a read-only view: writing one element
+        would bypass the prerequisite counters, so assign a whole array
+        instead, which recomputes them
+        """
+        levels = self._mastery_levels.view()
+        levels.setflags(write=False)
+        return levels
+    
+    @mastery_levels.setter
+    def mastery_levels(self, levels):
+        self._mastery_levels = np.array(levels, dtype=float)
+        if not self._mastery_levels.any():
+            # Fresh learner: every prerequisite is unmet
+            self._unmet_valid = self._prereq_counts.copy()
+            self._unmet_step = self._prereq_counts.copy()
+        else:
+            self._unmet_valid = self._prereq_counts - self._count_met(VALID_ACTION_MASTERY)
+            self._unmet_step = self._prereq_counts - self._count_met(STEP_MASTERY)
+        self._mastered_count = int(np.count_nonzero(self._mastery_levels >= STEP_MASTERY))
+    
+    def _count_met(self, threshold):
+        """Number of prerequisites at or above a mastery threshold, per concept"""
+        return self._prerequisite_graph.count_met(self._mastery_levels >= threshold)
+    
+    def _update_mastery(self, concept, new_level):
+        """Set one concept's mastery level and update its dependents' counts"""
+        old_level = self._mastery_levels[concept]
+        self._mastery_levels[concept] = new_level
+        if old_level < VALID_ACTION_MASTERY <= new_level:
+            self._unmet_valid[self._prerequisite_graph.dependents_of(concept)] -= 1
+        if old_level < STEP_MASTERY <= new_level:
+            self._unmet_step[self._prerequisite_graph.dependents_of(concept)] -= 1
+            self._mastered_count += 1
         
     def _load_default_concepts(self):
         """Load default concepts from knowledge base"""
         try:
-            with open('data/cs_knowledge.json', 'r') as f:
-                knowledge = json.load(f)
-                return list(knowledge.keys())
+            # Reuse the process-wide knowledge base instead of parsing it again
+            return get_knowledge_manager().get_all_concepts()
         except Exception:
             # Return some default concepts if loading fails
             return ["algorithms", "data structures", "recursion", "oop", "complexity analysis"]
     
     def _generate_prerequisite_relationships(self):
         """Generate a directed graph of concept prerequisites"""
+        concepts = []
+        prerequisites = []
         # Simple approach: Concepts with lower indices tend to be prerequisites for higher ones
         for i in range(1, self.num_concepts):
             # Each concept has 1-3 prerequisites from earlier concepts
             num_prereqs = min(i, np.random.randint(1, 4))
             prereq_indices = np.random.choice(i, num_prereqs, replace=False)
-            for idx in prereq_indices:
-                self.prerequisites[i][idx] = 1
+            concepts.extend([i] * num_prereqs)
+            prerequisites.extend(prereq_indices)
+        return PrerequisiteGraph.from_edges(self.num_concepts, concepts, prerequisites)
     
     def reset(self, start_concept=None):
         """Reset the environment to initial state"""
@@ -59,8 +156,7 @@ class LearningEnvironment:
             self.current_concept = start_concept
         else:
             # Start from a concept with no prerequisites
-            possible_starts = [i for i in range(self.num_concepts) 
-                              if np.sum(self.prerequisites[i]) == 0]
+            possible_starts = np.flatnonzero(self._prereq_counts == 0)
             self.current_concept = np.random.choice(possible_starts)
             
         self.mastery_levels = np.zeros(self.num_concepts)
@@ -81,15 +177,8 @@ class LearningEnvironment:
             # Invalid action, penalize and don't change state
             return self.current_concept, -5, False
         
-        # Check if prerequisites are met
-        prereqs = self.prerequisites[action]
-        prereqs_satisfied = True
-        
         # If there are prerequisites with mastery level below 0.7, penalize
-        for i in range(self.num_concepts):
-            if prereqs[i] > 0 and self.mastery_levels[i] < 0.7:
-                prereqs_satisfied = False
-                break
+        prereqs_satisfied = self._unmet_step[action] == 0
         
         # Calculate reward and update state
         if not prereqs_satisfied:
@@ -109,31 +198,24 @@ class LearningEnvironment:
                 reward = 0.2
                 
             # Update mastery level for the concept
-            self.mastery_levels[action] += (0.3 * (1 - self.mastery_levels[action]))
+            mastery = self._mastery_levels[action]
+            self._update_mastery(action, mastery + 0.3 * (1 - mastery))
         
         # Update current concept
         self.current_concept = action
         
         # Check if done (all concepts mastered)
-        done = np.all(self.mastery_levels >= 0.7)
+        done = self._mastered_count == self.num_concepts
             
         return action, reward, done
     
     def get_valid_actions(self):
         """Get list of valid next actions based on prerequisites"""
-        valid_actions = []
-        for action in range(self.num_concepts):
-            # Check prerequisites
-            prereqs_met = True
-            for i in range(self.num_concepts):
-                if self.prerequisites[action][i] > 0 and self.mastery_levels[i] < 0.5:
-                    prereqs_met = False
-                    break
-            
-            if prereqs_met:
-                valid_actions.append(action)
-                
-        return valid_actions
+        return np.flatnonzero(self.get_valid_action_mask()).tolist()
+    
+    def get_valid_action_mask(self):
+        """Boolean array marking concepts whose prerequisites are all at least half mastered"""
+        return self._unmet_valid == 0
     
     def get_state_representation(self):
         """Get a representation of the current state"""
@@ -145,9 +227,28 @@ class LearningEnvironment:
 
 class LearningPathRL:
     """Reinforcement learning agent for optimizing learning paths"""
-    def __init__(self, env=None, alpha=0.1, gamma=0.9, epsilon=0.1):
+    def __init__(self, env=None, alpha=0.1, gamma=0.9, epsilon=0.1, load_model=True,
+                 model_path='data/rl_policy', legacy_model_path='data/rl_model.pkl'):
+        """
+        Initialize the agent
+        
+        Args:
+            env: LearningEnvironment to learn on (a default one if omitted)
+            alpha: Learning rate
+            gamma: Discount factor
+            epsilon: Exploration rate
+            load_model: Whether to load the published policy snapshot
+            model_path: Directory of versioned policy snapshots
+            legacy_model_path: Pickled model from older versions, converted to
+                a snapshot the first time no snapshot exists
+        """
         # Learning environment
         self.env = env if env else LearningEnvironment()
+        self.model_path = model_path
+        self.legacy_model_path = legacy_model_path
+        self._trainer = None
+        # (Q-table, PathIndex) pair; the index is only valid for that exact table
+        self._paths = None
         
         # RL parameters
         self.alpha = alpha      # Learning rate
@@ -162,11 +263,13 @@ class LearningPathRL:
         self.q_table = np.zeros((self.num_states, self.num_actions))
         
         # Load pre-trained model if available
-        self._load_model()
+        if load_model:
+            self._load_model()
         
     def train(self, episodes=1000):
         """Train the agent through multiple episodes"""
         print(f"Training RL agent for {episodes} episodes...")
+        self._writable_q_table()
         
         # Track progress
         total_rewards = []
@@ -220,6 +323,213 @@ class LearningPathRL:
         
         return total_rewards
     
+    def train_vectorized(self, episodes=1000, num_envs=32, max_steps=100, seed=None, save_model=True):
+        """
+        Train the agent on many environments at once
+        
+        Runs num_envs independent copies of the environment as stacked arrays
+        (one row of mastery levels and prerequisite counts per copy). Each tick
+        picks epsilon-greedy actions for all copies and applies their Q-updates
+        together. Copies that finish an episode are reset and start the next
+        one until `episodes` episodes have been played.
+        
+        Args:
+            episodes: Total number of episodes to play
+            num_envs: Number of environments stepped together
+            max_steps: Step limit per episode
+            seed: Optional seed for the random generator
+            save_model: Whether to save the trained model afterwards
+            
+        Returns:
+            List of episode rewards in the order the episodes finished
+        """
+        start_time = time.time()
+        self._writable_q_table()
+        total_rewards = self._run_vectorized(episodes, num_envs, max_steps, np.random.default_rng(seed))
+        
+        print(f"Trained RL agent for {episodes} episodes on {num_envs} environments in "
+              f"{time.time() - start_time:.2f} seconds, Avg Reward: {np.mean(total_rewards[-100:]):.2f}, "
+              f"Epsilon: {self.epsilon:.4f}")
+        
+        # Save the trained model
+        if save_model:
+            self._save_model()
+        
+        return total_rewards
+    
+    def _run_vectorized(self, episodes, num_envs, max_steps, rng, visit_counts=None):
+        """
+        Vectorized training loop behind train_vectorized
+        
+        Args:
+            visit_counts: Optional array shaped like q_table that accumulates
+                how many updates each (state, action) pair received
+        """
+        env = self.env
+        n = env.num_concepts
+        num_envs = max(1, min(num_envs, episodes))
+        graph = env.prerequisite_graph
+        prereq_counts = env._prereq_counts
+        difficulty = np.asarray(env.difficulty, dtype=float)
+        possible_starts = np.flatnonzero(prereq_counts == 0)
+        
+        rows = np.arange(num_envs)
+        state = np.zeros(num_envs, dtype=int)
+        mastery = np.zeros((num_envs, n))
+        unmet_valid = np.zeros((num_envs, n), dtype=int)
+        unmet_step = np.zeros((num_envs, n), dtype=int)
+        mastered = np.zeros(num_envs, dtype=int)
+        steps = np.zeros(num_envs, dtype=int)
+        episode_reward = np.zeros(num_envs)
+        
+        def reset(which):
+            state[which] = rng.choice(possible_starts, size=len(which))
+            mastery[which] = 0.0
+            unmet_valid[which] = prereq_counts
+            unmet_step[which] = prereq_counts
+            mastered[which] = 0
+            steps[which] = 0
+            episode_reward[which] = 0.0
+        
+        reset(rows)
+        active = np.ones(num_envs, dtype=bool)
+        started = num_envs
+        total_rewards = []
+        
+        while active.any():
+            live = rows[active]
+            s = state[live]
+            
+            # Epsilon-greedy: explore a random valid action, otherwise exploit
+            actions = np.argmax(self.q_table[s], axis=1)
+            explore = rng.random(len(live)) < self.epsilon
+            stuck = np.zeros(len(live), dtype=bool)
+            if explore.any():
+                valid = unmet_valid[live[explore]] == 0
+                scores = np.where(valid, rng.random(valid.shape), -1.0)
+                actions[explore] = np.argmax(scores, axis=1)
+                # An explorer without valid actions ends its episode, as in train
+                stuck[explore] = ~valid.any(axis=1)
+            
+            # Step every environment (see LearningEnvironment.step)
+            current = mastery[live, actions]
+            ready = unmet_step[live, actions] == 0
+            rewards = np.where(current < 0.3, 2.0 * (1.2 - difficulty[actions]),
+                               np.where(current < 0.7, 1.0, 0.2))
+            rewards = np.where(ready, rewards, -3.0)
+            updated = np.where(ready, current + 0.3 * (1 - current), current)
+            mastery[live, actions] = updated
+            for threshold, unmet in ((VALID_ACTION_MASTERY, unmet_valid), (STEP_MASTERY, unmet_step)):
+                crossed = (current < threshold) & (updated >= threshold)
+                if crossed.any():
+                    # Each environment crosses at most once per tick, so the
+                    # (environment, dependent) pairs are unique
+                    owners, dependents = graph.gather_dependents(actions[crossed])
+                    unmet[live[crossed][owners], dependents] -= 1
+            mastered[live] += (current < STEP_MASTERY) & (updated >= STEP_MASTERY)
+            
+            # Q-learning update; environments that hit the same (state, action)
+            # pair this tick contribute the mean of their TD errors
+            td = rewards + self.gamma * self.q_table[actions].max(axis=1) - self.q_table[s, actions]
+            td[stuck] = 0.0
+            pairs, pair_index = np.unique(s * n + actions, return_inverse=True)
+            td_sum = np.zeros(len(pairs))
+            visits = np.zeros(len(pairs))
+            np.add.at(td_sum, pair_index, td)
+            np.add.at(visits, pair_index, ~stuck)
+            touched = visits > 0
+            self.q_table.reshape(-1)[pairs[touched]] += self.alpha * td_sum[touched] / visits[touched]
+            if visit_counts is not None:
+                visit_counts.reshape(-1)[pairs[touched]] += visits[touched]
+            
+            state[live] = np.where(stuck, s, actions)
+            episode_reward[live] += np.where(stuck, 0.0, rewards)
+            steps[live] += ~stuck
+            
+            finished = live[stuck | (mastered[live] == n) | (steps[live] >= max_steps)]
+            if len(finished):
+                total_rewards.extend(episode_reward[finished].tolist())
+                # Reduce exploration rate once per finished episode
+                self.epsilon = max(0.01, self.epsilon * 0.995 ** len(finished))
+                restart = finished[:max(0, episodes - started)]
+                active[finished[len(restart):]] = False
+                if len(restart):
+                    reset(restart)
+                    started += len(restart)
+        
+        return total_rewards
+    
+    def train_parallel(self, episodes=1000, num_workers=None, sync_every=250, num_envs=32,
+                       max_steps=100, seed=None, save_model=True):
+        """
+        Train the agent in several worker processes
+        
+        Episodes are split into rounds. In each round every worker starts from
+        the current Q-table, plays its share of the round's episodes with
+        train_vectorized on its own copy of the environment, and sends back its
+        Q-table and per-pair visit counts. The tables are merged by averaging
+        each (state, action) value weighted by how often each worker updated it.
+        
+        Worker seeds are spawned from one SeedSequence per (round, worker), so a
+        given seed and worker count always produce the same Q-table.
+        
+        Args:
+            episodes: Total number of episodes across all workers
+            num_workers: Number of worker processes (defaults to the CPU count)
+            sync_every: Episodes each worker plays between merges
+            num_envs: Environments each worker steps together
+            max_steps: Step limit per episode
+            seed: Optional seed for reproducible training
+            save_model: Whether to save the trained model afterwards
+            
+        Returns:
+            List of episode rewards, grouped by round and then by worker
+        """
+        num_workers = num_workers or os.cpu_count() or 1
+        episodes_per_round = sync_every * num_workers
+        num_rounds = max(1, -(-episodes // episodes_per_round))
+        seeds = np.random.SeedSequence(seed).spawn(num_rounds * num_workers)
+        environment = (self.env.concepts, np.asarray(self.env.difficulty), self.env.prerequisite_graph)
+        
+        print(f"Training RL agent for {episodes} episodes on {num_workers} workers...")
+        start_time = time.time()
+        self._writable_q_table()
+        total_rewards = []
+        remaining = episodes
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=num_workers, mp_context=context) as executor:
+            for round_index in range(num_rounds):
+                # Split this round's episodes as evenly as possible
+                round_episodes = min(remaining, episodes_per_round)
+                shares = [round_episodes // num_workers + (w < round_episodes % num_workers)
+                          for w in range(num_workers)]
+                remaining -= round_episodes
+                
+                params = (self.alpha, self.gamma, self.epsilon)
+                futures = [
+                    executor.submit(_train_worker, environment, self.q_table, params, share,
+                                    num_envs, max_steps, seeds[round_index * num_workers + w])
+                    for w, share in enumerate(shares) if share > 0
+                ]
+                results = [future.result() for future in futures]
+                
+                # Visit-count-weighted average; pairs no worker touched keep their value
+                weighted = sum(q_table * visits for q_table, visits, _, _ in results)
+                visits = sum(visits for _, visits, _, _ in results)
+                touched = visits > 0
+                self.q_table[touched] = weighted[touched] / visits[touched]
+                self.epsilon = float(np.mean([epsilon for _, _, _, epsilon in results]))
+                for _, _, rewards, _ in results:
+                    total_rewards.extend(rewards)
+        
+        print(f"Trained RL agent for {episodes} episodes on {num_workers} workers in "
+              f"{time.time() - start_time:.2f} seconds, Avg Reward: {np.mean(total_rewards[-100:]):.2f}")
+        
+        if save_model:
+            self._save_model()
+        
+        return total_rewards
+    
     def suggest_next_concept(self, current_concept_idx=None, mastery_levels=None):
         """
         Suggest the next concept to learn based on current state
@@ -242,115 +552,263 @@ class LearningPathRL:
         state = self.env.current_concept
         
         # Get valid actions
-        valid_actions = self.env.get_valid_actions()
+        valid_mask = self.env.get_valid_action_mask()
         
-        if not valid_actions:
+        if not valid_mask.any():
             # No valid actions, suggest the concept with highest mastery progress
             return np.argmax(self.env.mastery_levels)
         
-        # Filter q_table for valid actions only
-        valid_q_values = [self.q_table[state][action] for action in valid_actions]
-        
-        # Find best action
-        best_action_idx = np.argmax(valid_q_values)
-        best_action = valid_actions[best_action_idx]
-        
-        return best_action
+        # Find the best action among the valid ones
+        valid_q_values = np.where(valid_mask, self.q_table[state], -np.inf)
+        return int(np.argmax(valid_q_values))
     
     def get_optimal_path(self, start_concept=0):
         """
         Determine an optimal learning path from a starting concept
         
+        Paths come from the precomputed PathIndex when it matches the current
+        Q-table; otherwise the greedy policy is followed on a private copy of
+        the environment. Either way self.env is left untouched, so this is
+        safe to call from several threads.
+        
         Args:
             start_concept: Index of the starting concept
             
         Returns:
             List of concept indices representing the suggested path
         """
-        # Reset environment
-        self.env.reset(start_concept)
+        q_table = self.q_table
+        paths = self._paths
+        if paths is not None and paths[0] is q_table:
+            return paths[1].path(start_concept)
+        return _greedy_path(self._private_env(), q_table, start_concept)
+    
+    def build_path_index(self):
+        """
+        Precompute the greedy learning path from every start concept
         
-        # Follow optimal policy until done
-        path = [start_concept]
-        done = False
-        step_count = 0
+        Runs on a private copy of the environment, so it can run while the
+        agent serves requests.
         
-        while not done and step_count < self.num_states * 2:  # Avoid infinite loops
-            # Get next concept using greedy policy
-            next_concept = self.suggest_next_concept()
-            
-            # Skip if already in path (avoid cycles)
-            if next_concept in path:
-                # Choose an alternative that's not in the path
-                valid_actions = [a for a in self.env.get_valid_actions() if a not in path]
-                if not valid_actions:
-                    break  # No more options
-                next_concept = valid_actions[0]  # Take first valid action
-            
-            # Take action in environment
-            _, _, done = self.env.step(next_concept)
-            
-            # Add to path
-            path.append(next_concept)
-            step_count += 1
+        Returns:
+            PathIndex of the paths under the current Q-table
+        """
+        q_table = self.q_table
+        env = self._private_env()
+        return PathIndex.from_paths([_greedy_path(env, q_table, start) for start in range(self.num_states)])
+    
+    def _private_env(self):
+        """Environment identical to self.env that nothing else steps"""
+        return LearningEnvironment(self.env.concepts, np.array(self.env.difficulty), self.env.prerequisite_graph)
+    
+    def start_background_training(self, episodes=2000, num_envs=64, on_publish=None):
+        """
+        Train a copy of the policy in a background thread and publish it
+        
+        The copy trains with train_vectorized while this agent keeps serving
+        its current Q-table. When training finishes, the new policy is saved
+        (atomically, so readers never see a partial file) together with its
+        path index, and swapped in.
+        
+        Args:
+            episodes: Number of episodes to train
+            num_envs: Environments stepped together
+            on_publish: Optional callback run after the new policy is swapped in
             
-            # Stop if all concepts have been covered
-            if len(path) >= self.num_states:
-                break
+        Returns:
+            The training thread
+        """
+        if self._trainer is not None and self._trainer.is_alive():
+            return self._trainer
+        
+        def run():
+            try:
+                trainer = LearningPathRL(self.env, self.alpha, self.gamma, self.epsilon,
+                                         load_model=False, model_path=self.model_path,
+                                         legacy_model_path=None)
+                trainer.q_table = np.array(self.q_table)
+                trainer.train_vectorized(episodes, num_envs, save_model=False)
+                trainer._save_model(build_paths=True)
                 
-        return path
+                # Swap the finished table in with a single reference assignment;
+                # its path index follows and is ignored until the table matches
+                self.q_table = trainer.q_table
+                self._paths = trainer._paths
+                self.epsilon = trainer.epsilon
+                if on_publish is not None:
+                    on_publish()
+            except Exception as e:
+                print(f"Error in background training: {e}")
+        
+        self._trainer = threading.Thread(target=run, name="rl-trainer", daemon=True)
+        self._trainer.start()
+        return self._trainer
     
-    def _save_model(self, filepath='data/rl_model.pkl'):
-        """Save the trained model to disk"""
+    def _save_model(self, directory=None, build_paths=False):
+        """
+        Publish the trained model as a new policy snapshot (see policy_store)
+        
+        Args:
+            directory: Snapshot directory (model_path if omitted)
+            build_paths: Precompute the path index for the new table. Building
+                walks every start concept, so it is off by default and only
+                run from background training; an index already built for
+                this exact table is saved either way.
+        """
+        directory = directory or self.model_path
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            # Save model data
-            model_data = {
-                'q_table': self.q_table,
-                'env_concepts': self.env.concepts,
-                'env_difficulty': self.env.difficulty,
-                'env_prerequisites': self.env.prerequisites,
-                'params': {
+            # Serve learning paths from a lookup instead of stepping the environment
+            q_table = self.q_table
+            paths = self._paths[1] if self._paths is not None and self._paths[0] is q_table else None
+            if paths is None and build_paths:
+                paths = self.build_path_index()
+            version = save_policy_snapshot(
+                directory,
+                self.q_table,
+                self.env.concepts,
+                self.env.difficulty,
+                self.env.prerequisite_graph,
+                params={
                     'alpha': self.alpha,
                     'gamma': self.gamma,
                     'epsilon': self.epsilon
-                }
-            }
-            
-            with open(filepath, 'wb') as f:
-                pickle.dump(model_data, f)
-                
-            print(f"Model saved to {filepath}")
+                },
+                paths=paths
+            )
+            if paths is not None:
+                self._paths = (q_table, paths)
+            print(f"Model saved to {directory} (version {version})")
             
         except Exception as e:
             print(f"Error saving model: {e}")
     
-    def _load_model(self, filepath='data/rl_model.pkl'):
-        """Load a trained model from disk"""
+    def _load_model(self, directory=None):
+        """Load the published policy snapshot, migrating it if the concepts changed"""
+        directory = directory or self.model_path
         try:
-            if os.path.exists(filepath):
-                with open(filepath, 'rb') as f:
-                    model_data = pickle.load(f)
-                    
-                # Load model parameters
-                self.q_table = model_data['q_table']
-                
-                # Check if dimensions match
-                if self.q_table.shape != (self.num_states, self.num_actions):
-                    print("Model dimensions don't match, initializing new model")
-                    self.q_table = np.zeros((self.num_states, self.num_actions))
-                else:
-                    # Load environment parameters if needed
-                    if 'params' in model_data:
-                        self.alpha = model_data['params'].get('alpha', self.alpha)
-                        self.gamma = model_data['params'].get('gamma', self.gamma)
-                        self.epsilon = model_data['params'].get('epsilon', self.epsilon)
-                        print("Model loaded successfully")
+            snapshot = load_policy_snapshot(directory)
+            if snapshot is None:
+                snapshot = self._migrate_legacy_model(directory)
+            if snapshot is None:
+                return
+            
+            manifest = snapshot['manifest']
+            if manifest['concepts_hash'] == concepts_hash(self.env.concepts):
+                # Serve the memory-mapped, read-only table directly; training copies it
+                self.q_table = snapshot['q_table']
+                if snapshot['paths'] is not None:
+                    self._paths = (self.q_table, snapshot['paths'])
+                # The Q-values only make sense for the environment they were
+                # trained on, so restore it as well
+                self.env.difficulty = np.array(snapshot['difficulty'])
+                self.env.prerequisite_graph = snapshot['prerequisites']
+            else:
+                # Concepts were added, removed or reordered: carry the learned
+                # values over by concept name instead of starting from scratch
+                old_concepts = manifest['concepts']
+                self.q_table = migrate_matrix(snapshot['q_table'], old_concepts, self.env.concepts)
+                self.env.difficulty = migrate_vector(snapshot['difficulty'], old_concepts,
+                                                     self.env.concepts, self.env.difficulty)
+                self.env.prerequisite_graph = migrate_graph(snapshot['prerequisites'], old_concepts,
+                                                            self.env.concepts, self.env.prerequisite_graph)
+                shared = len(set(old_concepts) & set(self.env.concepts))
+                print(f"Migrated model from {len(old_concepts)} to {self.env.num_concepts} concepts "
+                      f"({shared} shared)")
+            
+            params = manifest.get('params', {})
+            self.alpha = params.get('alpha', self.alpha)
+            self.gamma = params.get('gamma', self.gamma)
+            self.epsilon = params.get('epsilon', self.epsilon)
+            print(f"Model loaded successfully (version {manifest['version']})")
         except Exception as e:
             print(f"Error loading model: {e}")
             print("Initializing new model")
+    
+    def _migrate_legacy_model(self, directory):
+        """
+        Convert a pickled model from older versions into the first snapshot
+        
+        Returns:
+            The new snapshot, or None if there is no legacy model
+        """
+        if not self.legacy_model_path or not os.path.exists(self.legacy_model_path):
+            return None
+        
+        with open(self.legacy_model_path, 'rb') as f:
+            model_data = pickle.load(f)
+        params = model_data.get('params', {})
+        save_policy_snapshot(directory, model_data['q_table'], model_data['env_concepts'],
+                             model_data['env_difficulty'], model_data['env_prerequisites'], params)
+        print(f"Converted {self.legacy_model_path} to a policy snapshot in {directory}")
+        return load_policy_snapshot(directory)
+    
+    def _writable_q_table(self):
+        """Copy a memory-mapped (read-only) Q-table before training updates it in place"""
+        if not self.q_table.flags.writeable:
+            self.q_table = np.array(self.q_table)
+        # Training changes the table in place, so its path index goes stale
+        self._paths = None
+
+def _greedy_path(env, q_table, start_concept):
+    """
+    Follow the greedy policy of a Q-table from a start concept
+    
+    Resets and steps `env`. Concepts already on the path are replaced by the
+    first valid concept not on it, and the walk stops once no such concept is
+    left, every concept is on the path, or after 2 x num_concepts steps.
+    
+    Returns:
+        List of concept indices
+    """
+    env.reset(start_concept)
+    path = [start_concept]
+    in_path = np.zeros(env.num_concepts, dtype=bool)
+    in_path[start_concept] = True
+    done = False
+    step_count = 0
+    
+    while not done and step_count < env.num_concepts * 2:  # Avoid infinite loops
+        # Greedy policy over the valid actions (see suggest_next_concept)
+        valid_mask = env.get_valid_action_mask()
+        if valid_mask.any():
+            next_concept = int(np.argmax(np.where(valid_mask, q_table[env.current_concept], -np.inf)))
+        else:
+            next_concept = int(np.argmax(env.mastery_levels))
+        
+        # Skip if already in path (avoid cycles)
+        if in_path[next_concept]:
+            # Choose an alternative that's not in the path
+            valid_actions = np.flatnonzero(valid_mask & ~in_path)
+            if len(valid_actions) == 0:
+                break  # No more options
+            next_concept = int(valid_actions[0])  # Take first valid action
+        
+        _, _, done = env.step(next_concept)
+        path.append(next_concept)
+        in_path[next_concept] = True
+        step_count += 1
+        
+        # Stop if all concepts have been covered
+        if len(path) >= env.num_concepts:
+            break
+    
+    return path
+
+def _train_worker(environment, q_table, params, episodes, num_envs, max_steps, seed):
+    """
+    Play a share of train_parallel's episodes in a worker process
+    
+    Returns:
+        Tuple of (Q-table, visit counts, episode rewards, final epsilon)
+    """
+    concepts, difficulty, prerequisites = environment
+    env = LearningEnvironment(concepts, difficulty, prerequisites)
+    alpha, gamma, epsilon = params
+    agent = LearningPathRL(env, alpha, gamma, epsilon, load_model=False, legacy_model_path=None)
+    agent.q_table = np.array(q_table)
+    visit_counts = np.zeros(agent.q_table.shape)
+    rewards = agent._run_vectorized(episodes, num_envs, max_steps, np.random.default_rng(seed), visit_counts)
+    return agent.q_table, visit_counts, rewards, agent.epsilon
 
 # Example usage:
 if __name__ == "__main__":
@@ -1,80 +1,151 @@
 import numpy as np
 
+def build_prerequisite_masks(num_concepts, prerequisites):
+    """
+    Precompute the prerequisites of every concept as an integer bitmask
+
+    Args:
+        num_concepts: Number of concepts in the curriculum
+        prerequisites: Dictionary mapping concept IDs (int or str) to their prerequisite IDs
+
+    Returns:
+        List with one bitmask per concept; bit i is set if concept i is a prerequisite
+    """
+    masks = [0] * num_concepts
+    # Prerequisites outside the curriculum can never be mastered
+    unreachable = 1 << num_concepts
+    for concept, prereqs in prerequisites.items():
+        concept = int(concept)
+        if not 0 <= concept < num_concepts:
+            continue
+        for prereq in prereqs:
+            prereq = int(prereq)
+            masks[concept] |= 1 << prereq if 0 <= prereq < num_concepts else unreachable
+    return masks
+
+def mask_to_vector(mask, num_concepts):
+    """Unpack a bitmask into a float vector with 1 for every set bit"""
+    packed = np.frombuffer(mask.to_bytes((num_concepts + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(packed, count=num_concepts, bitorder='little').astype(float)
+
+def iter_bits(mask):
+    """Yield the indices of the set bits of a mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
 class State:
-    """Representation of a learning state in the CS learning path"""
-    
-    def __init__(self, concepts, prerequisites, learner_profile):
+    """
+    Representation of a learning state in the CS learning path.
+
+    Mastered concepts are stored as bits of a Python int, so states are cheap to
+    copy, hash and compare and can key tabular Q-values. States derived with
+    with_mastered share the curriculum and the precomputed prerequisite masks.
+    """
+    __slots__ = ('concepts', 'prerequisites', 'learner_profile', 'learning_goal',
+                 'prerequisite_masks', 'mask', '_hash')
+
+    def __init__(self, concepts, prerequisites, learner_profile, prerequisite_masks=None):
         """
         Initialize a state representation
-        
+
         Args:
             concepts: List of concepts in the curriculum
             prerequisites: Dictionary mapping concepts to their prerequisites
             learner_profile: Profile of the learner including prior knowledge
+            prerequisite_masks: Masks from build_prerequisite_masks() to share between states
         """
         self.concepts = concepts
         self.prerequisites = prerequisites
         self.learner_profile = learner_profile
-        self.mastered_concepts = set(learner_profile.get('mastered_concepts', []))
         self.learning_goal = learner_profile.get('learning_goal', None)
-        
-        # Build state vector
-        self.state_vector = self._build_state_vector()
-        
-    def _build_state_vector(self):
-        """Build a vector representation of the state"""
-        # Initialize a vector with 0s for each concept (0 = not mastered)
-        vector = np.zeros(len(self.concepts))
-        
-        # Set mastered concepts to 1
-        for concept_id in self.mastered_concepts:
-            if 0 <= concept_id < len(self.concepts):
-                vector[concept_id] = 1
-                
-        return vector
-        
+        if prerequisite_masks is None:
+            prerequisite_masks = build_prerequisite_masks(len(concepts), prerequisites)
+        self.prerequisite_masks = prerequisite_masks
+
+        self.mask = 0
+        for concept_id in learner_profile.get('mastered_concepts', []):
+            if 0 <= concept_id < len(concepts):
+                self.mask |= 1 << concept_id
+        self._hash = None
+
+    @property
+    def mastered_concepts(self):
+        """Set of mastered concept IDs (a new set; use update or with_mastered to change it)"""
+        return set(iter_bits(self.mask))
+
+    @property
+    def state_vector(self):
+        """Vector representation of the state: 1 for mastered concepts, 0 otherwise"""
+        return mask_to_vector(self.mask, len(self.concepts))
+
+    def is_mastered(self, concept_id):
+        """Check whether a concept has been mastered (False for anything but a valid concept ID)"""
+        if not isinstance(concept_id, (int, np.integer)) or concept_id < 0:
+            return False
+        return (self.mask >> int(concept_id)) & 1 == 1
+
+    def prerequisites_met(self, concept_id):
+        """Check whether all prerequisites of a concept are mastered"""
+        return self.prerequisite_masks[concept_id] & ~self.mask == 0
+
     def update(self, mastered_concept):
         """
         Update the state after a concept has been mastered
-        
+
         Args:
             mastered_concept: ID of the newly mastered concept
         """
         if 0 <= mastered_concept < len(self.concepts):
-            self.mastered_concepts.add(mastered_concept)
-            self.state_vector[mastered_concept] = 1
-            
+            self.mask |= 1 << mastered_concept
+            self._hash = None
+
+    def with_mastered(self, mastered_concept):
+        """
+        New state with one more concept mastered; this state is left unchanged
+
+        Args:
+            mastered_concept: ID of the newly mastered concept
+        """
+        state = self.copy()
+        state.update(mastered_concept)
+        return state
+
+    def copy(self):
+        """Copy of the state sharing the curriculum and prerequisite masks"""
+        state = State.__new__(State)
+        for slot in State.__slots__:
+            setattr(state, slot, getattr(self, slot))
+        return state
+
     def get_available_concepts(self):
         """
         Get concepts that are available to learn based on prerequisites
-        
+
         Returns:
             List of available concept IDs
         """
-        available = []
-        
-        for concept_id in range(len(self.concepts)):
-            # Skip already mastered concepts
-            if concept_id in self.mastered_concepts:
-                continue
-                
-            # Check if all prerequisites are mastered
-            prereqs_mastered = True
-            for prereq in self.prerequisites.get(str(concept_id), []):
-                if int(prereq) not in self.mastered_concepts:
-                    prereqs_mastered = False
-                    break
-                    
-            if prereqs_mastered:
-                available.append(concept_id)
-                
-        return available
-        
+        mask = self.mask
+        masks = self.prerequisite_masks
+        return [concept_id for concept_id in range(len(self.concepts))
+                if not (mask >> concept_id) & 1 and masks[concept_id] & ~mask == 0]
+
     def is_terminal(self):
         """Check if the state is terminal (learning goal achieved)"""
         if self.learning_goal is None:
             # If no specific goal, check if all concepts are mastered
-            return len(self.mastered_concepts) == len(self.concepts)
+            return self.mask == (1 << len(self.concepts)) - 1
         else:
             # Check if learning goal is mastered
-            return self.learning_goal in self.mastered_concepts
+            return self.is_mastered(self.learning_goal)
+
+    def __eq__(self, other):
+        if not isinstance(other, State):
+            return NotImplemented
+        return self.mask == other.mask and (self.concepts is other.concepts or self.concepts == other.concepts)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self.mask)
+        return self._hash
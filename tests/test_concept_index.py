@@ -0,0 +1,22 @@
+import unittest
+from src.concept_index import ConceptIndex, tokenize
+
+class TestConceptIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = ConceptIndex(["tree", "binary tree", "hash table", "data structures", "API"])
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Hash Tables!"), ["hash", "table"])
+
+    def test_postings(self):
+        self.assertEqual(self.index.get_postings("tree"), [0, 1])
+        self.assertEqual(self.index.get_postings("binary tree"), [1])
+
+    def test_search_ranking(self):
+        self.assertEqual(self.index.search("how do hash tables work"), ["hash table"])
+        self.assertEqual(self.index.search("binary trees"), ["binary tree"])
+        self.assertEqual(self.index.search("tree"), ["tree", "binary tree"])
+        self.assertEqual(self.index.search("what is it"), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+from src.concept_matcher import ConceptMatcher
+
+class TestConceptMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = ConceptMatcher(
+            ["tree", "binary tree", "graph", "graph theory", "API"],
+            synonyms={"bst": "binary tree"}
+        )
+
+    def test_prefers_longest_match(self):
+        self.assertEqual(self.matcher.find_best("what is a binary tree"), "binary tree")
+        self.assertEqual(self.matcher.find_best("intro to graph theory"), "graph theory")
+
+    def test_finds_all_mentions(self):
+        matches = self.matcher.find_all("compare a tree and a graph")
+        self.assertEqual([concept for _, _, concept in matches], ["tree", "graph"])
+
+    def test_word_boundaries(self):
+        self.assertEqual(self.matcher.find_best("binary trees"), "binary tree")
+        self.assertIsNone(self.matcher.find_best("street"))
+        self.assertEqual(self.matcher.find_best("rest api design"), "API")
+
+    def test_synonyms(self):
+        self.assertEqual(self.matcher.find_best("how does a bst work"), "binary tree")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+import unittest
+import networkx as nx
+from src.knowledge_registry import clear_registry
+from knowledge_graph import KnowledgeFrontier, KnowledgeGraph
+
+KNOWLEDGE = {
+    "variables": {"definition": "Named storage", "prerequisites": []},
+    "loops": {"definition": "Repetition", "prerequisites": ["variables"]},
+    "recursion": {"definition": "Self reference", "prerequisites": ["loops"]},
+    "trees": {"definition": "Hierarchies", "prerequisites": ["recursion", "variables"]}
+}
+
+class TestKnowledgeGraphMetrics(unittest.TestCase):
+    def setUp(self):
+        clear_registry()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.knowledge_file = os.path.join(self.temp_dir.name, "knowledge.json")
+        self._write(KNOWLEDGE)
+        self.graph = KnowledgeGraph(knowledge_path=self.knowledge_file)
+
+    def tearDown(self):
+        clear_registry()
+        self.temp_dir.cleanup()
+
+    def _write(self, knowledge):
+        with open(self.knowledge_file, 'w') as file:
+            json.dump(knowledge, file)
+
+    def test_metrics_match_networkx(self):
+        centrality = nx.degree_centrality(self.graph.graph)
+        for concept in KNOWLEDGE:
+            self.assertAlmostEqual(self.graph.get_concept_centrality(concept), centrality[concept])
+            self.assertEqual(self.graph.get_dependent_count(concept),
+                             len(nx.descendants(self.graph.graph, concept)))
+        self.assertEqual(self.graph.get_concept_depth("trees"), 3)
+        self.assertEqual(self.graph.get_in_degree("trees"), 2)
+        self.assertEqual(self.graph.get_out_degree("variables"), 2)
+        self.assertEqual(self.graph.get_concept_centrality("unknown"), 0)
+
+    def test_metrics_follow_reload(self):
+        metrics = self.graph.metrics
+        self.assertIs(self.graph.metrics, metrics)
+
+        knowledge = dict(KNOWLEDGE, graphs={"definition": "Networks", "prerequisites": ["trees"]})
+        self._write(knowledge)
+        os.utime(self.knowledge_file, (os.path.getmtime(self.knowledge_file) + 10,) * 2)
+        self.graph.knowledge_manager.reload()
+        self.assertIsNot(self.graph.metrics, metrics)
+        self.assertEqual(self.graph.get_concept_depth("graphs"), 4)
+        self.assertEqual(self.graph.get_dependent_count("variables"), 4)
+
+    def _rescan_frontier(self, mastered):
+        """Frontier as originally defined: successors of mastered concepts with all prerequisites mastered"""
+        graph = self.graph.graph
+        return {succ for concept in mastered for succ in graph.successors(concept)
+                if all(prereq in mastered for prereq in graph.predecessors(succ))}
+
+    def test_frontier_tracks_mastery(self):
+        frontier = KnowledgeFrontier(self.graph)
+        self.assertEqual(frontier.concepts(), [])
+        mastered = set()
+        for concept in ["variables", "loops", "recursion", "trees"]:
+            frontier.master(concept)
+            mastered.add(concept)
+            self.assertEqual(set(frontier.concepts()), self._rescan_frontier(mastered))
+            self.assertEqual(set(self.graph.get_knowledge_frontier(mastered)), self._rescan_frontier(mastered))
+        self.assertIn("trees", frontier)
+        self.assertNotIn("variables", frontier)
+        self.assertNotIn("unknown", frontier)
+
+        frontier.forget("recursion")
+        self.assertNotIn("trees", frontier)
+        frontier.update(["variables"])
+        self.assertEqual(frontier.concepts(), ["loops"])
+
+    def test_frontier_follows_reload(self):
+        frontier = KnowledgeFrontier(self.graph, ["variables", "loops", "recursion", "trees"])
+        knowledge = dict(KNOWLEDGE, graphs={"definition": "Networks", "prerequisites": ["trees"]})
+        self._write(knowledge)
+        os.utime(self.knowledge_file, (os.path.getmtime(self.knowledge_file) + 10,) * 2)
+        self.graph.knowledge_manager.reload()
+        self.assertIn("graphs", frontier)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,10 @@
+import json
+import os
+import tempfile
 import unittest
+from unittest import mock
 from src.knowledge_manager import KnowledgeManager
+from src.knowledge_store import KnowledgeStore
 
 class TestKnowledgeManager(unittest.TestCase):
     def setUp(self):
@@ -18,5 +23,55 @@ class TestKnowledgeManager(unittest.TestCase):
         # Test querying the knowledge base
         pass
 
+class TestKnowledgeReload(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.knowledge_file = os.path.join(self.temp_dir.name, "knowledge.json")
+        self._write({"stack": {"definition": "LIFO"}, "queue": {"definition": "FIFO"}})
+        self.km = KnowledgeManager(self.knowledge_file, None)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, knowledge):
+        with open(self.knowledge_file, 'w') as file:
+            json.dump(knowledge, file)
+        # Make sure the modification is visible even on coarse mtime filesystems
+        mtime = os.path.getmtime(self.knowledge_file) + getattr(self, "_bump", 0)
+        os.utime(self.knowledge_file, (mtime, mtime))
+        self._bump = getattr(self, "_bump", 0) + 10
+
+    def test_reload_reports_changed_concepts(self):
+        changes = []
+        self.km.add_reload_listener(changes.append)
+        old_snapshot = self.km.snapshot
+        self._write({"stack": {"definition": "Last in, first out"}, "queue": {"definition": "FIFO"}, "heap": {}})
+
+        self.assertTrue(self.km.is_stale())
+        self.assertEqual(self.km.reload(), {"stack", "heap"})
+        self.assertEqual(changes, [{"stack", "heap"}])
+        self.assertEqual(self.km.get_concept("stack")["definition"], "Last in, first out")
+        # The old snapshot is untouched for anyone still using it
+        self.assertEqual(old_snapshot.knowledge_base["stack"]["definition"], "LIFO")
+
+    def test_reload_closes_superseded_store(self):
+        old_store = self.km.knowledge_base
+        self._write({"stack": {"definition": "LIFO"}})
+        self.assertEqual(self.km.reload(), {"queue"})
+        self.assertTrue(old_store.closed)
+        self.assertFalse(self.km.knowledge_base.closed)
+
+    def test_startup_does_not_hash_concepts(self):
+        with mock.patch.object(KnowledgeStore, "fingerprint", side_effect=AssertionError("hashed")):
+            km = KnowledgeManager(self.knowledge_file, None)
+            self.assertEqual(km.get_concept("stack")["definition"], "LIFO")
+
+    def test_invalid_file_keeps_previous_snapshot(self):
+        with open(self.knowledge_file, 'w') as file:
+            file.write("{not json")
+        os.utime(self.knowledge_file, (1, 1))
+        self.assertEqual(self.km.reload(), set())
+        self.assertEqual(self.km.get_all_concepts(), ["stack", "queue"])
+
 if __name__ == "__main__":
     unittest.main()
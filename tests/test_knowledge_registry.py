@@ -0,0 +1,37 @@
+import json
+import os
+import tempfile
+import unittest
+from src.knowledge_registry import get_knowledge_manager, clear_registry
+
+class TestKnowledgeRegistry(unittest.TestCase):
+    def setUp(self):
+        clear_registry()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.knowledge_file = os.path.join(self.temp_dir.name, "knowledge.json")
+        self._write({"stack": {"definition": "LIFO"}})
+
+    def tearDown(self):
+        clear_registry()
+        self.temp_dir.cleanup()
+
+    def _write(self, knowledge, mtime=None):
+        with open(self.knowledge_file, 'w') as file:
+            json.dump(knowledge, file)
+        if mtime is not None:
+            os.utime(self.knowledge_file, (mtime, mtime))
+
+    def test_same_instance(self):
+        first = get_knowledge_manager(self.knowledge_file, None)
+        second = get_knowledge_manager(self.knowledge_file, None)
+        self.assertIs(first, second)
+
+    def test_reload_on_modification(self):
+        first = get_knowledge_manager(self.knowledge_file, None)
+        self._write({"queue": {"definition": "FIFO"}}, mtime=os.path.getmtime(self.knowledge_file) + 10)
+        second = get_knowledge_manager(self.knowledge_file, None)
+        self.assertIs(first, second)
+        self.assertEqual(second.get_all_concepts(), ["queue"])
+
+if __name__ == "__main__":
+    unittest.main()
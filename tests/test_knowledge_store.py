@@ -0,0 +1,39 @@
+import json
+import os
+import tempfile
+import unittest
+from src.knowledge_store import compile_knowledge_base, open_knowledge_store, KnowledgeStore
+
+class TestKnowledgeStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.knowledge_file = os.path.join(self.temp_dir.name, "knowledge.json")
+        self.knowledge = {
+            "recursion": {
+                "definition": "A function calling itself.",
+                "complexity_levels": {"beginner": "Répéter"},
+                "examples": [{"name": "Factorial"}]
+            },
+            "API": {"definition": "Interface", "difficulty": None}
+        }
+        with open(self.knowledge_file, 'w') as file:
+            json.dump(self.knowledge, file)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        with KnowledgeStore(compile_knowledge_base(self.knowledge_file)) as store:
+            self.assertEqual(store.keys(), ["recursion", "API"])
+            self.assertEqual(store.to_dict(), self.knowledge)
+        self.assertTrue(store.closed)
+
+    def test_lazy_record(self):
+        record = open_knowledge_store(self.knowledge_file)["API"]
+        self.assertEqual(record["definition"], "Interface")
+        self.assertIsNone(record["difficulty"])
+        self.assertNotIn("examples", record)
+        self.assertEqual(record.get("examples", []), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+from src_ai.policy_store import migrate_graph
+from src.prerequisite_graph import PrerequisiteGraph
+
+class TestPrerequisiteGraph(unittest.TestCase):
+    def setUp(self):
+        # 1 needs 0; 2 needs 0 and 1; 3 needs 2
+        self.graph = PrerequisiteGraph.from_lists(4, {2: [1, 0], 1: [0], 3: [2, 2]})
+
+    def test_forward_and_reverse_index(self):
+        self.assertEqual(self.graph.num_edges, 4)
+        self.assertEqual(self.graph.prerequisites_of(2).tolist(), [0, 1])
+        self.assertEqual(self.graph.dependents_of(0).tolist(), [1, 2])
+        self.assertEqual(self.graph.counts.tolist(), [0, 1, 2, 1])
+        self.assertEqual(self.graph.indices.dtype, np.int32)
+
+    def test_dense_round_trip(self):
+        dense = self.graph.to_dense()
+        self.assertEqual(dense[2, 1], 1)
+        rebuilt = PrerequisiteGraph.from_dense(dense)
+        np.testing.assert_array_equal(rebuilt.indptr, self.graph.indptr)
+        np.testing.assert_array_equal(rebuilt.indices, self.graph.indices)
+
+    def test_gather_and_count(self):
+        owners, dependents = self.graph.gather_dependents([2, 0])
+        self.assertEqual(owners.tolist(), [0, 1, 1])
+        self.assertEqual(dependents.tolist(), [3, 1, 2])
+        satisfied = np.array([True, False, True, False])
+        self.assertEqual(self.graph.count_met(satisfied).tolist(), [0, 1, 1, 1])
+
+    def test_migrate_by_concept_name(self):
+        old_concepts = ["arrays", "recursion", "trees", "graphs"]
+        new_concepts = ["graphs", "trees", "heaps", "arrays"]
+        # In the new environment, heaps needs trees and graphs needs heaps
+        base = PrerequisiteGraph.from_lists(4, {2: [1], 0: [2], 1: [3]})
+        migrated = migrate_graph(self.graph, old_concepts, new_concepts, base)
+        # Edges between shared concepts come from the old graph (recursion is
+        # gone), edges touching heaps come from the base
+        self.assertEqual(migrated.prerequisites_of(0).tolist(), [1, 2])
+        self.assertEqual(migrated.prerequisites_of(1).tolist(), [3])
+        self.assertEqual(migrated.prerequisites_of(2).tolist(), [1])
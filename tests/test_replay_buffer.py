@@ -0,0 +1,99 @@
+import unittest
+import numpy as np
+import experience_replay
+from replay_buffer import PrioritizedReplayBuffer, ReplayBuffer, SumTree
+from rl_agent import RLAgent
+from src_ai.reinforcement_learning import LearningEnvironment
+from train import train
+
+class TestReplayBuffer(unittest.TestCase):
+    def test_ring_buffer_overwrites_oldest(self):
+        buffer = ReplayBuffer(capacity=4, seed=0)
+        for i in range(6):
+            buffer.push(i, i % 2, float(i), i + 1, i == 5)
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(sorted(buffer.states.tolist()), [2, 3, 4, 5])
+
+        states, actions, rewards, next_states, dones = buffer.sample(3)
+        self.assertEqual(states.shape, (3,))
+        self.assertEqual(len(set(states.tolist())), 3)
+        np.testing.assert_array_equal(next_states, states + 1)
+        np.testing.assert_array_equal(rewards, states.astype(float))
+        np.testing.assert_array_equal(dones, states == 5)
+        self.assertEqual(len(buffer.sample(10)[0]), 4)
+
+    def test_push_batch_wraps(self):
+        buffer = ReplayBuffer(capacity=5)
+        buffer.push_batch(np.zeros((3, 2)), [0, 1, 2], [0.0] * 3, np.ones((3, 2)), [False] * 3)
+        indices = buffer.push_batch(np.full((4, 2), 7.0), [3] * 4, [1.0] * 4, np.ones((4, 2)), [True] * 4)
+        np.testing.assert_array_equal(indices, [3, 4, 0, 1])
+        self.assertEqual(len(buffer), 5)
+        self.assertEqual(buffer.position, 2)
+        np.testing.assert_array_equal(buffer.actions, [3, 3, 2, 3, 3])
+
+    def test_experience_replay_reexport(self):
+        self.assertIs(experience_replay.ReplayBuffer, ReplayBuffer)
+
+class TestPrioritizedReplay(unittest.TestCase):
+    def test_sum_tree(self):
+        tree = SumTree(5)
+        tree.update(np.arange(5), [1.0, 2.0, 3.0, 4.0, 0.0])
+        tree.update(2, 0.5)
+        self.assertAlmostEqual(tree.total, 7.5)
+        np.testing.assert_array_equal(tree.find([0.0, 0.99, 1.0, 3.2, 3.6, 7.4]), [0, 0, 1, 2, 3, 3])
+        np.testing.assert_array_equal(tree.get([2, 4]), [0.5, 0.0])
+
+    def test_sampling_follows_priorities(self):
+        buffer = PrioritizedReplayBuffer(capacity=8, alpha=1.0, beta=0.5, beta_increment=0.25, seed=0)
+        for i in range(4):
+            buffer.push(i, 0, 0.0, i, False)
+        buffer.update_priorities(np.arange(4), np.array([1.0, 0.0, 0.0, 3.0]))
+        self.assertEqual(buffer.max_priority, 3.0 + buffer.epsilon)
+
+        states, _, _, _, _, indices, weights = buffer.sample(400)
+        np.testing.assert_array_equal(states, indices)
+        counts = np.bincount(indices, minlength=4)
+        self.assertEqual(counts[1] + counts[2], 0)
+        self.assertAlmostEqual(counts[3] / counts[0], 3.0, delta=0.3)
+        # The rarer experience gets the larger importance-sampling weight
+        self.assertEqual(weights.max(), 1.0)
+        self.assertGreater(weights[indices == 0][0], weights[indices == 3][0])
+        self.assertEqual(buffer.beta, 0.75)
+
+    def test_train_with_prioritized_replay(self):
+        np.random.seed(0)
+        env = LearningEnvironment(concepts=[f"concept {i}" for i in range(6)])
+        agent = RLAgent(state_size=6, action_size=6, epsilon=0.5)
+        buffer = PrioritizedReplayBuffer(capacity=100, seed=0)
+        rewards = train(agent, env, episodes=5, batch_size=4, replay_buffer=buffer, verbose=False)
+        self.assertEqual(len(rewards), 5)
+        self.assertGreater(len(buffer), 4)
+        self.assertTrue(np.any(agent.q_table != 0))
+
+class TestBatchUpdate(unittest.TestCase):
+    def test_update_batch_matches_sequential_updates(self):
+        batched = RLAgent(state_size=4, action_size=4)
+        sequential = RLAgent(state_size=4, action_size=4)
+        rng = np.random.default_rng(0)
+        batched.q_table = rng.random((4, 4))
+        sequential.q_table = batched.q_table.copy()
+
+        # Distinct state-action pairs whose next states are not updated in the batch
+        states, actions, next_states = [0, 0, 1], [1, 2, 3], [2, 3, 3]
+        rewards, dones = [1.0, 0.5, -1.0], [False, True, False]
+        sequential_q = sequential.q_table.copy()
+        for s, a, r, ns, d in zip(states, actions, rewards, next_states, dones):
+            target = r + (0 if d else sequential.gamma * np.max(sequential_q[ns]))
+            sequential.q_table[s][a] += sequential.alpha * (target - sequential.q_table[s][a])
+
+        batched.update_batch(states, actions, rewards, next_states, dones)
+        np.testing.assert_allclose(batched.q_table, sequential.q_table)
+
+    def test_update_batch_averages_duplicate_pairs(self):
+        agent = RLAgent(state_size=2, action_size=2, alpha=1.0)
+        td_errors = agent.update_batch([0, 0], [1, 1], [1.0, 3.0], [1, 1], [True, True])
+        np.testing.assert_allclose(td_errors, [1.0, 3.0])
+        self.assertAlmostEqual(agent.q_table[0, 1], 2.0)
+
+if __name__ == "__main__":
+    unittest.main()
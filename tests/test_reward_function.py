@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.knowledge_registry import clear_registry
+from knowledge_graph import KnowledgeGraph
+from reward_function import RewardFunction
+
+KNOWLEDGE = {
+    "variables": {"definition": "Named storage", "prerequisites": [], "difficulty": 1},
+    "loops": {"definition": "Repetition", "prerequisites": ["variables"], "difficulty": 2,
+              "examples": ["A flow diagram of a for loop"]},
+    "recursion": {"definition": "Self reference", "prerequisites": ["loops"], "difficulty": 3,
+                  "examples": [{"name": "Factorial", "description": "A recursive implementation"}]},
+    "trees": {"definition": "Hierarchies", "prerequisites": ["recursion", "variables"], "difficulty": 4}
+}
+
+class State:
+    def __init__(self, mastered_concepts, terminal=False):
+        self.mastered_concepts = mastered_concepts
+        self.terminal = terminal
+
+    def is_terminal(self):
+        return self.terminal
+
+class TestRewardFunction(unittest.TestCase):
+    def setUp(self):
+        clear_registry()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        knowledge_file = os.path.join(self.temp_dir.name, "knowledge.json")
+        with open(knowledge_file, 'w') as file:
+            json.dump(KNOWLEDGE, file)
+        self.graph = KnowledgeGraph(knowledge_path=knowledge_file)
+        self.reward_function = RewardFunction(self.graph, {'learning_style': 'visual'})
+
+    def tearDown(self):
+        clear_registry()
+        self.temp_dir.cleanup()
+
+    def test_calculate_reward(self):
+        # Unmet prerequisite: penalty scaled by the default risk tolerance
+        self.assertEqual(self.reward_function.calculate_reward(State(["variables"]), "trees", State([])), -2.5)
+
+        # 1 / (2 + 0.1) base, visual example, centrality 2/3, frontier, one dependent
+        reward = self.reward_function.calculate_reward(State(["variables"]), "loops", State([]))
+        self.assertAlmostEqual(reward, 1 / 2.1 + 2.0 + 3.0 * 2 / 3 + 2.0 + 0.2)
+
+        # No prerequisites, so never on the frontier; terminal bonus added
+        reward = self.reward_function.calculate_reward(State([]), "variables", State([], terminal=True))
+        self.assertAlmostEqual(reward, 1 / 1.1 + 3.0 * 2 / 3 + 0.4 + 10.0)
+
+    def test_calculate_rewards_matches_single(self):
+        states = [State([]), State(["variables"]), State(["variables", "loops"]), State(["variables", "recursion"])]
+        actions = ["loops", "loops", "recursion", "trees"]
+        terminal = [False, False, True, False]
+        expected = [self.reward_function.calculate_reward(state, action, State([], done))
+                    for state, action, done in zip(states, actions, terminal)]
+        np.testing.assert_allclose(self.reward_function.calculate_rewards(states, actions, terminal), expected)
+
+        # Mastery matrix and node ID form
+        node_ids = self.graph.metrics.node_ids
+        mastered = np.zeros((len(states), len(node_ids)), dtype=bool)
+        for row, state in enumerate(states):
+            mastered[row, [node_ids[concept] for concept in state.mastered_concepts]] = True
+        rewards = self.reward_function.calculate_rewards(mastered, [node_ids[action] for action in actions], terminal)
+        np.testing.assert_allclose(rewards, expected)
+
+    def test_tables_per_profile(self):
+        visual = self.reward_function.get_reward_table()
+        self.assertIs(self.reward_function.get_reward_table(), visual)
+        self.reward_function.learner_profile['learning_style'] = 'practical'
+        practical = self.reward_function.get_reward_table()
+        ids = self.graph.metrics.node_ids
+        self.assertTrue(visual.style_match[ids["loops"]])
+        self.assertFalse(practical.style_match[ids["loops"]])
+        self.assertTrue(practical.style_match[ids["recursion"]])
+
+if __name__ == "__main__":
+    unittest.main()
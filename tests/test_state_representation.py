@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+from state_representation import State, build_prerequisite_masks
+
+CONCEPTS = ["variables", "loops", "recursion", "trees", "graphs"]
+PREREQUISITES = {"1": ["0"], "2": ["1"], "3": ["2", "0"], "4": ["3", "9"]}
+
+class TestState(unittest.TestCase):
+    def setUp(self):
+        self.state = State(CONCEPTS, PREREQUISITES, {'mastered_concepts': [0, 7]})
+
+    def test_prerequisite_masks(self):
+        masks = build_prerequisite_masks(len(CONCEPTS), PREREQUISITES)
+        self.assertEqual(masks[:4], [0, 0b1, 0b10, 0b101])
+        # Concept 9 is outside the curriculum, so graphs can never be unlocked
+        self.assertTrue(masks[4] >> len(CONCEPTS))
+
+    def test_available_concepts(self):
+        self.assertEqual(self.state.mastered_concepts, {0})
+        self.assertEqual(self.state.get_available_concepts(), [1])
+        self.state.update(1)
+        self.state.update(2)
+        self.assertEqual(self.state.get_available_concepts(), [3])
+        self.state.update(3)
+        self.assertEqual(self.state.get_available_concepts(), [])
+        np.testing.assert_array_equal(self.state.state_vector, [1, 1, 1, 1, 0])
+
+    def test_copy_on_write_and_hashing(self):
+        next_state = self.state.with_mastered(1)
+        self.assertEqual(self.state.mastered_concepts, {0})
+        self.assertEqual(next_state.mastered_concepts, {0, 1})
+        self.assertIs(next_state.prerequisite_masks, self.state.prerequisite_masks)
+
+        q_values = {next_state: 1.0}
+        self.assertEqual(q_values[self.state.with_mastered(1)], 1.0)
+        self.assertNotIn(self.state, q_values)
+
+    def test_terminal(self):
+        state = State(CONCEPTS, PREREQUISITES, {'mastered_concepts': [0, 1, 2, 3]})
+        self.assertFalse(state.is_terminal())
+        self.assertTrue(state.with_mastered(4).is_terminal())
+        goal_state = State(CONCEPTS, PREREQUISITES, {'learning_goal': 2})
+        self.assertTrue(goal_state.with_mastered(2).is_terminal())
+
+    def test_is_mastered_rejects_non_ids(self):
+        self.assertTrue(self.state.is_mastered(np.int64(0)))
+        self.assertFalse(self.state.is_mastered(-1))
+        self.assertFalse(self.state.is_mastered("0"))
+        self.assertFalse(self.state.is_mastered(None))
+        self.assertFalse(State(CONCEPTS, PREREQUISITES, {'learning_goal': "recursion"}).is_terminal())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src_ai.ai_visualizations import AIDrivenVisualizer, render_chart, render_learning_path
+from src_ai.cache import RenderCache
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+class TestRendering(unittest.TestCase):
+    def test_render_chart_types(self):
+        data = np.linspace(0.1, 0.9, 16)
+        for chart_type in ("progress", "comparison", "concept_map", "difficulty"):
+            png = render_chart(data, chart_type=chart_type, labels=[f"c{i}" for i in range(16)])
+            self.assertTrue(png.startswith(PNG_SIGNATURE), chart_type)
+
+    def test_render_learning_path(self):
+        png = render_learning_path(["a", "b", "c"], [0.2, 0.5, 0.9], knowledge_level=0.4)
+        self.assertTrue(png.startswith(PNG_SIGNATURE))
+
+class TestRenderPool(unittest.TestCase):
+    def test_inline_rendering(self):
+        visualizer = AIDrivenVisualizer(max_workers=0)
+        future = visualizer.submit_plot([1, 2, 3], title="Inline")
+        self.assertTrue(future.result().startswith(PNG_SIGNATURE))
+
+    def test_worker_pool_matches_inline(self):
+        visualizer = AIDrivenVisualizer(max_workers=2)
+        try:
+            futures = [visualizer.submit_plot([1, 2, i], title=f"Chart {i}") for i in range(3, 6)]
+            futures.append(visualizer.submit_learning_path(["a", "b"], [0.3, 0.6]))
+            results = [future.result(timeout=120) for future in futures]
+        finally:
+            visualizer.close()
+        self.assertEqual(results[0], render_chart(np.asarray([1, 2, 3]), title="Chart 3"))
+        self.assertTrue(results[-1].startswith(PNG_SIGNATURE))
+
+class TestRenderCache(unittest.TestCase):
+    def test_repeated_chart_served_from_cache(self):
+        visualizer = AIDrivenVisualizer(max_workers=0)
+        first = visualizer.submit_learning_path(["a", "b"], [0.3, 0.6], knowledge_level=0.5).result()
+        second = visualizer.submit_learning_path(["a", "b"], [0.3, 0.6], knowledge_level=0.5).result()
+        self.assertEqual(first, second)
+        self.assertEqual(visualizer.render_cache.stats()['hits'], 1)
+
+        # Any change to the inputs is a different chart
+        visualizer.submit_learning_path(["a", "b"], [0.3, 0.6], knowledge_level=0.8).result()
+        visualizer.submit_plot([0.3, 0.6], labels=["a", "b"]).result()
+        self.assertEqual(len(visualizer.render_cache), 3)
+
+    def test_disk_tier_and_byte_budget(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = RenderCache(max_bytes=10, directory=cache_dir)
+            cache.set("a" * 64, b"123456")
+            cache.set("b" * 64, b"7890ab")
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(cache.stats()['evictions'], 1)
+            # The evicted image is still on disk
+            self.assertEqual(RenderCache(directory=cache_dir).get("a" * 64), b"123456")
+
+    def test_disk_tier_byte_budget(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = RenderCache(directory=cache_dir, max_disk_bytes=10)
+            cache.set("a" * 64, b"123456")
+            cache.set("b" * 64, b"7890ab")
+            self.assertEqual(sorted(os.listdir(cache_dir)), ["b" * 64 + ".png"])
+            self.assertEqual(cache.stats()['disk_bytes'], 6)
+
+            # Files left by an earlier run count against the budget, oldest first
+            os.utime(os.path.join(cache_dir, "b" * 64 + ".png"), (1, 1))
+            with open(os.path.join(cache_dir, "c" * 64 + ".png"), 'wb') as f:
+                f.write(b"cdefgh")
+            os.utime(os.path.join(cache_dir, "c" * 64 + ".png"), (2, 2))
+            RenderCache(directory=cache_dir, max_disk_bytes=10)
+            self.assertEqual(sorted(os.listdir(cache_dir)), ["c" * 64 + ".png"])
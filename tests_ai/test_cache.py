@@ -0,0 +1,77 @@
+import os
+import tempfile
+import time
+import unittest
+from src_ai.cache import LRUCache, SQLiteStore
+
+class TestLRUCache(unittest.TestCase):
+    def test_size_eviction(self):
+        cache = LRUCache(max_size=2, ttl=None)
+        cache.set(("stack", "beginner"), "a")
+        cache.set(("queue", "beginner"), "b")
+        cache.get(("stack", "beginner"))
+        cache.set(("heap", "beginner"), "c")
+
+        self.assertIsNone(cache.get(("queue", "beginner")))
+        self.assertEqual(cache.get(("stack", "beginner")), "a")
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (2, 1, 1))
+
+    def test_ttl_expiry(self):
+        cache = LRUCache(max_size=2, ttl=0.01)
+        cache.set("key", "value")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+    def test_invalidate(self):
+        cache = LRUCache()
+        cache.set(("stack", "beginner"), "a")
+        cache.set(("queue", "advanced"), "b")
+        self.assertEqual(cache.invalidate(lambda key: key[0] == "stack"), 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_persistent_tier(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache.sqlite")
+            first = LRUCache(store=SQLiteStore(path))
+            first.set(("stack", "beginner"), "a")
+            first.store.close()
+
+            second = LRUCache(store=SQLiteStore(path))
+            self.assertEqual(second.get(("stack", "beginner")), "a")
+            second.invalidate(lambda key: key[0] == "stack")
+            self.assertEqual(len(second.store), 0)
+            second.store.close()
+
+class TestSQLiteStore(unittest.TestCase):
+    def test_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SQLiteStore(os.path.join(temp_dir, "store.sqlite"), max_entries=2)
+            store.set("a", 1)
+            time.sleep(0.01)
+            store.set("b", 2)
+            time.sleep(0.01)
+            store.get("a")
+            store.set("c", 3)
+            self.assertEqual(sorted(store.keys()), ["a", "c"])
+            store.close()
+
+    def test_expired_entries_purged(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "store.sqlite")
+            store = SQLiteStore(path, max_age=0.05)
+            store.set("old", 1)
+            time.sleep(0.1)
+            # Purged on write without ever being read
+            store.set("new", 2)
+            self.assertEqual(store.keys(), ["new"])
+            store.close()
+
+            time.sleep(0.1)
+            store = SQLiteStore(path, max_age=0.05)
+            self.assertEqual(len(store), 0)
+            store.close()
+
+if __name__ == "__main__":
+    unittest.main()
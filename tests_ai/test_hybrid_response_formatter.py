@@ -0,0 +1,44 @@
+import unittest
+from src_ai.hybrid_response_formatter import HybridResponseFormatter
+
+ANSWER = "A stack is a last-in first-out collection where push and pop work on the top element."
+
+class FakeStreamingModel:
+    def __init__(self, chunks, complete=True, error=None):
+        self.chunks = chunks
+        self.complete = complete
+        self.error = error
+
+    def generate_stream(self, prompt):
+        for chunk in self.chunks:
+            yield chunk
+        if self.error is not None:
+            raise self.error
+        return self.complete
+
+    def generate_response(self, prompt):
+        return None
+
+class TestStreamHybridResponse(unittest.TestCase):
+    def _stream(self, model):
+        formatter = HybridResponseFormatter(nlp_model=model)
+        outputs = list(formatter.stream_hybrid_response("What is a stack?"))
+        concept = formatter.query_processor.process_query("What is a stack?")
+        return outputs, formatter._ai_cache.get((concept, "intermediate"))
+
+    def test_complete_stream_is_cached(self):
+        outputs, cached = self._stream(FakeStreamingModel([ANSWER[:40], ANSWER[40:]]))
+        self.assertEqual(cached, ANSWER)
+        self.assertIn(ANSWER, outputs[-1])
+
+    def test_interrupted_stream_is_not_cached(self):
+        outputs, cached = self._stream(FakeStreamingModel([ANSWER[:40]], error=RuntimeError("model failed")))
+        self.assertIsNone(cached)
+        self.assertIn(ANSWER[:40], outputs[1])
+
+    def test_fallback_is_not_cached(self):
+        _, cached = self._stream(FakeStreamingModel([ANSWER], complete=False))
+        self.assertIsNone(cached)
+
+if __name__ == "__main__":
+    unittest.main()
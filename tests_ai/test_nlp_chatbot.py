@@ -0,0 +1,167 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from src_ai.cache import SQLiteStore
+from src_ai.nlp_chatbot import NLPChatbot
+
+class FakeTokenizer:
+    def __call__(self, texts, **kwargs):
+        return {"input_ids": list(texts)}
+
+    def batch_decode(self, outputs, skip_special_tokens=True):
+        return [f"generated explanation for {output}" for output in outputs]
+
+class FakeModel:
+    def __init__(self):
+        self.calls = 0
+        self.batch_sizes = []
+
+    def generate(self, input_ids=None, **kwargs):
+        self.calls += 1
+        self.batch_sizes.append(len(input_ids))
+        return input_ids
+
+    def eval(self):
+        return self
+
+class FailingModel:
+    def generate(self, **kwargs):
+        raise RuntimeError("generate failed")
+
+    def eval(self):
+        return self
+
+def make_offline_chatbot(model, **kwargs):
+    """Build an NLPChatbot around a fake model without touching the Hugging Face hub"""
+    tokenizer_class = mock.Mock(**{"from_pretrained.return_value": FakeTokenizer()})
+    model_class = mock.Mock(**{"from_pretrained.return_value": model})
+    with mock.patch("src_ai.nlp_chatbot.AutoTokenizer", tokenizer_class), \
+            mock.patch("src_ai.nlp_chatbot.AutoModelForSeq2SeqLM", model_class):
+        return NLPChatbot(model_name="fake-model-for-tests", cache_path=None, **kwargs)
+
+class TestGenerationCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "generations.sqlite")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _make_chatbot(self, model):
+        chatbot = make_offline_chatbot(model)
+        chatbot.generation_cache = SQLiteStore(self.cache_path, max_entries=10)
+        return chatbot
+
+    def test_repeated_prompt_skips_generation(self):
+        model = FakeModel()
+        chatbot = self._make_chatbot(model)
+        first = chatbot.generate_response("What is recursion?")
+        second = chatbot.generate_response("  what is recursion?")
+        self.assertEqual(first, second)
+        self.assertEqual(model.calls, 1)
+
+    def test_cache_shared_across_instances(self):
+        self._make_chatbot(FakeModel()).generate_response("What is a stack?")
+        model = FakeModel()
+        self._make_chatbot(model).generate_response("What is a stack?")
+        self.assertEqual(model.calls, 0)
+
+    def test_generation_params_in_key(self):
+        model = FakeModel()
+        chatbot = self._make_chatbot(model)
+        chatbot.generate_response("What is a queue?", max_length=50)
+        chatbot.generate_response("What is a queue?", max_length=100)
+        self.assertEqual(model.calls, 2)
+
+    def test_stream_serves_cached_answer(self):
+        model = FakeModel()
+        chatbot = self._make_chatbot(model)
+        answer = chatbot.generate_response("What is a heap?")
+        stream = chatbot.generate_stream("What is a heap?")
+        self.assertEqual(next(stream), answer)
+        with self.assertRaises(StopIteration) as stop:
+            next(stream)
+        # A cached model answer counts as complete
+        self.assertTrue(stop.exception.value)
+        self.assertEqual(model.calls, 1)
+
+class TestStreaming(unittest.TestCase):
+    def _consume(self, stream):
+        # Run the stream in a thread so a hang fails the test instead of the suite
+        result = {}
+
+        def run():
+            outputs = []
+            try:
+                while True:
+                    outputs.append(next(stream))
+            except StopIteration as stop:
+                result["outputs"], result["complete"] = outputs, stop.value
+
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        worker.join(timeout=10)
+        self.assertFalse(worker.is_alive(), "stream did not finish")
+        return result["outputs"], result["complete"]
+
+    def test_failing_generate_yields_fallback(self):
+        chatbot = make_offline_chatbot(FailingModel())
+        outputs, complete = self._consume(chatbot.generate_stream("What is recursion?"))
+        self.assertEqual(outputs, [chatbot.fallback_responses["recursion"]])
+        self.assertFalse(complete)
+
+    def test_failure_before_streaming_yields_fallback(self):
+        chatbot = make_offline_chatbot(FakeModel())
+        chatbot.tokenizer = mock.Mock(side_effect=RuntimeError("tokenizer failed"))
+        outputs, complete = self._consume(chatbot.generate_stream("What is an algorithm?"))
+        self.assertEqual(outputs, [chatbot.fallback_responses["algorithm"]])
+        self.assertFalse(complete)
+
+class TestFastCPU(unittest.TestCase):
+    def _make_chatbot(self, model, quantized_model):
+        # torch is optional here, so stand in for the parts _enable_fast_cpu touches
+        torch = mock.MagicMock()
+        torch.ao.quantization.quantize_dynamic.return_value = quantized_model
+        with mock.patch.dict(sys.modules, {"torch": torch}):
+            return make_offline_chatbot(model, fast_cpu=True)
+
+    def test_quantized_model_is_served(self):
+        quantized = FakeModel()
+        chatbot = self._make_chatbot(FakeModel(), quantized)
+        self.assertIs(chatbot.model, quantized)
+        self.assertEqual(chatbot.model_variant, "int8-dynamic")
+        self.assertEqual(quantized.calls, 1)
+
+    def test_failed_warmup_restores_fp32_model(self):
+        model = FakeModel()
+        chatbot = self._make_chatbot(model, FailingModel())
+        self.assertIs(chatbot.model, model)
+        self.assertEqual(chatbot.model_variant, "fp32")
+        self.assertFalse(chatbot.fast_cpu)
+        self.assertTrue(chatbot.is_model_loaded)
+
+    def test_unusable_model_falls_back(self):
+        chatbot = self._make_chatbot(FailingModel(), FailingModel())
+        self.assertFalse(chatbot.is_model_loaded)
+        self.assertEqual(chatbot.generate_response("What is recursion?"), chatbot.fallback_responses["recursion"])
+
+class TestBatching(unittest.TestCase):
+    def test_concurrent_requests_share_a_batch(self):
+        chatbot = make_offline_chatbot(FakeModel())
+        chatbot.enable_batching(max_batch_size=4, max_wait_ms=200)
+
+        queries = [f"What is concept number {i}?" for i in range(4)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            responses = list(pool.map(chatbot.generate_response, queries))
+        chatbot.batch_queue.close()
+
+        self.assertEqual(chatbot.model.batch_sizes, [4])
+        for query, response in zip(queries, responses):
+            self.assertIn(query.lower(), response)
+
+if __name__ == "__main__":
+    unittest.main()
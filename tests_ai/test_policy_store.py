@@ -0,0 +1,78 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+from src_ai.path_index import PathIndex
+from src_ai.policy_store import load_policy_snapshot, migrate_matrix, save_policy_snapshot
+from src_ai.reinforcement_learning import LearningEnvironment, LearningPathRL
+
+class TestPolicySnapshots(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, "rl_policy")
+        self.concepts = ["arrays", "recursion", "trees"]
+        self.q_table = np.arange(9, dtype=float).reshape(3, 3)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _save(self, **kwargs):
+        return save_policy_snapshot(self.directory, self.q_table, self.concepts, np.full(3, 0.5),
+                                    np.eye(3, k=-1), {"alpha": 0.2}, **kwargs)
+
+    def test_round_trip_is_memory_mapped(self):
+        self._save()
+        snapshot = load_policy_snapshot(self.directory)
+        np.testing.assert_array_equal(snapshot["q_table"], self.q_table)
+        self.assertFalse(snapshot["q_table"].flags.writeable)
+        self.assertEqual(snapshot["manifest"]["concepts"], self.concepts)
+        self.assertEqual(snapshot["manifest"]["params"], {"alpha": 0.2})
+
+    def test_path_index_round_trip(self):
+        self._save()
+        self.assertIsNone(load_policy_snapshot(self.directory)["paths"])
+        self._save(paths=PathIndex.from_paths([[0, 1, 2], [1], [2, 0]]))
+        paths = load_policy_snapshot(self.directory)["paths"]
+        self.assertEqual([paths.path(start) for start in range(3)], [[0, 1, 2], [1], [2, 0]])
+        self.assertFalse(paths.indices.flags.writeable)
+
+    def test_versions_and_pruning(self):
+        versions = [self._save(keep=2) for _ in range(4)]
+        self.assertEqual(versions, [1, 2, 3, 4])
+        self.assertEqual(load_policy_snapshot(self.directory)["manifest"]["version"], 4)
+        self.assertEqual(sorted(name for name in os.listdir(self.directory) if name.startswith("v")),
+                         ["v000002", "v000003", "v000004"])
+
+    def test_missing_snapshot(self):
+        self.assertIsNone(load_policy_snapshot(self.directory))
+
+    def test_migrate_by_concept_name(self):
+        migrated = migrate_matrix(self.q_table, self.concepts, ["trees", "graphs", "arrays"])
+        np.testing.assert_array_equal(migrated, [[8, 0, 6], [0, 0, 0], [2, 0, 0]])
+
+    def test_agent_migrates_when_concepts_change(self):
+        self._save()
+        env = LearningEnvironment(concepts=["trees", "graphs", "arrays", "recursion"])
+        agent = LearningPathRL(env, model_path=self.directory, legacy_model_path=None)
+        self.assertEqual(agent.q_table.shape, (4, 4))
+        self.assertEqual(agent.q_table[0, 2], 6)
+        self.assertEqual(agent.alpha, 0.2)
+
+    def test_legacy_pickle_converted_once(self):
+        legacy_path = os.path.join(self.temp_dir.name, "rl_model.pkl")
+        with open(legacy_path, "wb") as f:
+            pickle.dump({"q_table": self.q_table, "env_concepts": self.concepts,
+                         "env_difficulty": np.full(3, 0.5), "env_prerequisites": np.eye(3, k=-1),
+                         "params": {"alpha": 0.3}}, f)
+        env = LearningEnvironment(concepts=list(self.concepts))
+        agent = LearningPathRL(env, model_path=self.directory, legacy_model_path=legacy_path)
+        np.testing.assert_array_equal(agent.q_table, self.q_table)
+        np.testing.assert_array_equal(env.prerequisites, np.eye(3, k=-1))
+        self.assertEqual(load_policy_snapshot(self.directory)["manifest"]["version"], 1)
+
+        # Later loads read the snapshot, not the pickle
+        os.remove(legacy_path)
+        agent = LearningPathRL(LearningEnvironment(concepts=list(self.concepts)), model_path=self.directory,
+                               legacy_model_path=legacy_path)
+        self.assertEqual(agent.alpha, 0.3)
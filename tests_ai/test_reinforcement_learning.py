@@ -0,0 +1,144 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from unittest.mock import patch
+from src_ai.policy_store import load_policy_snapshot
+from src_ai.reinforcement_learning import LearningEnvironment, LearningPathRL
+
+def brute_force_valid_actions(env, threshold=0.5):
+    return [action for action in range(env.num_concepts)
+            if not np.any((env.prerequisites[action] > 0) & (env.mastery_levels < threshold))]
+
+class TestLearningEnvironment(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.env = LearningEnvironment(concepts=[f"concept {i}" for i in range(40)])
+
+    def test_valid_actions_follow_steps(self):
+        self.env.reset()
+        for action in np.random.randint(0, self.env.num_concepts, size=400):
+            self.env.step(action)
+            self.assertEqual(self.env.get_valid_actions(), brute_force_valid_actions(self.env))
+
+    def test_skipping_prerequisites_is_penalized(self):
+        self.env.reset(0)
+        locked = next(a for a in range(self.env.num_concepts) if self.env.prerequisites[a].any())
+        _, reward, _ = self.env.step(locked)
+        self.assertEqual(reward, -3.0)
+
+    def test_assigning_mastery_levels(self):
+        self.env.mastery_levels = np.random.rand(self.env.num_concepts)
+        self.assertEqual(self.env.get_valid_actions(), brute_force_valid_actions(self.env))
+        self.env.reset()
+        self.assertEqual(self.env.get_valid_actions(), brute_force_valid_actions(self.env))
+
+    def test_mastery_levels_are_read_only(self):
+        with self.assertRaises(ValueError):
+            self.env.mastery_levels[0] = 1.0
+        self.assertEqual(self.env.get_valid_actions(), brute_force_valid_actions(self.env))
+
+class TestVectorizedTraining(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.env = LearningEnvironment(concepts=[f"concept {i}" for i in range(20)])
+        self.agent = LearningPathRL(self.env, load_model=False)
+
+    @patch.object(LearningPathRL, '_save_model')
+    def test_plays_every_episode(self, save_model):
+        rewards = self.agent.train_vectorized(episodes=50, num_envs=8, seed=1)
+        self.assertEqual(len(rewards), 50)
+        self.assertEqual(self.agent.q_table.shape, (20, 20))
+        self.assertTrue(np.any(self.agent.q_table))
+        save_model.assert_called_once()
+
+    @patch.object(LearningPathRL, '_save_model')
+    def test_duplicate_pairs_update_once(self, save_model):
+        # Concept 0 is the only start, so every greedy environment takes (0, 0)
+        self.agent.epsilon = 0.0
+        self.agent.train_vectorized(episodes=8, num_envs=8, max_steps=1, seed=1)
+        expected = self.agent.alpha * 2.0 * (1.2 - self.env.difficulty[0])
+        self.assertAlmostEqual(self.agent.q_table[0, 0], expected)
+
+    @patch.object(LearningPathRL, '_save_model')
+    def test_parallel_training_is_reproducible(self, save_model):
+        q_tables = []
+        for _ in range(2):
+            agent = LearningPathRL(self.env, load_model=False)
+            rewards = agent.train_parallel(episodes=40, num_workers=2, sync_every=10, num_envs=4, seed=3)
+            q_tables.append(agent.q_table)
+        self.assertEqual(len(rewards), 40)
+        np.testing.assert_array_equal(q_tables[0], q_tables[1])
+        self.assertTrue(np.any(q_tables[0]))
+
+class TestBackgroundTraining(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.temp_dir.name, "rl_policy")
+        self.env = LearningEnvironment(concepts=[f"concept {i}" for i in range(20)])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_publishes_and_reloads_policy(self):
+        agent = LearningPathRL(self.env, model_path=self.model_path, legacy_model_path=None)
+        serving = agent.q_table
+        agent.start_background_training(episodes=50, num_envs=8).join()
+        self.assertIsNot(agent.q_table, serving)
+        self.assertFalse(np.any(serving))
+        self.assertEqual(load_policy_snapshot(self.model_path)['manifest']['version'], 1)
+
+        # A fresh process restores the policy together with its environment
+        env = LearningEnvironment(concepts=self.env.concepts)
+        restored = LearningPathRL(env, model_path=self.model_path, legacy_model_path=None)
+        np.testing.assert_array_equal(restored.q_table, agent.q_table)
+        np.testing.assert_array_equal(env.prerequisites, self.env.prerequisites)
+
+class TestPathIndex(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.temp_dir.name, "rl_policy")
+        self.env = LearningEnvironment(concepts=[f"concept {i}" for i in range(20)])
+        self.agent = LearningPathRL(self.env, model_path=self.model_path, legacy_model_path=None)
+        self.agent.q_table = np.random.rand(20, 20)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_paths_served_from_snapshot_without_stepping(self):
+        walked = [self.agent.get_optimal_path(start) for start in range(20)]
+        self.agent._save_model(build_paths=True)
+        self.assertEqual(load_policy_snapshot(self.model_path)['paths'].num_paths, 20)
+
+        env = LearningEnvironment(concepts=self.env.concepts)
+        restored = LearningPathRL(env, model_path=self.model_path, legacy_model_path=None)
+        with patch.object(LearningEnvironment, 'step', side_effect=AssertionError("stepped")):
+            self.assertEqual([restored.get_optimal_path(start) for start in range(20)], walked)
+        self.assertEqual(len(set(walked[0])), len(walked[0]))
+
+    def test_serving_leaves_env_untouched(self):
+        self.env.reset(3)
+        self.env.step(5)
+        mastery = self.env.mastery_levels.copy()
+        self.agent.get_optimal_path(0)
+        self.assertEqual(self.env.current_concept, 5)
+        np.testing.assert_array_equal(self.env.mastery_levels, mastery)
+
+    def test_plain_save_skips_index_build(self):
+        with patch.object(LearningPathRL, 'build_path_index', side_effect=AssertionError("built")):
+            self.agent._save_model()
+        self.assertIsNone(load_policy_snapshot(self.model_path)['paths'])
+
+    def test_save_reuses_index_for_unchanged_table(self):
+        self.agent._save_model(build_paths=True)
+        with patch.object(LearningPathRL, 'build_path_index', side_effect=AssertionError("rebuilt")):
+            self.agent._save_model(build_paths=True)
+        self.assertEqual(load_policy_snapshot(self.model_path)['paths'].num_paths, 20)
+
+    @patch.object(LearningPathRL, '_save_model')
+    def test_training_invalidates_index(self, save_model):
+        self.agent._paths = (self.agent.q_table, self.agent.build_path_index())
+        self.agent.train_vectorized(episodes=10, num_envs=4, seed=0)
+        self.assertIsNone(self.agent._paths)
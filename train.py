@@ -1,12 +1,30 @@
 import numpy as np
-from replay_buffer import ReplayBuffer
+from replay_buffer import PrioritizedReplayBuffer, ReplayBuffer
 
-def train(agent, environment, episodes=1000, batch_size=32):
-    """Train the agent using experience replay"""
-    print(f"Training RL agent for {episodes} episodes...")
+def train(agent, environment, episodes=1000, batch_size=32, prioritized=False, replay_buffer=None, verbose=True):
+    """
+    Train the agent using experience replay
+    
+    Args:
+        agent: Agent with select_action and update_batch (see RLAgent)
+        environment: Environment whose step returns (next_state, reward, done[, info])
+        episodes: Number of episodes to train for
+        batch_size: Experiences replayed per update
+        prioritized: Sample by TD error from a PrioritizedReplayBuffer instead of uniformly
+        replay_buffer: Buffer to use instead of a new one, e.g. to keep experiences
+            across calls or to tune the prioritized replay parameters
+        verbose: Print the average reward every 10 episodes
+    
+    Returns:
+        List of total rewards per episode
+    """
+    if verbose:
+        print(f"Training RL agent for {episodes} episodes...")
     
     # Initialize replay buffer
-    replay_buffer = ReplayBuffer(capacity=10000)
+    if replay_buffer is None:
+        replay_buffer = PrioritizedReplayBuffer(capacity=10000) if prioritized else ReplayBuffer(capacity=10000)
+    prioritized = isinstance(replay_buffer, PrioritizedReplayBuffer)
     
     total_rewards = []
     
@@ -21,7 +39,7 @@ def train(agent, environment, episodes=1000, batch_size=32):
             action = agent.select_action(state)
             
             # Take action and observe next state and reward
-            next_state, reward, done, _ = environment.step(action)
+            next_state, reward, done = environment.step(action)[:3]
             episode_reward += reward
             step_count += 1
             
@@ -33,16 +51,16 @@ def train(agent, environment, episodes=1000, batch_size=32):
             
             # Learn from experiences
             if len(replay_buffer) > batch_size:
-                experiences = replay_buffer.sample(batch_size)
-                for exp in experiences:
-                    s, a, r, ns, d = exp
-                    
-                    # Q-learning update
-                    target = r + (0 if d else agent.gamma * np.max(agent.q_table[ns]))
-                    agent.q_table[s][a] += agent.alpha * (target - agent.q_table[s][a])
+                # One vectorized Q-learning update per sampled batch
+                if prioritized:
+                    *batch, indices, weights = replay_buffer.sample(batch_size)
+                    td_errors = agent.update_batch(*batch, weights=weights)
+                    replay_buffer.update_priorities(indices, td_errors)
+                else:
+                    agent.update_batch(*replay_buffer.sample(batch_size))
         
         total_rewards.append(episode_reward)
-        if episode % 10 == 0:
+        if verbose and episode % 10 == 0:
             avg_reward = np.mean(total_rewards[-10:])
             print(f"Episode {episode}, Average Reward: {avg_reward}")
     
@@ -1,30 +1,47 @@
 import gradio as gr
+import hashlib
+import json
 import numpy as np
 import time
 import os
-import base64
 from PIL import Image
 import io
 from datetime import datetime
 
-from src.knowledge_manager import KnowledgeManager
+from src.knowledge_registry import get_knowledge_manager
 from src_ai.personalization import PersonalizationEngine
 from src_ai.nlp_chatbot import NLPChatbot
 from src_ai.ai_visualizations import AIDrivenVisualizer
 from src_ai.hybrid_response_formatter import HybridResponseFormatter
 from src_ai.reinforcement_learning import LearningPathRL, LearningEnvironment
 
+def _sample_rng(*parts):
+    """
+    Random generator seeded from a request's inputs, so the same request draws
+    the same sample data and its chart is served from the render cache instead
+    of producing a new image every time
+    """
+    digest = hashlib.sha256(json.dumps(parts, default=str).encode('utf-8')).digest()
+    return np.random.default_rng(int.from_bytes(digest[:8], 'little'))
+
 class AIEnhancedGradioApp:
     def __init__(self):
         """Initialize the AI-enhanced CSExplainer Gradio interface"""
         # Core components
-        self.knowledge_manager = KnowledgeManager()
+        self.knowledge_manager = get_knowledge_manager()
+        # Pick up edits to the knowledge files without restarting the server
+        self.knowledge_manager.start_watching()
         
         # AI components
         self.personalizer = PersonalizationEngine()
-        self.chatbot = NLPChatbot()
-        self.visualizer = AIDrivenVisualizer()
-        self.response_formatter = HybridResponseFormatter(self.knowledge_manager)
+        # Concurrent users share one model; their prompts are micro-batched
+        self.chatbot = NLPChatbot(batch_size=8, batch_wait_ms=10)
+        self.visualizer = AIDrivenVisualizer(cache_dir='data/cache/charts')
+        self.response_formatter = HybridResponseFormatter(
+            self.knowledge_manager,
+            cache_path='data/cache/ai_responses.sqlite',
+            nlp_model=self.chatbot
+        )
         
         # Session state
         self.session = {
@@ -39,9 +56,9 @@ class AIEnhancedGradioApp:
         # Initialize RL components
         try:
             env = LearningEnvironment(concepts=self.knowledge_manager.get_all_concepts())
+            # Serve the last saved policy right away; improve it in the background
             self.rl_agent = LearningPathRL(env)
-            # Pre-train a bit to have meaningful suggestions
-            self.rl_agent.train(episodes=10)
+            self.rl_agent.start_background_training(episodes=2000, num_envs=64)
         except Exception as e:
             print(f"Error initializing RL agent: {e}")
             self.rl_agent = None
@@ -63,20 +80,10 @@ class AIEnhancedGradioApp:
         if not query.strip():
             return "Please enter a question about a computer science concept.", None, []
         
-        # Update session
-        self.session["interaction_time"] = float(interaction_time)
-        self.session["questions_asked"] = int(questions_asked) + 1
+        user_level, explanation_level = self._prepare_query(complexity_level, interaction_time, questions_asked)
         
-        # Determine user level with personalization engine
-        user_features = [self.session["interaction_time"], self.session["questions_asked"]]
-        user_level = self.personalizer.predict_user_level(user_features)
-        self.session["user_level"] = user_level
-        
-        # Override complexity level if user specified
-        if complexity_level and complexity_level != "auto":
-            explanation_level = complexity_level
-        else:
-            explanation_level = user_level
+        # Start rendering the chart in the worker pool while the response is generated
+        viz_future = self._submit_visualization(query, user_level)
         
         # Track concepts explored
         start_time = time.time()
@@ -100,9 +107,67 @@ class AIEnhancedGradioApp:
         processing_time = time.time() - start_time
         print(f"Response generated in {processing_time:.2} seconds")
         
-        # Generate visualization based on query and response
-        viz_image = self._generate_visualization(query, response, user_level)
+        follow_up_questions = self._finish_query(query, response, user_level, explanation_level,
+                                                 interaction_time, questions_asked)
+        
+        return response, self._visualization_image(viz_future), follow_up_questions
+    
+    def process_query_stream(self, query, complexity_level, use_ai, interaction_time, questions_asked):
+        """
+        Streaming version of process_query for Gradio generator handlers
         
+        The rule-based explanation is shown right away and the AI text streams
+        in after it. The chart renders in a worker process meanwhile and is
+        shown once it is ready, after the finished response.
+        
+        Yields:
+            Tuples of (response text, visualization image, follow-up questions)
+        """
+        if not query.strip():
+            yield "Please enter a question about a computer science concept.", None, []
+            return
+        
+        user_level, explanation_level = self._prepare_query(complexity_level, interaction_time, questions_asked)
+        viz_future = self._submit_visualization(query, user_level)
+        
+        start_time = time.time()
+        response = ""
+        for response in self.response_formatter.stream_hybrid_response(
+            query,
+            complexity_level=explanation_level,
+            ai_enhancement=bool(use_ai)
+        ):
+            yield response, None, []
+        print(f"Response generated in {time.time() - start_time:.2} seconds")
+        
+        follow_up_questions = self._finish_query(query, response, user_level, explanation_level,
+                                                 interaction_time, questions_asked)
+        yield response, None, follow_up_questions
+        
+        viz_image = self._visualization_image(viz_future)
+        if viz_image is not None:
+            yield response, viz_image, follow_up_questions
+    
+    def _prepare_query(self, complexity_level, interaction_time, questions_asked):
+        """Update the session and work out the user level and explanation level"""
+        # Update session
+        self.session["interaction_time"] = float(interaction_time)
+        self.session["questions_asked"] = int(questions_asked) + 1
+        
+        # Determine user level with personalization engine
+        user_features = [self.session["interaction_time"], self.session["questions_asked"]]
+        user_level = self.personalizer.predict_user_level(user_features)
+        self.session["user_level"] = user_level
+        
+        # Override complexity level if user specified
+        if complexity_level and complexity_level != "auto":
+            explanation_level = complexity_level
+        else:
+            explanation_level = user_level
+        return user_level, explanation_level
+    
+    def _finish_query(self, query, response, user_level, explanation_level, interaction_time, questions_asked):
+        """Record the interaction and return suggested follow-up questions"""
         # Generate suggested follow-up questions
         follow_up_questions = self.response_formatter.suggest_related_queries(query)
         
@@ -119,11 +184,15 @@ class AIEnhancedGradioApp:
             "level": explanation_level,
             "timestamp": time.time()
         })
-        
-        return response, viz_image, follow_up_questions
+        return follow_up_questions
     
-    def _generate_visualization(self, query, response, user_level):
-        """Generate a relevant visualization based on the query and response"""
+    def _submit_visualization(self, query, user_level):
+        """
+        Start rendering a relevant visualization for the query
+        
+        Returns:
+            Future resolving to PNG bytes, or None if no chart could be prepared
+        """
         try:
             # Track concepts and their exploration counts
             concept_match = self.response_formatter.query_processor.process_query(query)
@@ -151,15 +220,14 @@ class AIEnhancedGradioApp:
                 values = list(self.session["concepts_explored"].values())
                 if len(concepts) < 2:  # Not enough data, show sample data
                     concepts = self.knowledge_manager.get_all_concepts()[:10]
-                    values = np.random.rand(len(concepts)) * 10
+                    values = _sample_rng("progress", concepts).random(len(concepts)) * 10
                 
                 # Create visualization
-                viz_b64 = self.visualizer.generate_plot(
+                viz_future = self.visualizer.submit_plot(
                     data_points=values,
                     chart_type="progress",
                     labels=concepts,
-                    title="Concept Exploration Progress",
-                    return_base64=True
+                    title="Concept Exploration Progress"
                 )
                 
             elif chart_type == "difficulty":
@@ -167,15 +235,15 @@ class AIEnhancedGradioApp:
                 concepts = self.knowledge_manager.get_all_concepts()[:15]
                 # Generate random difficulties weighted by user level
                 level_factor = {"beginner": 0.8, "intermediate": 0.5, "advanced": 0.2}.get(user_level, 0.5)
-                difficulties = np.random.rand(len(concepts)) * level_factor + (1 - level_factor) * 0.5
+                rng = _sample_rng("difficulty", concepts, user_level)
+                difficulties = rng.random(len(concepts)) * level_factor + (1 - level_factor) * 0.5
                 
                 # Create visualization
-                viz_b64 = self.visualizer.generate_plot(
+                viz_future = self.visualizer.submit_plot(
                     data_points=difficulties,
                     chart_type="difficulty",
                     labels=concepts,
-                    title=f"Concept Difficulty ({user_level.capitalize()} Level)",
-                    return_base64=True
+                    title=f"Concept Difficulty ({user_level.capitalize()} Level)"
                 )
                 
             elif chart_type == "concept_map":
@@ -195,45 +263,50 @@ class AIEnhancedGradioApp:
                 # Create map data (NxN matrix)
                 n = min(len(related_concepts), 9)  # Limit to 9 for readability
                 concepts = related_concepts[:n]
-                map_data = np.random.rand(n*n) * 0.8 + 0.2  # Relationship strengths
+                map_data = _sample_rng("concept_map", concepts).random(n*n) * 0.8 + 0.2  # Relationship strengths
                 
                 # Create visualization
-                viz_b64 = self.visualizer.generate_plot(
+                viz_future = self.visualizer.submit_plot(
                     data_points=map_data,
                     chart_type="concept_map",
                     labels=concepts,
-                    title="Concept Relationships",
-                    return_base64=True
+                    title="Concept Relationships"
                 )
                 
             else:  # comparison chart
                 # Compare difficulty across different aspects
                 aspects = ["Learning Time", "Complexity", "Prerequisites", "Applications"]
                 # Generate two sets of data
-                data_1 = np.random.rand(len(aspects)) * 0.7 + 0.3
-                data_2 = np.random.rand(len(aspects)) * 0.7 + 0.3
+                rng = _sample_rng("comparison", query.lower())
+                data_1 = rng.random(len(aspects)) * 0.7 + 0.3
+                data_2 = rng.random(len(aspects)) * 0.7 + 0.3
                 comparison_data = np.vstack((data_1, data_2))
                 
                 # Create visualization
-                viz_b64 = self.visualizer.generate_plot(
+                viz_future = self.visualizer.submit_plot(
                     data_points=comparison_data,
                     chart_type="comparison",
                     labels=aspects,
-                    title="Concept Comparison",
-                    return_base64=True
+                    title="Concept Comparison"
                 )
             
-            # Convert base64 string to image
-            if viz_b64:
-                img_data = base64.b64decode(viz_b64)
-                img = Image.open(io.BytesIO(img_data))
-                return img
+            return viz_future
                 
         except Exception as e:
             print(f"Error generating visualization: {e}")
         
         return None
     
+    def _visualization_image(self, viz_future):
+        """Wait for a submitted chart and load it as an image"""
+        if viz_future is None:
+            return None
+        try:
+            return Image.open(io.BytesIO(viz_future.result()))
+        except Exception as e:
+            print(f"Error generating visualization: {e}")
+        return None
+    
     def get_learning_path(self, starting_concept="algorithm", knowledge_level=0.5):
         """
         Generate a suggested learning path using reinforcement learning
@@ -252,13 +325,12 @@ class AIEnhancedGradioApp:
                 
             # Find the index of the starting concept
             start_idx = 0
-            concepts = self.knowledge_manager.get_all_concepts()
-            for idx, concept in enumerate(concepts):
-                if starting_concept.lower() in concept.lower():
-                    start_idx = idx
-                    break
+            matches = self.knowledge_manager.find_concepts(starting_concept, limit=1)
+            if matches and matches[0] in self.rl_agent.env.concepts:
+                start_idx = self.rl_agent.env.concepts.index(matches[0])
             
-            # Get optimal path
+            # Served from the policy's precomputed path index; the shared
+            # environment is never stepped, so concurrent requests are safe
             path_indices = self.rl_agent.get_optimal_path(start_idx)
             path_concepts = [self.rl_agent.env.concepts[i] for i in path_indices]
             
@@ -267,17 +339,12 @@ class AIEnhancedGradioApp:
             
             # Generate learning path visualization
             knowledge_level = float(knowledge_level)
-            viz_b64 = self.visualizer.generate_learning_path(
+            viz_future = self.visualizer.submit_learning_path(
                 path_concepts[:10],  # Limit to 10 concepts
                 difficulties[:10],
                 knowledge_level
             )
-            
-            # Convert to image
-            if viz_b64:
-                img_data = base64.b64decode(viz_b64)
-                img = Image.open(io.BytesIO(img_data))
-                return img
+            return Image.open(io.BytesIO(viz_future.result()))
             
         except Exception as e:
             print(f"Error generating learning path: {e}")
@@ -512,9 +579,9 @@ class AIEnhancedGradioApp:
                 selected_question = evt.value[0] 
                 return selected_question
             
-            # Event handler for the submit button
+            # Event handler for the submit button (streams the explanation as it is generated)
             submit_btn.click(
-                fn=self.process_query,
+                fn=self.process_query_stream,
                 inputs=[query_input, complexity, use_ai_enhance, interaction_time, questions_asked],
                 outputs=[response_md, viz_output, suggested_questions]
             )
@@ -545,12 +612,13 @@ class AIEnhancedGradioApp:
                 None,
                 query_input
             ).then(
-                fn=self.process_query,
+                fn=self.process_query_stream,
                 inputs=[query_input, complexity, use_ai_enhance, interaction_time, questions_asked],
                 outputs=[response_md, viz_output, suggested_questions]
             )
             
-        # Start the interface
+        # Start the interface; the queue is required for streaming (generator) handlers
+        demo.queue()
         demo.launch()
     
     def _get_custom_css(self):
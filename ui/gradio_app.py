@@ -1,11 +1,13 @@
 import gradio as gr
-from src.knowledge_manager import KnowledgeManager
+from src.knowledge_registry import get_knowledge_manager
 from src.query_processor import QueryProcessor
 from src.response_formatter import ResponseFormatter
 
 class GradioApp:
     def __init__(self):
-        self.knowledge_manager = KnowledgeManager()
+        self.knowledge_manager = get_knowledge_manager()
+        # Pick up edits to the knowledge files without restarting the server
+        self.knowledge_manager.start_watching()
         self.query_processor = QueryProcessor(self.knowledge_manager)
         self.response_formatter = ResponseFormatter(self.knowledge_manager)
         self.history = []
@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import scrolledtext, ttk, font
-from src.knowledge_manager import KnowledgeManager
+from src.knowledge_registry import get_knowledge_manager
 from src.query_processor import QueryProcessor
 from src.response_formatter import ResponseFormatter
 
@@ -14,7 +14,7 @@ class CSExplainerApp:
         self._configure_styles()
         
         # Initialize components
-        self.knowledge_manager = KnowledgeManager()
+        self.knowledge_manager = get_knowledge_manager()
         self.query_processor = QueryProcessor(self.knowledge_manager)
         self.response_formatter = ResponseFormatter(self.knowledge_manager)
         